@@ -1,12 +1,23 @@
 import streamlit as st
+import pandas as pd
 from utils.collections.create import (
 	get_supported_vectorizers,
 	validate_file_format,
+	iter_file_rows,
+	count_file_rows,
+	infer_file_schema,
+	SUPPORTED_FILE_TYPES,
 	create_collection,
 	batch_upload,
+	BATCH_MODES,
 	get_collection_info,
 	get_collection_objects
 )
+from utils.collections.vectors import VECTOR_FILE_TYPES, DEFAULT_VECTOR_NAME, load_vector_file, check_vector_dimensions
+from utils.collections.tenant_batching import TENANT_CREATION_MODES
+from utils.collections.checkpoint import CHECKPOINT_INTERVAL, get_checkpoint_id, load_checkpoint
+from utils.cache.cluster_cache import get_cluster_id
+from utils.collections.schema_inference import SCHEMA_DATA_TYPES, SCHEMA_TOKENIZATIONS, build_properties, property_types
 from utils.page_config import set_custom_page_config
 from utils.sidebar.navigation import navigate
 from utils.sidebar.helper import update_side_bar_labels
@@ -16,6 +27,8 @@ def initialize_session_state():
 	print("initialize_session_state() called")
 	if 'collection_info' not in st.session_state:
 		st.session_state.collection_info = None
+	if 'import_schema' not in st.session_state:
+		st.session_state.import_schema = None
 
 # Create a form for collection creation
 def create_collection_form():
@@ -44,18 +57,174 @@ def create_collection_form():
 
 		# File upload
 		uploaded_file = st.file_uploader(
-			"Upload .csv or .json Data File",
-			type=["csv", "json"],
-			help="Upload a CSV or JSON file containing your data"
+			"Upload .csv, .json, .jsonl, .parquet or .arrow Data File",
+			type=SUPPORTED_FILE_TYPES,
+			help="Upload a CSV, JSON (array of objects), JSON Lines, Parquet or Arrow IPC/Feather file containing your data. Rows are streamed to the batcher as they are parsed. Parquet/Arrow column types are used as the property schema."
 		)
 
-		# Submit button
-		submit_button = st.form_submit_button("Create Collection and Upload Data")
+		# Optional key columns for deterministic UUIDs
+		uuid_columns_input = st.text_input(
+			"UUID Key Columns (optional)",
+			placeholder="e.g. id or customer_id, order_id",
+			help="Comma-separated column names the object UUID is derived from. Leave empty to derive it from the whole row."
+		)
+
+		# Vectors supplied with the data (BYOV)
+		with st.expander("Bring Your Own Vectors (BYOV only)"):
+			vector_columns_input = st.text_input(
+				"Vector Columns",
+				placeholder="e.g. embedding or title=title_vec, body=body_vec",
+				help="Column holding each object's vector (JSON/CSV arrays like [0.1, 0.2], or list columns in Parquet/Arrow). Use name=column pairs for named vectors."
+			)
+			vector_file = st.file_uploader(
+				"Vector File (.npy or .fvecs)",
+				type=VECTOR_FILE_TYPES,
+				help="One vector per row of the data file, matched by position. Read in place without copying."
+			)
+			vector_file_name = st.text_input("Vector Name for the Vector File", value=DEFAULT_VECTOR_NAME, help="Leave as 'default' for a single unnamed vector").strip() or DEFAULT_VECTOR_NAME
+
+		# Multi-tenant import
+		with st.expander("Multi-Tenancy"):
+			tenant_column = st.text_input(
+				"Tenant Column (optional)",
+				placeholder="e.g. customer_id",
+				help="Column holding each row's tenant. Creates a multi-tenant collection; rows are grouped into per-tenant batches."
+			).strip()
+			tenant_creation_labels = {
+				"create": "Create missing tenants in bulk before their objects are sent",
+				"auto": "Enable auto tenant creation on the collection",
+			}
+			tenant_creation = st.radio(
+				"Tenant Creation",
+				options=TENANT_CREATION_MODES,
+				format_func=lambda mode: tenant_creation_labels[mode]
+			)
+
+		# Batching options
+		with st.expander("Batching Options"):
+			batch_mode_labels = {
+				"fixed": "Fixed size",
+				"dynamic": "Dynamic (client sizes batches from server load)",
+				"rate_limit": "Rate limited (for vectorizer API limits)",
+				"auto": "Auto-tune (adapts to latency, errors and vector queue)",
+			}
+			batch_mode = st.radio(
+				"Batching Mode",
+				options=BATCH_MODES,
+				format_func=lambda mode: batch_mode_labels[mode],
+				help="Auto-tune grows or shrinks batch size and concurrency between windows and stops if a shard turns READONLY"
+			)
+			col1, col2, col3 = st.columns(3)
+			with col1:
+				batch_size = st.number_input("Batch Size", min_value=10, max_value=10000, value=1000, step=100, help="Fixed mode, and the starting size for auto-tune")
+			with col2:
+				concurrent_requests = st.number_input("Concurrent Requests", min_value=1, max_value=16, value=2, step=1, help="Fixed mode, and the starting concurrency for auto-tune")
+			with col3:
+				requests_per_minute = st.number_input("Objects per Minute", min_value=1, max_value=1000000, value=600, step=100, help="Rate limited mode only")
+			save_checkpoints = st.checkbox(
+				"Save checkpoints",
+				value=False,
+				help=f"Flush the batch and record progress every {CHECKPOINT_INTERVAL:,} rows so an interrupted import can be resumed"
+			)
+			resume = st.checkbox(
+				"Resume interrupted import",
+				value=False,
+				help="If a checkpoint exists for this collection and file, skip the rows already imported and retry only the failed ones (keeps saving checkpoints)"
+			)
+			upsert = st.checkbox(
+				"Upsert changed objects only",
+				value=False,
+				help="Import into the collection even if it exists and send only new or changed objects (compared by content hash). Set UUID key columns so edited rows keep their UUID."
+			)
+
+		# Submit buttons
+		col1, col2 = st.columns(2)
+		with col1:
+			infer_button = st.form_submit_button("Review Schema", help="Infer property types from the file and adjust types, tokenization and indexes before creating the collection")
+		with col2:
+			submit_button = st.form_submit_button("Create Collection and Upload Data")
+
+		upload_options = {
+			"uuid_columns": [column.strip() for column in uuid_columns_input.split(",") if column.strip()],
+			"batch_mode": batch_mode,
+			"batch_size": int(batch_size),
+			"concurrent_requests": int(concurrent_requests),
+			"requests_per_minute": int(requests_per_minute),
+			"vector_columns": parse_vector_columns(vector_columns_input),
+			"vector_file_name": vector_file_name,
+			"tenant_column": tenant_column or None,
+			"tenant_creation": tenant_creation,
+			"checkpoints": save_checkpoints or resume,
+			"resume": resume,
+			"upsert": upsert,
+		}
+
+		return submit_button, infer_button, collection_name, selected_vectorizer, uploaded_file, vector_file, upload_options
+
+# "embedding" or "title=title_vec, body=body_vec" -> {vector name: column}. A bare column is the default vector.
+def parse_vector_columns(text):
+	vector_columns = {}
+	for item in text.split(","):
+		if not item.strip():
+			continue
+		name, _, column = item.partition("=")
+		if column.strip():
+			vector_columns[name.strip()] = column.strip()
+		else:
+			vector_columns[DEFAULT_VECTOR_NAME] = name.strip()
+	return vector_columns
+
+# Identify an uploaded file, so an inferred schema is only reused for the file it came from
+def get_file_key(uploaded_file):
+	return (uploaded_file.name, uploaded_file.size) if uploaded_file else None
+
+# Infer the property schema from a sample of the file and keep it for the schema editor
+def infer_schema(uploaded_file, upload_options):
+	print("infer_schema() called")
+	if not uploaded_file:
+		st.error("Please upload a data file")
+		return
+	file_type = uploaded_file.name.split('.')[-1].lower()
+	is_valid, validation_msg, sample = validate_file_format(uploaded_file, file_type)
+	if not is_valid:
+		st.error(f"File validation failed: {validation_msg}")
+		return
+	try:
+		rows = infer_file_schema(uploaded_file, file_type, sample, exclude_columns=list(upload_options["vector_columns"].values()))
+	except Exception as e:
+		st.error(f"Could not read the file schema: {e}")
+		return
+	st.session_state.import_schema = {"file": get_file_key(uploaded_file), "rows": rows}
 
-		return submit_button, collection_name, selected_vectorizer, uploaded_file
+# Editable schema for the uploaded file. Returns the edited rows, or None when no schema was inferred for this file.
+def display_schema_editor(uploaded_file):
+	schema = st.session_state.import_schema
+	if not schema or schema["file"] != get_file_key(uploaded_file):
+		return None
+	st.markdown("###### Property Schema")
+	st.caption("Adjust types and indexes before creating the collection. Indexes you do not need are not built: searchable (BM25) only applies to text, range filters to int/number/date.")
+	edited = st.data_editor(
+		pd.DataFrame(schema["rows"]),
+		column_config={
+			"Data Type": st.column_config.SelectboxColumn("Data Type", options=SCHEMA_DATA_TYPES, required=True),
+			"Tokenization": st.column_config.SelectboxColumn("Tokenization", options=SCHEMA_TOKENIZATIONS),
+			"Filterable": st.column_config.CheckboxColumn("Filterable"),
+			"Searchable": st.column_config.CheckboxColumn("Searchable"),
+			"Range Filters": st.column_config.CheckboxColumn("Range Filters"),
+		},
+		disabled=["Column", "Property"],
+		hide_index=True,
+		num_rows="fixed",
+		width="stretch",
+		key=f"schema_editor_{schema['file']}"
+	)
+	# Empty cells come back as NaN
+	edited = edited.astype(object).where(edited.notna(), None)
+	return edited.to_dict("records")
 
 # Handle form submission
-def handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file):
+# schema holds the rows from the schema editor, otherwise the schema is inferred with the default settings
+def handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file, vector_file, upload_options, schema=None):
 	print("handle_form_submission() called")
 	if not collection_name:
 		st.error("Please enter a collection name")
@@ -64,46 +233,130 @@ def handle_form_submission(client, collection_name, selected_vectorizer, uploade
 		st.error("Please upload a data file")
 		return
 
-	# Create collection
-	success, message = create_collection(client, collection_name, selected_vectorizer)
-	if not success:
-		st.error(message)
-		return
-
-	st.success(message)
-
-	# Read and validate file
-	file_content = uploaded_file.getvalue().decode('utf-8')
+	# Validate a sample of the file before creating the collection, the rest is parsed while uploading
 	file_type = uploaded_file.name.split('.')[-1].lower()
 
-	is_valid, validation_msg, data = validate_file_format(file_content, file_type)
+	is_valid, validation_msg, sample = validate_file_format(uploaded_file, file_type)
 	if not is_valid:
 		st.error(f"File validation failed: {validation_msg}") 
 		return
+	missing_columns = [column for column in upload_options["uuid_columns"] if column not in sample[0]]
+	if missing_columns:
+		st.error(f"UUID key column(s) not found in the file: {', '.join(missing_columns)}")
+		return
+	tenant_column = upload_options["tenant_column"]
+	if tenant_column and tenant_column not in sample[0]:
+		st.error(f"Tenant column not found in the file: {tenant_column}")
+		return
+	st.info(validation_msg)
+
+	# Vectors from columns or a side-car file: check dimensions on the sample before creating anything
+	vector_columns = upload_options["vector_columns"]
+	total_objects = count_file_rows(uploaded_file, file_type)
+	vectors = None
+	vector_names = None
+	if vector_columns or vector_file:
+		if selected_vectorizer != "BYOV":
+			st.error("Vector columns and vector files require the BYOV vectorizer")
+			return
+		missing_columns = [column for column in vector_columns.values() if column not in sample[0]]
+		if missing_columns:
+			st.error(f"Vector column(s) not found in the file: {', '.join(missing_columns)}")
+			return
+		try:
+			vectors = load_vector_file(vector_file, vector_file.name.split('.')[-1].lower()) if vector_file else None
+		except Exception as e:
+			st.error(f"Could not read the vector file: {e}")
+			return
+		vectors_ok, vectors_msg, dimensions = check_vector_dimensions(sample, vector_columns, vectors, upload_options["vector_file_name"], total_objects)
+		if not vectors_ok:
+			st.error(f"Vector validation failed: {vectors_msg}")
+			return
+		st.info(f"Vectors: {vectors_msg}")
+		vector_names = list(dimensions)
+
+	# Properties are defined up front (columnar types or types inferred from the sample) instead of by auto-schema
+	try:
+		if schema is None:
+			schema = infer_file_schema(uploaded_file, file_type, sample, exclude_columns=list(vector_columns.values()))
+		properties = build_properties(schema)
+	except Exception as e:
+		st.error(f"Could not build the property schema: {e}")
+		return
 
-	# Create a placeholder for progress updates
-	progress_placeholder = st.empty()
-
-	progress_messages = []
-
-	# Process the batch upload generator
-	for success, message, _ in batch_upload(client, collection_name, data):
-		progress_messages.append(message)
-		# Update progress display with HTML scrollable div on each yield
-		html_content = f"""
-		                <div style="
-		                	height: 300px;
-		                	overflow-y: auto;
-		                	border: 1px solid #ccc;
-		                	padding: 10px;
-		                ">
-		                {"<br>".join(progress_messages)}
-		                </div>
-		                """
-		progress_placeholder.markdown(html_content, unsafe_allow_html=True)
-
-	# After the loop finishes, the last message should indicate completion status
-	# The detailed failed objects will be printed to the terminal
+	# Resume from a checkpoint of an interrupted import of the same file into the same collection, otherwise create the collection
+	# Checkpoints are only written when asked for, they flush the batch at every interval
+	upload_options = dict(upload_options)
+	checkpoint_id = get_checkpoint_id(get_cluster_id(), collection_name, uploaded_file.name, uploaded_file.size) if upload_options.pop("checkpoints") else None
+	checkpoint = load_checkpoint(checkpoint_id) if checkpoint_id and upload_options["resume"] else None
+	if checkpoint and client.collections.exists(collection_name):
+		st.info(f"Resuming the previous import: {checkpoint['committed_rows']:,} rows already committed, {len(checkpoint['failed']):,} failed rows to retry")
+	elif upload_options["upsert"] and client.collections.exists(collection_name):
+		checkpoint = None
+		st.info(f"Upserting into the existing collection '{collection_name}': only new or changed objects are sent")
+	else:
+		checkpoint = None
+		multi_tenancy = upload_options["tenant_creation"] if tenant_column else None
+		success, message = create_collection(client, collection_name, selected_vectorizer, properties, vector_names, multi_tenancy)
+		if not success:
+			st.error(message)
+			return
+		st.success(message)
+	upload_options = dict(upload_options, resume=checkpoint is not None)
+
+	# Placeholders for the aggregated progress and the error messages
+	progress_bar = st.progress(0.0, text="Starting upload...")
+	metrics_placeholder = st.empty()
+	error_placeholder = st.empty()
+	error_messages = []
+	final_progress = None
+
+	# Process the batch upload generator (progress is reported at a fixed rate, not per object)
+	for success, message, progress in batch_upload(
+		client,
+		collection_name,
+		iter_file_rows(uploaded_file, file_type, array_columns=list(vector_columns.values())),
+		bytes_read=uploaded_file.tell,
+		total_bytes=uploaded_file.size,
+		total_objects=total_objects,
+		vector_file=vectors,
+		property_types=property_types(schema),
+		checkpoint_id=checkpoint_id,
+		options=upload_options
+	):
+		if progress is None:
+			# Queue/read errors: keep the latest ones only so the page stays light
+			error_messages.append(message)
+			error_placeholder.warning("\n\n".join(error_messages[-20:]))
+			continue
+		display_upload_progress(progress_bar, metrics_placeholder, message, progress)
+		final_progress = progress
+
+	# Downloadable report of the objects that failed (from client.batch.failed_objects)
+	if final_progress and final_progress.get("errors"):
+		st.error(f"{len(final_progress['errors']):,} objects failed to import. Download the error report for details" + (", or submit again with the same file and 'Resume interrupted import' to retry only the failed rows." if checkpoint_id else "."))
+		st.download_button(
+			"Download Error Report (CSV)",
+			data=pd.DataFrame(final_progress["errors"]).to_csv(index=False),
+			file_name=f"{collection_name}_import_errors.csv",
+			mime="text/csv"
+		)
+	elif final_progress:
+		st.success("All objects imported successfully")
+
+	# Change-only upsert summary
+	if final_progress and final_progress.get("upsert"):
+		counts = final_progress["upsert"]
+		col1, col2, col3, col4 = st.columns(4)
+		col1.metric("New", f"{counts['new']:,}")
+		col2.metric("Changed", f"{counts['changed']:,}")
+		col3.metric("Unchanged (skipped)", f"{counts['unchanged']:,}")
+		col4.metric("Unverified (sent)", f"{counts['unverified']:,}", help="Sent without comparing with the existing objects because the lookup failed; these may have overwritten existing objects")
+
+	# Per-tenant throughput and failures
+	if final_progress and final_progress.get("tenants"):
+		st.markdown("###### Per-Tenant Import")
+		st.dataframe(pd.DataFrame(final_progress["tenants"]), width="stretch")
 
 	# Get collection info
 	success, info_msg, collection_info = get_collection_info(client, collection_name)
@@ -113,6 +366,23 @@ def handle_form_submission(client, collection_name, selected_vectorizer, uploade
 		st.error(info_msg)
 
 
+# Render one progress snapshot from batch_upload
+def display_upload_progress(progress_bar, metrics_placeholder, message, progress):
+	fraction = progress["fraction"]
+	eta = f" - ETA {progress['eta']:.0f}s" if progress["eta"] is not None else ""
+	# Fraction is unknown for streamed files without a size
+	progress_bar.progress(fraction if fraction is not None else 0.0, text=f"{message}{eta}")
+	with metrics_placeholder.container():
+		col1, col2, col3, col4, col5 = st.columns(5)
+		col1.metric("Queued", f"{progress['queued']:,}")
+		col2.metric("Sent", f"{progress['sent']:,}")
+		col3.metric("Failed", f"{progress['failed']:,}")
+		col4.metric("Objects/sec", f"{progress['objects_per_sec']:,.0f}")
+		if progress["bytes_per_sec"] is not None:
+			col5.metric("MB/sec", f"{progress['bytes_per_sec'] / (1024 * 1024):,.2f}")
+		if progress.get("tuning") and progress["tuning"]["note"]:
+			st.caption(f"Auto-tune: {progress['tuning']['note']}")
+
 # Function to display collection information
 def display_collection_info(client):
 	print("display_collection_info() called")
@@ -122,7 +392,7 @@ def display_collection_info(client):
 	info = st.session_state.collection_info
 
 	# Button to view objects
-	if st.button(f"View {info['name']} Collection (100 Objects only)", use_container_width=True):
+	if st.button(f"View {info['name']} Collection (100 Objects only)", width="stretch"):
 		# Display only Object Count
 		st.metric("Object Count", info["object_count"])
 
@@ -143,9 +413,12 @@ def main():
 		update_side_bar_labels()
 		initialize_session_state()
 		client = st.session_state.client
-		submit_button, collection_name, selected_vectorizer, uploaded_file = create_collection_form()
+		submit_button, infer_button, collection_name, selected_vectorizer, uploaded_file, vector_file, upload_options = create_collection_form()
+		if infer_button:
+			infer_schema(uploaded_file, upload_options)
+		schema = display_schema_editor(uploaded_file)
 		if submit_button:
-			handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file)
+			handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file, vector_file, upload_options, schema)
 		display_collection_info(client)
 
 	else:
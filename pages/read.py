@@ -1,9 +1,125 @@
 import streamlit as st
 from utils.sidebar.navigation import navigate
 from utils.sidebar.helper import update_side_bar_labels
-from utils.collections.read_all_objects import list_all_collections, get_tenant_names, fetch_collection_data
+from utils.collections.read_all_objects import list_all_collections, get_tenant_names, fetch_collection_data, fetch_cross_tenant_data
+from utils.collections.filters import FILTER_OPERATORS, CREATION_TIME_OPERATORS, get_collection_properties, get_operator_group, coerce_filter_value, describe_condition
 from utils.page_config import set_custom_page_config
 
+# Property picker and filter builder. Returns the options passed to fetch_collection_data.
+def display_query_options(client, collection_name):
+	print("display_query_options() called")
+	if st.session_state.get("filters_collection") != collection_name:
+		st.session_state.read_filters = []
+		st.session_state.filters_collection = collection_name
+
+	properties = get_collection_properties(client, collection_name)
+	property_names = sorted(properties.keys())
+
+	with st.expander("🔎 Properties & Filters (applied server-side)", expanded=bool(st.session_state.read_filters)):
+		selected_properties = st.multiselect(
+			"Properties to return",
+			options=property_names,
+			default=property_names,
+			key=f"return_properties_{collection_name}",
+			help="Only the selected properties are sent back by the server"
+		)
+		include_vector = st.checkbox(
+			"Include vectors",
+			value=True,
+			key=f"include_vector_{collection_name}",
+			help="Vectors are usually the largest part of each object - untick to skip them"
+		)
+
+		st.markdown("###### Filters (combined with AND)")
+		col1, col2, col3, col4 = st.columns([2, 2, 3, 1])
+		with col1:
+			filter_property = st.selectbox("Property", options=["creation_time"] + property_names, key="filter_property")
+		if filter_property == "creation_time":
+			operators = CREATION_TIME_OPERATORS
+			data_type = "date"
+		else:
+			data_type = properties.get(filter_property, "text")
+			operators = FILTER_OPERATORS[get_operator_group(data_type)]
+		with col2:
+			filter_operator = st.selectbox("Operator", options=operators, key="filter_operator")
+		with col3:
+			if data_type == "date":
+				filter_value = st.date_input("Value", key="filter_value_date")
+			else:
+				filter_value = st.text_input(
+					f"Value ({data_type})",
+					key="filter_value",
+					help="Comma-separated values for Contains operators, * and ? wildcards for Like"
+				)
+		with col4:
+			st.write("")
+			if st.button("Add", key="add_filter", width="stretch"):
+				try:
+					value = coerce_filter_value(filter_value, data_type, filter_operator)
+					st.session_state.read_filters.append((filter_property, filter_operator, value))
+					st.session_state.query_results = None
+					st.session_state.current_page = 1
+				except (ValueError, TypeError) as e:
+					st.error(f"Invalid value for {data_type}: {e}")
+
+		if st.session_state.read_filters:
+			for condition in st.session_state.read_filters:
+				st.markdown(f"- `{describe_condition(condition)}`")
+			if st.button("Clear Filters", key="clear_filters"):
+				st.session_state.read_filters = []
+				st.session_state.query_results = None
+				st.session_state.current_page = 1
+				st.rerun()
+
+	# Keep everything hashable so the options can be part of the cache key
+	return {
+		"return_properties": tuple(selected_properties) if len(selected_properties) < len(property_names) else None,
+		"filter_conditions": tuple(st.session_state.read_filters) or None,
+		"include_vector": include_vector,
+	}
+
+# Read a page-limited sample or filtered slice across many tenants at once
+def display_cross_tenant_read(client, collection_name, tenant_names, query_options):
+	print("display_cross_tenant_read() called")
+	all_tenants = st.checkbox(f"All tenants ({len(tenant_names)})", value=True, key="cross_tenant_all")
+	if all_tenants:
+		selected_tenants = tenant_names
+	else:
+		selected_tenants = st.multiselect("Select Tenants", tenant_names, key="cross_tenant_select")
+
+	col1, col2 = st.columns(2)
+	with col1:
+		limit_per_tenant = st.number_input("Objects per tenant", min_value=1, max_value=10000, value=100, step=50)
+	with col2:
+		max_workers = st.slider("Concurrent tenant requests", min_value=1, max_value=32, value=8, help="Upper bound on tenants queried at the same time")
+
+	if st.button("Read Across Tenants", width="stretch"):
+		if not selected_tenants:
+			st.error("Please select at least one tenant")
+			return
+		with st.spinner(f"Reading {len(selected_tenants)} tenants... ⤵️"):
+			st.session_state.cross_tenant_results = fetch_cross_tenant_data(
+				client,
+				collection_name,
+				tuple(selected_tenants),
+				limit_per_tenant=limit_per_tenant,
+				max_workers=max_workers,
+				**query_options
+			)
+
+	result = st.session_state.get("cross_tenant_results")
+	if result is None:
+		return
+	if result["failed_tenants"]:
+		st.warning(f"{result['failed_tenants']} tenant(s) could not be read (inactive or error) - see the tenant summary below.")
+	if result["data"].empty:
+		st.warning("No data found in the selected tenants.")
+	else:
+		st.info(f"Showing {len(result['data'])} objects from {len(result['tenant_summary'])} tenants (Matching items: {result['total_count']})")
+		st.dataframe(result["data"].astype(str), width="stretch")
+	with st.expander("Tenant summary"):
+		st.dataframe(result["tenant_summary"].astype(str), width="stretch")
+
 def main():
 	set_custom_page_config(page_title="Read Collections")
 	navigate()
@@ -29,6 +145,10 @@ def main():
 		st.session_state.current_page = 1
 	if "items_per_page" not in st.session_state:
 		st.session_state.items_per_page = 1000
+	if "read_filters" not in st.session_state:
+		st.session_state.read_filters = []
+	if "current_query_options" not in st.session_state:
+		st.session_state.current_query_options = None
 
 	# Track if fetch button was clicked
 	if "collections_fetched" not in st.session_state:
@@ -68,6 +188,21 @@ def main():
 
 		selected_tenant = None
 		if tenant_names:
+			tenant_mode = st.radio(
+				"Tenant Mode",
+				options=["Single Tenant", "Across Tenants"],
+				horizontal=True,
+				key="tenant_mode",
+				help="Across Tenants reads a limited slice from many tenants concurrently and merges them into one table"
+			)
+			if tenant_mode == "Across Tenants":
+				if st.session_state.get("cross_tenant_collection") != selected_collection:
+					st.session_state.cross_tenant_results = None
+					st.session_state.cross_tenant_collection = selected_collection
+				query_options = display_query_options(client, selected_collection)
+				display_cross_tenant_read(client, selected_collection, tenant_names, query_options)
+				return
+
 			selected_tenant = st.selectbox(
 				"Select a Tenant",
 				tenant_names,
@@ -87,9 +222,12 @@ def main():
 				st.session_state.items_per_page = items_per_page
 				st.session_state.query_results = None
 
+		query_options = display_query_options(client, selected_collection)
+
 		# Check if we need to reset the results
 		if (st.session_state.current_collection != selected_collection or 
-			st.session_state.current_tenant != selected_tenant):
+			st.session_state.current_tenant != selected_tenant or
+			st.session_state.current_query_options != query_options):
 			st.session_state.query_results = None
 			st.session_state.current_page = 1
 
@@ -108,11 +246,13 @@ def main():
 							selected_collection, 
 							selected_tenant, 
 							page=st.session_state.current_page,
-							items_per_page=st.session_state.items_per_page
+							items_per_page=st.session_state.items_per_page,
+							**query_options
 						)
 						st.session_state.query_results = result
 						st.session_state.current_collection = selected_collection
 						st.session_state.current_tenant = selected_tenant
+						st.session_state.current_query_options = query_options
 
 				result = st.session_state.query_results
 
@@ -122,7 +262,7 @@ def main():
 				else:
 					# Display pagination info
 					st.info(f"Showing page {result['current_page']} of {result['total_pages']} " +
-						f"(Total items: {result['total_count']})")
+						f"({'Filtered' if query_options['filter_conditions'] else 'Total'} items: {result['total_count']})")
 
 					# Display the data
 					st.dataframe(result["data"].astype(str), width="stretch")
@@ -135,7 +275,8 @@ def main():
 							st.session_state.current_page = 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=1, items_per_page=st.session_state.items_per_page
+								page=1, items_per_page=st.session_state.items_per_page,
+								**query_options
 							)
 							st.rerun()
 
@@ -144,7 +285,8 @@ def main():
 							st.session_state.current_page -= 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								**query_options
 							)
 							st.rerun()
 
@@ -153,7 +295,8 @@ def main():
 							st.session_state.current_page += 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								**query_options
 							)
 							st.rerun()
 
@@ -162,7 +305,8 @@ def main():
 							st.session_state.current_page = result["total_pages"]
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								**query_options
 							)
 							st.rerun()
 
@@ -178,7 +322,8 @@ def main():
 						st.session_state.current_page = page_number
 						st.session_state.query_results = fetch_collection_data(
 							client, selected_collection, selected_tenant,
-							page=page_number, items_per_page=st.session_state.items_per_page
+							page=page_number, items_per_page=st.session_state.items_per_page,
+							**query_options
 						)
 						st.rerun()
 	else:
@@ -1,7 +1,21 @@
 import streamlit as st
-from utils.search.hybrid import hybrid_search, hybrid_search_with_multiple_vectors
-from utils.search.vector import vector_search, vector_search_with_multiple_vectors, parse_vector_input
-from utils.search.keyword import keyword_search
+import pandas as pd
+from itertools import islice
+from utils.search.runner import run_search, SEARCH_TYPES
+from utils.search.result_cache import run_cached_search
+from utils.search.spans import SPAN_NAMES, get_spans, record_spans, spans_summary, spans_histogram
+from utils.search.filtered import FILTER_STRATEGIES, FILTERED_SEARCH_TYPES, estimate_selectivity, run_filter_lab, parse_cutoffs, filter_lab_frame
+from utils.collections.filters import FILTER_OPERATORS, CREATION_TIME_OPERATORS, get_collection_properties, get_operator_group, coerce_filter_value, describe_condition
+from utils.search.compare import run_ab_comparison, memory_config
+from utils.search.alpha_sweep import ALPHA_SWEEP_FUSION_TYPES, DEFAULT_ALPHA_GRID, DEFAULT_LEG_LIMIT, parse_alphas, run_alpha_sweep
+from utils.search.federated import federated_search, FEDERATED_NORMALIZATIONS
+from utils.collections.read_all_objects import get_tenant_names
+from utils.search.vector import parse_vector_input, load_query_vectors, get_vector_dimensions, check_query_dimensions, MAX_DISPLAYED_QUERY_VECTORS
+from utils.collections.vectors import VECTOR_FILE_TYPES
+from utils.search.benchmark import benchmark_search, benchmark_to_csv, benchmark_to_json, BENCHMARK_PERCENTILES
+from utils.search.workload import QUERY_FILE_TYPES, iter_query_file, count_queries, run_query_workload, delete_workload_result
+from utils.search.recall import evaluate_recall, build_ground_truth, get_distance_metric, DEFAULT_CANDIDATE_LIMIT
+from utils.search.ef_sweep import EF_SWEEP_FIELDS, DEFAULT_EF_SWEEP, setting_from_row, run_ef_sweep, cheapest_setting
 from utils.cluster.collection import list_collections
 from utils.page_config import set_custom_page_config
 from utils.sidebar.navigation import navigate
@@ -23,6 +37,24 @@ def initialize_session_state():
 		st.session_state.search_type = "Hybrid"
 	if 'selected_target_vector' not in st.session_state:
 		st.session_state.selected_target_vector = None
+	if 'benchmark_result' not in st.session_state:
+		st.session_state.benchmark_result = None
+	if 'workload_result' not in st.session_state:
+		st.session_state.workload_result = None
+	if 'recall_result' not in st.session_state:
+		st.session_state.recall_result = None
+	if 'ef_sweep_result' not in st.session_state:
+		st.session_state.ef_sweep_result = None
+	if 'search_span_history' not in st.session_state:
+		st.session_state.search_span_history = []
+	if 'search_filters' not in st.session_state:
+		st.session_state.search_filters = []
+	if 'filter_lab_result' not in st.session_state:
+		st.session_state.filter_lab_result = None
+	if 'ab_result' not in st.session_state:
+		st.session_state.ab_result = None
+	if 'alpha_sweep_result' not in st.session_state:
+		st.session_state.alpha_sweep_result = None
 
 # Display the search interface with parameter
 def display_search_interface():
@@ -40,6 +72,7 @@ def display_search_interface():
 	collection = st.session_state.client.collections.get(selected_collection)
 	collection_config = collection.config.get()
 	target_vector = None
+	vector_names = []
 	# Only show target vector selection if collection has named vectors
 	if collection_config.vector_config is not None and len(collection_config.vector_config) > 0:
 		vector_names = list(collection_config.vector_config.keys())
@@ -56,7 +89,7 @@ def display_search_interface():
 	# Search type selection
 	search_type = st.radio(
 		"Search Type",
-		options=["Hybrid", "Keyword", "Vector"],
+		options=SEARCH_TYPES,
 		horizontal=True,
 		help="Choose between hybrid (vector + keyword) or keyword-only search"
 	)
@@ -65,9 +98,14 @@ def display_search_interface():
 	query = st.text_input(
 		"Search Query/Vector",
 		value=st.session_state.search_query,
-		help="Enter your search query/vector (for vector search, use a comma-separated list of floats like: 0.1,0.2,0.3)"
+		help="Enter your search query/vector (for vector search, use a comma-separated list of floats like: 0.1,0.2,0.3, or base64 encoded float32 bytes, prefixed with base64: when they could read as numbers)"
 	)
 
+	# Query vectors can also be uploaded (one or many)
+	vector_file = None
+	if search_type == "Vector":
+		vector_file = st.file_uploader("Or upload query vectors (.npy or .fvecs)", type=VECTOR_FILE_TYPES, help="A 1-D array (one query) or a 2-D array with one query vector per row, float32 preferred")
+
 	col1, col2 = st.columns(2)
 	with col1:
 		if search_type == "Hybrid":
@@ -89,7 +127,86 @@ def display_search_interface():
 			help="Maximum number of results to return"
 		)
 
+	# Filters (AND-combined), with the share of objects they match
+	filter_conditions = display_search_filters(selected_collection)
+
+	# Filter lab: the filtered query under each filter strategy and flat search cutoff
+	if filter_conditions and search_type in FILTERED_SEARCH_TYPES:
+		filter_lab_mode = st.toggle("Filter Strategy Lab", help="Benchmark the filtered query under each HNSW filter strategy and flat search cutoff and compare latency and results")
+		if filter_lab_mode:
+			display_filter_lab(selected_collection, search_type, query, target_vector, alpha if search_type == "Hybrid" else 0.5, limit, filter_conditions)
+			return
+
+	# A/B mode: the same queries against two collections or named vectors
+	ab_mode = st.toggle("A/B Comparison", help="Run the same queries against two collections (or two named vectors) and compare overlap@k, rank correlation, latency and memory-relevant configuration")
+	if ab_mode:
+		display_ab_comparison(collections, selected_collection, target_vector, search_type, query, alpha if search_type == "Hybrid" else 0.5, limit)
+		return
+
+	# Alpha sweep: hybrid results and latency over a grid of alpha values and both fusion types
+	if search_type == "Hybrid":
+		alpha_sweep_mode = st.toggle("Alpha Sweep", help="Run the query (or a query set) over a grid of alpha values and both fusion types, and report how the results change and how latency scales with alpha")
+		if alpha_sweep_mode:
+			display_alpha_sweep(selected_collection, target_vector, query, alpha, limit, filter_conditions)
+			return
+
+	# Federated mode: the same query across several collections and tenants
+	federated_mode = st.toggle("Federated Search", help="Run the query concurrently against several collections (and tenants) with the same schema and merge the results into one top-k")
+	if federated_mode:
+		display_federated_search(collections, selected_collection, search_type, query, target_vector, alpha if search_type == "Hybrid" else 0.5, limit)
+		return
+
+	# Recall mode: compare near_vector results with exact neighbours computed locally
+	recall_mode = st.toggle("Recall Evaluation", help="Measure recall@k, latency and distance error of vector search against exact neighbours computed over a sample of the collection")
+	if recall_mode:
+		display_recall_evaluation(selected_collection, vector_names, limit)
+		return
+
+	# ef sweep: measure recall and latency under a list of HNSW ef settings
+	sweep_mode = st.toggle("ef Sweep", help="Apply a list of ef / dynamic ef settings in turn, measure recall@k and p95 latency at each, then restore the original settings")
+	if sweep_mode:
+		display_ef_sweep(selected_collection, target_vector, limit)
+		return
+
+	# Workload mode: run a whole query set from a file
+	workload_mode = st.toggle("Query Workload from File", help="Run a set of queries (text, or vectors for vector search) concurrently and stream per-query results to a file")
+	if workload_mode:
+		display_query_workload(selected_collection, search_type, target_vector, alpha if search_type == "Hybrid" else 0.5, limit, filter_conditions)
+		return
+
+	# Benchmark mode: run the same query many times instead of once
+	benchmark_mode = st.toggle("Benchmark Mode", help="Run the query repeatedly with warm-up and concurrency and report latency percentiles, QPS and error rate")
+	if benchmark_mode:
+		col1, col2, col3 = st.columns(3)
+		with col1:
+			iterations = st.number_input("Runs", min_value=1, max_value=100000, value=100, step=10)
+		with col2:
+			warmup = st.number_input("Warm-up Runs", min_value=0, max_value=1000, value=10, step=1, help="Not counted in the results")
+		with col3:
+			concurrency = st.slider("Concurrency", min_value=1, max_value=32, value=1, help="Number of queries in flight at the same time")
+
+		if st.button("Run Benchmark"):
+			alpha_value = alpha if search_type == "Hybrid" else 0.5
+			# The benchmark runs on worker threads without a Streamlit script context, so read the client here
+			client = st.session_state.client
+			with st.spinner(f"Running {int(iterations)} queries..."):
+				summary, samples = benchmark_search(
+					lambda: run_search(client, search_type, selected_collection, query, target_vector, alpha_value, limit, filter_conditions=filter_conditions),
+					iterations=int(iterations),
+					warmup=int(warmup),
+					concurrency=concurrency
+				)
+			parameters = {"collection": selected_collection, "search_type": search_type, "target_vector": target_vector, "query": query, "alpha": alpha_value, "limit": limit, "filters": [describe_condition(condition) for condition in filter_conditions or ()]}
+			st.session_state.benchmark_result = {"summary": summary, "samples": samples, "parameters": parameters}
+		display_benchmark_result()
+		return
+
 	# Search button
+	col1, col2 = st.columns(2)
+	with col1:
+		use_cache = st.toggle("Use Result Cache", value=True, help="Serve repeated searches from a cache, dropped when the collection is written through the app")
+	with col2:
+		query_profile = st.toggle("Server Profile", help="Ask the server for its query profile to split the query time into server execution and network. Adds some overhead on the server.")
 	search_button = st.button("Search")
 
 	if search_button:
@@ -102,60 +219,153 @@ def display_search_interface():
 			st.session_state.search_alpha = alpha
 		st.session_state.search_limit = limit
 
-		# Perform search based on type
-		if search_type == "Hybrid":
-			if st.session_state.selected_target_vector:
-				success, message, df, time_taken = hybrid_search_with_multiple_vectors(
-					st.session_state.client,
-					selected_collection,
-					target_vector,
-					query,
-					alpha,
-					limit
-				)
+		# Vector search: parse (or load) and check the query vectors before sending them
+		if search_type == "Vector":
+			run_vector_queries(selected_collection, target_vector, query, vector_file, limit, use_cache, query_profile, filter_conditions)
+		else:
+			# Perform search based on type
+			success, message, df, time_taken, cache_info = search(search_type, selected_collection, query, target_vector, alpha if search_type == "Hybrid" else 0.5, limit, use_cache, query_profile, filter_conditions)
+
+			# Display results
+			display_results(success, message, df, time_taken, cache_info)
+
+	display_span_history()
+
+# Filter builder of the Search page (same conditions as the Read page). Returns the conditions as a tuple, None without filters.
+# While filters are set, shows how many objects they match (aggregate count), i.e. their selectivity.
+def display_search_filters(selected_collection):
+	print("display_search_filters() called")
+	if st.session_state.get("search_filters_collection") != selected_collection:
+		st.session_state.search_filters = []
+		st.session_state.search_filters_collection = selected_collection
+
+	with st.expander("Filters (combined with AND)", expanded=bool(st.session_state.search_filters)):
+		properties = get_collection_properties(st.session_state.client, selected_collection)
+		col1, col2, col3, col4 = st.columns([2, 2, 3, 1])
+		with col1:
+			filter_property = st.selectbox("Property", options=["creation_time"] + sorted(properties.keys()), key="search_filter_property")
+		if filter_property == "creation_time":
+			operators = CREATION_TIME_OPERATORS
+			data_type = "date"
+		else:
+			data_type = properties.get(filter_property, "text")
+			operators = FILTER_OPERATORS[get_operator_group(data_type)]
+		with col2:
+			filter_operator = st.selectbox("Operator", options=operators, key="search_filter_operator")
+		with col3:
+			if data_type == "date":
+				filter_value = st.date_input("Value", key="search_filter_value_date")
 			else:
-				success, message, df, time_taken = hybrid_search(
-					st.session_state.client,
-					selected_collection,
-					query,
-					alpha,
-					limit
-			)
-		elif search_type == "Vector":
+				filter_value = st.text_input(f"Value ({data_type})", key="search_filter_value", help="Comma-separated values for Contains operators, * and ? wildcards for Like")
+		with col4:
+			st.write("")
+			if st.button("Add", key="add_search_filter", width="stretch"):
+				try:
+					st.session_state.search_filters.append((filter_property, filter_operator, coerce_filter_value(filter_value, data_type, filter_operator)))
+				except (ValueError, TypeError) as e:
+					st.error(f"Invalid value for {data_type}: {e}")
+
+		if st.session_state.search_filters:
+			for condition in st.session_state.search_filters:
+				st.markdown(f"- `{describe_condition(condition)}`")
+			filter_conditions = tuple(st.session_state.search_filters)
 			try:
-				vector_list = parse_vector_input(query)
-				
-				if st.session_state.selected_target_vector:
-					success, message, df, time_taken = vector_search_with_multiple_vectors(
-						st.session_state.client,
-						selected_collection,
-						target_vector,
-						vector_list,
-						limit
-					)
-				else:
-					success, message, df, time_taken = vector_search(
-						st.session_state.client,
-						selected_collection,
-						vector_list,
-						limit
-					)
-			except ValueError as e:
-				st.error(f"Invalid vector format: {e}")
-				return
+				selectivity = estimate_selectivity(st.session_state.client, selected_collection, filter_conditions)
+				st.caption(f"Matches {selectivity['matching']:,} of {selectivity['total']:,} objects (selectivity {selectivity['selectivity']:.2%})")
+			except Exception as e:
+				st.caption(f"Could not estimate the selectivity: {e}")
+			if st.button("Clear Filters", key="clear_search_filters"):
+				st.session_state.search_filters = []
+				st.rerun()
+	return tuple(st.session_state.search_filters) or None
+
+# Benchmark the filtered query under each filter strategy and flat search cutoff, then restore the original settings
+def display_filter_lab(selected_collection, search_type, query, target_vector, alpha, limit, filter_conditions):
+	print("display_filter_lab() called")
+	st.warning("The lab changes the live filter strategy and flat search cutoff of this collection while it runs. The original settings are restored at the end.")
+	col1, col2, col3, col4 = st.columns(4)
+	with col1:
+		strategies = st.multiselect("Filter Strategies", options=FILTER_STRATEGIES, default=FILTER_STRATEGIES)
+	with col2:
+		cutoffs_text = st.text_input("Flat Search Cutoffs", value="40000", help="Comma-separated. Filters matching fewer objects than the cutoff are searched without the HNSW graph (brute force over the matches).")
+	with col3:
+		iterations = st.number_input("Runs per Setting", min_value=1, max_value=10000, value=50, step=10)
+	with col4:
+		concurrency = st.slider("Concurrency", min_value=1, max_value=32, value=1, key="filter_lab_concurrency")
+
+	if st.button("Run Lab") and strategies:
+		try:
+			cutoffs = parse_cutoffs(cutoffs_text)
+		except ValueError:
+			st.error("Flat search cutoffs must be whole numbers")
+			return
+		progress_bar = st.progress(0.0, text="Applying settings...")
+		final_progress = None
+		try:
+			for progress in run_filter_lab(st.session_state.client, selected_collection, search_type, query, target_vector, alpha, limit, filter_conditions, strategies, cutoffs, iterations=int(iterations), concurrency=concurrency):
+				progress_bar.progress(progress["completed"] / max(progress["total"], 1), text=f"{progress['completed']} of {progress['total']} settings measured")
+				final_progress = progress
+		except Exception as e:
+			st.error(f"Error running the filter lab: {e}")
+			return
+		st.session_state.filter_lab_result = final_progress
+
+	result = st.session_state.filter_lab_result
+	if result:
+		selectivity = result["selectivity"]
+		st.success(f"Measured {len(result['results'])} settings on a filter matching {selectivity['matching']:,} of {selectivity['total']:,} objects ({selectivity['selectivity']:.2%}). Original settings restored: {result['original']}")
+		df, fastest = filter_lab_frame(result["results"])
+		if fastest:
+			st.info(f"Fastest: {fastest['filter_strategy']} with flat search cutoff {int(fastest['flat_search_cutoff'])} (p50 {fastest['p50_ms']:.1f} ms, p99 {fastest['p99_ms']:.1f} ms)")
+			measured = df[df["error"] == ""]
+			st.bar_chart(measured.assign(setting=measured["filter_strategy"] + " / " + measured["flat_search_cutoff"].astype(str)), x="setting", y=["p50_ms", "p99_ms"], x_label="Filter strategy / flat search cutoff", y_label="Latency (ms)", stack=False)
+		if "overlap_with_first" in df and (df["overlap_with_first"].fillna(1.0) < 1.0).any():
+			st.warning("Result sets differ between settings, see overlap_with_first.")
+		st.dataframe(df, width="stretch")
+		st.download_button("Download Lab Results (CSV)", data=df.to_csv(index=False), file_name="filter_lab.csv", mime="text/csv")
+
+# Run one search, through the result cache when enabled. Returns (success, message, df, time_taken, cache_info or None).
+# The latency breakdown of searches that went to the cluster is added to the session history.
+def search(search_type, selected_collection, query, target_vector, alpha, limit, use_cache, query_profile=False, filter_conditions=None):
+	if use_cache:
+		result = run_cached_search(st.session_state.client, search_type, selected_collection, query, target_vector, alpha, limit, query_profile, filter_conditions)
+	else:
+		result = (*run_search(st.session_state.client, search_type, selected_collection, query, target_vector, alpha, limit, query_profile, filter_conditions), None)
+	success, message, df, time_taken, cache_info = result
+	spans = get_spans(df)
+	if success and spans and not (cache_info and cache_info["cached"]):
+		record_spans(st.session_state.search_span_history, spans, search_type=search_type, collection=selected_collection)
+	return result
+
+# Run the pasted query vector, or every vector of the uploaded file, after checking their dimensions against the target vector
+def run_vector_queries(selected_collection, target_vector, query, vector_file, limit, use_cache=False, query_profile=False, filter_conditions=None):
+	print("run_vector_queries() called")
+	try:
+		if vector_file is not None:
+			vectors = load_query_vectors(vector_file, vector_file.name.split('.')[-1].lower())
 		else:
-			success, message, df, time_taken = keyword_search(
-				st.session_state.client,
-				selected_collection,
-				query,
-				limit
-			)
+			vectors = parse_vector_input(query)[None, :]
+		expected = get_vector_dimensions(st.session_state.client, selected_collection, target_vector)
+	except Exception as e:
+		st.error(str(e))
+		return
+	ok, message = check_query_dimensions(vectors, expected, target_vector)
+	if not ok:
+		st.error(message)
+		return
 
-		# Display results
-		display_results(success, message, df, time_taken)
+	if len(vectors) == 1:
+		display_results(*search("Vector", selected_collection, vectors[0], target_vector, 0.5, limit, use_cache, query_profile, filter_conditions))
+		return
+	if len(vectors) > MAX_DISPLAYED_QUERY_VECTORS:
+		st.info(f"Showing the first {MAX_DISPLAYED_QUERY_VECTORS} of {len(vectors)} query vectors. Use Query Workload from File to run all of them.")
+	for index, vector in enumerate(vectors[:MAX_DISPLAYED_QUERY_VECTORS]):
+		with st.expander(f"Query Vector {index + 1}", expanded=index == 0):
+			display_results(*search("Vector", selected_collection, vector, target_vector, 0.5, limit, use_cache, query_profile, filter_conditions))
 
 # Function to display results
-def display_results(success: bool, message: str, df, time_taken: float):
+# cache_info (from the result cache) marks results served from the cache; time_taken is then the latency of the original search
+def display_results(success: bool, message: str, df, time_taken: float, cache_info=None):
 	print("display_results() called")
 	if success:
 		# Create a container for the success message and timing
@@ -164,12 +374,355 @@ def display_results(success: bool, message: str, df, time_taken: float):
 			st.success(message)
 		with col2:
 			st.info(f"Query Time Taken: {time_taken/1000:.3f}s ({time_taken:.2f}ms - {time_taken/1000/60:.3f}m)")
+		if cache_info and cache_info["cached"]:
+			st.caption(f"Served from the result cache: searched {cache_info['age']:.0f}s ago, original query time {time_taken:.2f}ms")
+		elif cache_info:
+			st.caption("Fresh result from the cluster, now cached")
+		display_spans(get_spans(df))
 
 		if not df.empty:
 			st.dataframe(df, width="stretch")
 	else:
 		st.error(message)
 
+# Named vectors of a collection ([] without named vectors)
+def get_vector_names(collection_name):
+	vector_config = st.session_state.client.collections.get(collection_name).config.get().vector_config
+	return list(vector_config.keys()) if vector_config else []
+
+# Compare side A (the selected collection and vector) with side B on the current query or a query set file
+def display_ab_comparison(collections, selected_collection, target_vector, search_type, query, alpha, limit):
+	print("display_ab_comparison() called")
+	col1, col2 = st.columns(2)
+	with col1:
+		st.markdown(f"**A:** {selected_collection}" + (f" / {target_vector}" if target_vector else ""))
+	with col2:
+		collection_b = st.selectbox("B: Collection", options=collections, index=collections.index(selected_collection), key="ab_collection")
+		vector_names_b = get_vector_names(collection_b)
+		target_vector_b = st.selectbox("B: Named Vector", options=vector_names_b, key="ab_vector") if vector_names_b else None
+	query_file = st.file_uploader("Query Set (optional, otherwise the query above)", type=QUERY_FILE_TYPES, key="ab_query_file")
+	max_queries = st.number_input("Max Queries", min_value=1, max_value=100000, value=100, step=50, help="Queries taken from the start of the query set")
+
+	if st.button("Compare"):
+		if collection_b == selected_collection and target_vector_b == target_vector:
+			st.error("Side B must be another collection or another named vector")
+			return
+		sides = [(selected_collection, target_vector), (collection_b, target_vector_b)]
+		try:
+			queries = iter_query_file(query_file, query_file.name.split('.')[-1].lower()) if query_file else [query]
+			with st.spinner("Running the queries on both sides..."):
+				summary, samples_df = run_ab_comparison(st.session_state.client, sides, search_type, islice(queries, int(max_queries)), alpha, limit)
+				configs = pd.DataFrame({f"{side} ({collection_name}{' / ' + vector if vector else ''})": memory_config(st.session_state.client, collection_name, vector) for side, (collection_name, vector) in zip(["A", "B"], sides)})
+		except Exception as e:
+			st.error(f"Error running the comparison: {e}")
+			return
+		st.session_state.ab_result = {"summary": summary, "samples": samples_df, "configs": configs, "limit": limit}
+
+	result = st.session_state.ab_result
+	if result and result["summary"]["queries"]:
+		summary, samples_df, limit = result["summary"], result["samples"], result["limit"]
+		cols = st.columns(3)
+		cols[0].metric("Queries", summary["queries"])
+		cols[1].metric(f"Overlap@{limit}", f"{summary[f'overlap@{limit}']:.1%}")
+		cols[2].metric("Rank Correlation", f"{summary['rank_correlation']:.3f}" if summary["rank_correlation"] is not None else "-")
+		st.dataframe(pd.DataFrame(summary["sides"]), width="stretch", hide_index=True)
+		latencies = samples_df[["A latency_ms", "B latency_ms"]].round(0)
+		st.bar_chart(latencies.apply(lambda column: column.value_counts()).fillna(0).sort_index(), x_label="Latency (ms)", y_label="Queries", stack=False)
+		st.markdown("###### Memory-Relevant Configuration")
+		st.dataframe(result["configs"].astype(str), width="stretch")
+		with st.expander("Per-Query Results"):
+			st.dataframe(samples_df, width="stretch")
+		st.download_button("Download Per-Query Results (CSV)", data=samples_df.to_csv(index=False), file_name="ab_comparison.csv", mime="text/csv")
+
+# Sweep alpha and the fusion type over the current query or a query set file, and show per query whether the vector leg changes the top-k at the current alpha
+def display_alpha_sweep(selected_collection, target_vector, query, alpha, limit, filter_conditions=None):
+	print("display_alpha_sweep() called")
+	col1, col2 = st.columns(2)
+	with col1:
+		alphas_text = st.text_input("Alpha Values", value=", ".join(str(value) for value in DEFAULT_ALPHA_GRID), help="Comma-separated alpha values between 0 (BM25 only) and 1 (vector only)")
+		fusion_types = st.multiselect("Fusion Types", options=ALPHA_SWEEP_FUSION_TYPES, default=ALPHA_SWEEP_FUSION_TYPES)
+		leg_limit = st.number_input("Results per Leg", min_value=1, max_value=10000, value=max(DEFAULT_LEG_LIMIT, limit), step=50, help="BM25 and vector results fetched once per query and fused locally at every alpha")
+	with col2:
+		latency_runs = st.number_input("Latency Runs", min_value=0, max_value=100, value=0, step=1, help="Times the real hybrid query runs per query and grid point to measure latency (0: results only, two searches per query)")
+		min_overlap = st.slider("Vector Leg Adds No Value Above Overlap", min_value=0.0, max_value=1.0, value=1.0, step=0.05, help=f"The vector leg adds no value to a query when the top-k at alpha {alpha} keeps at least this share of the BM25-only top-k")
+		max_queries = st.number_input("Max Queries", min_value=1, max_value=100000, value=100, step=50, help="Queries taken from the start of the query set", key="alpha_sweep_max_queries")
+	query_file = st.file_uploader("Query Set (optional, otherwise the query above)", type=QUERY_FILE_TYPES, key="alpha_sweep_query_file")
+
+	if st.button("Run Alpha Sweep"):
+		try:
+			alphas = parse_alphas(alphas_text)
+		except ValueError as e:
+			st.error(f"Invalid alpha values: {e}")
+			return
+		if not alphas or not fusion_types:
+			st.error("Enter at least one alpha value and select at least one fusion type")
+			return
+		try:
+			queries = iter_query_file(query_file, query_file.name.split('.')[-1].lower()) if query_file else [query]
+			with st.spinner("Sweeping alpha..."):
+				grid_df, queries_df = run_alpha_sweep(st.session_state.client, selected_collection, islice(queries, int(max_queries)), target_vector, alphas, fusion_types, limit, int(leg_limit), int(latency_runs), alpha, min_overlap, filter_conditions)
+		except Exception as e:
+			st.error(f"Error running the alpha sweep: {e}")
+			return
+		st.session_state.alpha_sweep_result = {"grid": grid_df, "queries": queries_df, "limit": limit, "alpha": alpha}
+
+	result = st.session_state.alpha_sweep_result
+	if result and not result["queries"].empty:
+		grid_df, queries_df, limit = result["grid"], result["queries"], result["limit"]
+		measured = queries_df[queries_df["error"] == ""]
+		cols = st.columns(4)
+		cols[0].metric("Queries", len(measured))
+		cols[1].metric("Vector Leg Adds No Value", f"{int((~measured['vector_leg_adds_value'].astype(bool)).sum())}" if not measured.empty else "-", help=f"Queries whose top-k at alpha {result['alpha']} matches BM25 closely enough to drop the vector leg")
+		cols[2].metric("BM25 Leg p50", f"{measured['bm25_leg_ms'].median():.2f}ms" if not measured.empty else "-")
+		cols[3].metric("Vector Leg p50", f"{measured['vector_leg_ms'].median():.2f}ms" if not measured.empty else "-")
+		if not grid_df.empty:
+			st.markdown(f"###### Overlap@{limit} with BM25-only Results")
+			st.line_chart(grid_df.pivot(index="alpha", columns="fusion_type", values=f"overlap_bm25@{limit}"), x_label="Alpha", y_label=f"Overlap@{limit}")
+			if "p50_ms" in grid_df:
+				st.markdown("###### p50 Latency")
+				st.line_chart(grid_df.pivot(index="alpha", columns="fusion_type", values="p50_ms"), x_label="Alpha", y_label="p50 (ms)")
+			st.dataframe(grid_df, width="stretch", hide_index=True)
+		with st.expander("Per-Query Results", expanded=bool((queries_df["error"] != "").any())):
+			st.dataframe(queries_df, width="stretch", hide_index=True)
+		st.download_button("Download Per-Query Results (CSV)", data=queries_df.to_csv(index=False), file_name="alpha_sweep.csv", mime="text/csv")
+
+# Pick collections (and tenants of multi-tenant collections), run the federated search and show the merged top-k and per-target latency
+def display_federated_search(collections, selected_collection, search_type, query, target_vector, alpha, limit):
+	print("display_federated_search() called")
+	selected = st.multiselect("Collections", options=collections, default=[selected_collection], help="Collections with the same schema")
+	targets = []
+	for collection_name in selected:
+		tenant_names = get_tenant_names(st.session_state.client, collection_name)
+		if tenant_names:
+			tenants = st.multiselect(f"Tenants of {collection_name}", options=tenant_names, default=tenant_names, key=f"federated_tenants_{collection_name}")
+			targets.extend((collection_name, tenant) for tenant in tenants)
+		else:
+			targets.append((collection_name, None))
+	normalization = st.selectbox("Score Normalization", options=FEDERATED_NORMALIZATIONS, help="min-max: scores scaled to 0-1 per target, z-score: standardized per target, rank: reciprocal rank fusion, none: raw scores")
+
+	if st.button("Search All"):
+		success, message, df, targets_df, time_taken = federated_search(st.session_state.client, search_type, targets, query, target_vector, alpha, limit, normalization)
+		if not success:
+			st.error(message)
+			if not targets_df.empty:
+				st.dataframe(targets_df, width="stretch")
+			return
+		col1, col2 = st.columns([3, 1])
+		with col1:
+			st.success(message)
+		with col2:
+			st.info(f"Total Time Taken: {time_taken:.2f}ms")
+		slowest = targets_df.iloc[0]
+		if pd.notna(slowest["Latency (ms)"]):
+			st.caption(f"Slowest: {slowest['Collection']}{' / ' + slowest['Tenant'] if slowest['Tenant'] else ''} ({slowest['Latency (ms)']:.2f}ms)")
+		if not df.empty:
+			st.dataframe(df, width="stretch")
+		with st.expander("Per Collection / Tenant", expanded=bool((targets_df["Error"] != "").any())):
+			st.dataframe(targets_df, width="stretch")
+
+# Latency breakdown of one search
+def display_spans(spans):
+	if not spans:
+		return
+	labels = {"request_ms": "Request", "server_ms": "Server", "network_ms": "Network", "build_ms": "DataFrame Build", "total_ms": "Total"}
+	cols = st.columns(len(SPAN_NAMES))
+	for col, name in zip(cols, SPAN_NAMES):
+		col.metric(labels[name], f"{spans[name]:.2f} ms" if spans.get(name) is not None else "-")
+
+# Percentiles and histogram of the latency breakdown of the searches run in this session
+def display_span_history():
+	history = st.session_state.search_span_history
+	if not history:
+		return
+	with st.expander(f"Latency Breakdown History ({len(history)} searches)"):
+		st.dataframe(spans_summary(history), width="stretch", hide_index=True)
+		st.bar_chart(spans_histogram(history), x_label="Latency (ms)", y_label="Searches", stack=False)
+		if st.button("Clear History"):
+			st.session_state.search_span_history = []
+			st.rerun()
+
+# Evaluate recall@k of the selected collection's vectors (every named vector can be evaluated in one run)
+def display_recall_evaluation(selected_collection, vector_names, k):
+	print("display_recall_evaluation() called")
+	if vector_names:
+		target_vectors = st.multiselect("Named Vectors", options=vector_names, default=vector_names, help="Each named vector is evaluated separately")
+	else:
+		target_vectors = [None]
+	col1, col2 = st.columns(2)
+	with col1:
+		num_queries = st.number_input("Sampled Queries", min_value=1, max_value=10000, value=100, step=10, help="Objects used as queries, each one excluded from its own results")
+	with col2:
+		candidate_limit = st.number_input("Ground Truth Objects", min_value=100, max_value=1000000, value=DEFAULT_CANDIDATE_LIMIT, step=1000, help="Objects fetched with their vectors to compute the exact neighbours. Must cover every object with the vector, otherwise recall is not reported.")
+	st.caption(f"k is the Limit above ({k}).")
+
+	if st.button("Evaluate Recall") and target_vectors:
+		with st.spinner("Fetching vectors and computing exact neighbours..."):
+			success, message, summary_df, samples_df = evaluate_recall(st.session_state.client, selected_collection, target_vectors, int(k), int(num_queries), int(candidate_limit))
+		st.session_state.recall_result = {"success": success, "message": message, "summary": summary_df, "samples": samples_df}
+
+	result = st.session_state.recall_result
+	if result:
+		if not result["success"]:
+			st.error(result["message"])
+			return
+		st.success(result["message"])
+		st.dataframe(result["summary"], width="stretch")
+		with st.expander("Per-Query Results"):
+			st.dataframe(result["samples"], width="stretch")
+		st.download_button("Download Per-Query Results (CSV)", data=result["samples"].to_csv(index=False), file_name="recall_evaluation.csv", mime="text/csv")
+
+# Sweep ef settings of the selected (named) vector index and plot recall against p95 latency
+def display_ef_sweep(selected_collection, target_vector, k):
+	print("display_ef_sweep() called")
+	st.warning("The sweep changes the live HNSW settings of this collection while it runs. The original settings are restored at the end.")
+	settings_df = st.data_editor(
+		pd.DataFrame(DEFAULT_EF_SWEEP, columns=EF_SWEEP_FIELDS),
+		num_rows="dynamic",
+		width="stretch",
+		key="ef_sweep_settings",
+		column_config={field: st.column_config.NumberColumn(field, step=1) for field in EF_SWEEP_FIELDS}
+	)
+	st.caption("One setting per row, empty cells keep the current value. ef = -1 uses dynamic ef (dynamic_ef_factor x limit, between dynamic_ef_min and dynamic_ef_max).")
+	col1, col2, col3, col4 = st.columns(4)
+	with col1:
+		num_queries = st.number_input("Sampled Queries", min_value=1, max_value=10000, value=100, step=10, key="sweep_queries")
+	with col2:
+		candidate_limit = st.number_input("Ground Truth Objects", min_value=100, max_value=1000000, value=DEFAULT_CANDIDATE_LIMIT, step=1000, key="sweep_candidates", help="Objects fetched with their vectors to compute the exact neighbours. Must cover every object with the vector.")
+	with col3:
+		min_recall = st.number_input("Recall Target", min_value=0.0, max_value=1.0, value=0.95, step=0.01)
+	with col4:
+		max_p95 = st.number_input("p95 SLO (ms, 0 for none)", min_value=0.0, value=0.0, step=5.0)
+
+	if st.button("Run Sweep"):
+		settings = [setting_from_row(row) for row in settings_df.to_dict("records")]
+		settings = [setting for setting in settings if setting]
+		try:
+			with st.spinner("Fetching vectors and computing exact neighbours..."):
+				collection = st.session_state.client.collections.get(selected_collection)
+				metric = get_distance_metric(collection.config.get(), target_vector)
+				ground_truth = build_ground_truth(collection, target_vector, metric, int(k), int(num_queries), int(candidate_limit))
+			progress_bar = st.progress(0.0, text="Applying settings...")
+			final_progress = None
+			for progress in run_ef_sweep(st.session_state.client, selected_collection, target_vector, settings, ground_truth):
+				progress_bar.progress(progress["completed"] / max(progress["total"], 1), text=f"{progress['completed']} of {progress['total']} settings measured")
+				final_progress = progress
+		except Exception as e:
+			st.error(f"Error running the ef sweep: {e}")
+			return
+		st.session_state.ef_sweep_result = {"results": pd.DataFrame(final_progress["results"]), "original": final_progress["original"], "k": ground_truth["k"]}
+
+	result = st.session_state.ef_sweep_result
+	if result:
+		results, recall_column = result["results"], f"recall@{result['k']}"
+		st.success(f"Measured {len(results)} settings. Original settings restored: {result['original']}")
+		if recall_column in results and "p95_ms" in results:
+			st.scatter_chart(results, x="p95_ms", y=recall_column, x_label="p95 latency (ms)", y_label=recall_column)
+		best = cheapest_setting(results, recall_column, min_recall, max_p95)
+		if best:
+			st.info(f"Cheapest setting meeting the target: {', '.join(f'{field}={int(best[field])}' for field in EF_SWEEP_FIELDS if pd.notna(best.get(field)))} ({recall_column} {best[recall_column]:.3f}, p95 {best['p95_ms']:.1f} ms)")
+		else:
+			st.warning("No setting meets the recall target and p95 SLO.")
+		st.dataframe(results, width="stretch")
+		st.download_button("Download Sweep Results (CSV)", data=results.to_csv(index=False), file_name="ef_sweep.csv", mime="text/csv")
+
+# Upload a query set and run it against the selected collection with the current search settings
+def display_query_workload(selected_collection, search_type, target_vector, alpha, limit, filter_conditions=None):
+	print("display_query_workload() called")
+	query_file = st.file_uploader(
+		"Query Set (.txt, .csv, .jsonl, .npy or .fvecs)",
+		type=QUERY_FILE_TYPES,
+		help="Text queries: one per line (.txt), a 'query' column (.csv) or JSON Lines with a 'query' field. Vectors: .npy/.fvecs, or JSON Lines with a 'vector' field."
+	)
+	concurrency = st.slider("Concurrency", min_value=1, max_value=32, value=4, key="workload_concurrency", help="Number of queries in flight at the same time")
+
+	if st.button("Run Workload") and query_file:
+		file_type = query_file.name.split('.')[-1].lower()
+		try:
+			total_queries = count_queries(query_file, file_type)
+			queries = iter_query_file(query_file, file_type)
+		except Exception as e:
+			st.error(f"Could not read the query set: {e}")
+			return
+		# The previous run's result file is replaced by this run's
+		if st.session_state.workload_result:
+			delete_workload_result(st.session_state.workload_result["result_path"])
+			st.session_state.workload_result = None
+		progress_bar = st.progress(0.0, text="Starting workload...")
+		metrics_placeholder = st.empty()
+		final_progress = None
+		# Queries run on worker threads without a Streamlit script context, so read the client here
+		client = st.session_state.client
+		try:
+			for progress in run_query_workload(
+				lambda query: run_search(client, search_type, selected_collection, query, target_vector, alpha, limit, filter_conditions=filter_conditions),
+				queries,
+				concurrency=concurrency,
+				total_queries=total_queries
+			):
+				progress_bar.progress(progress["fraction"] or 0.0, text=f"{progress['completed']:,} queries ({progress['qps']:,.1f} QPS)")
+				display_workload_metrics(metrics_placeholder, progress)
+				final_progress = progress
+		except Exception as e:
+			st.error(f"Error running the query set: {e}")
+			return
+		st.session_state.workload_result = dict(final_progress, file_name=query_file.name)
+
+	result = st.session_state.workload_result
+	if result:
+		st.success(f"{result['completed']:,} queries from {result['file_name']} in {result['elapsed']:.1f}s")
+		display_workload_metrics(st.empty(), result)
+		if result["result_path"]:
+			with open(result["result_path"], "rb") as f:
+				st.download_button("Download Per-Query Results (CSV)", data=f, file_name="query_workload_results.csv", mime="text/csv", on_click=discard_workload_result_file)
+
+# The per-query results are only kept until they are downloaded
+def discard_workload_result_file():
+	result = st.session_state.workload_result
+	if result:
+		delete_workload_result(result["result_path"])
+		result["result_path"] = None
+
+# Aggregate metrics of a running or finished workload
+def display_workload_metrics(placeholder, progress):
+	with placeholder.container():
+		cols = st.columns(6)
+		cols[0].metric("QPS", f"{progress['qps']:,.1f}")
+		cols[1].metric("p50", f"{progress['p50_ms']:.1f} ms" if "p50_ms" in progress else "-")
+		cols[2].metric("p99", f"{progress['p99_ms']:.1f} ms" if "p99_ms" in progress else "-")
+		cols[3].metric("Max", f"{progress['max_ms']:.1f} ms" if "max_ms" in progress else "-")
+		cols[4].metric("Avg Hits", f"{progress['avg_hits']:.1f}")
+		cols[5].metric("Error Rate", f"{progress['error_rate']:.1%}")
+
+# Display the last benchmark: summary metrics, latency distribution and downloads
+def display_benchmark_result():
+	print("display_benchmark_result() called")
+	result = st.session_state.benchmark_result
+	if not result:
+		return
+	summary, samples = result["summary"], result["samples"]
+	if "p50_ms" not in summary:
+		st.error(f"All {summary['runs']} queries failed: {samples[0]['error'] if samples else ''}")
+		return
+
+	cols = st.columns(len(BENCHMARK_PERCENTILES) + 3)
+	for col, percentile in zip(cols, BENCHMARK_PERCENTILES):
+		col.metric(f"p{percentile}", f"{summary[f'p{percentile}_ms']:.1f} ms")
+	cols[-3].metric("Max", f"{summary['max_ms']:.1f} ms")
+	cols[-2].metric("QPS", f"{summary['qps']:.1f}")
+	cols[-1].metric("Error Rate", f"{summary['error_rate']:.1%}")
+	st.caption(f"{summary['runs']} runs at concurrency {summary['concurrency']} in {summary['wall_seconds']:.2f}s - {result['parameters']['search_type']} search on {result['parameters']['collection']}")
+
+	samples_df = pd.DataFrame(samples)
+	st.bar_chart(samples_df.loc[samples_df["success"], "latency_ms"].round(0).value_counts().sort_index(), x_label="Latency (ms)", y_label="Queries")
+	with st.expander("Samples"):
+		st.dataframe(samples_df, width="stretch")
+
+	col1, col2 = st.columns(2)
+	with col1:
+		st.download_button("Download Samples (CSV)", data=benchmark_to_csv(samples), file_name="search_benchmark.csv", mime="text/csv")
+	with col2:
+		st.download_button("Download Report (JSON)", data=benchmark_to_json(summary, samples, result["parameters"]), file_name="search_benchmark.json", mime="application/json")
+
 def main():
 	set_custom_page_config(page_title="Search")
 	navigate()
@@ -300,7 +300,7 @@ update_side_bar_labels()
 # Main Page Content (Cluster Operations)
 # --------------------------------------------------------------------------
 st.markdown("###### ⚠️ Important: This tool is designed and tested on the latest Weaviate DB version. Some features may not be compatible with older versions. Please ensure you are using the latest stable version of Weaviate DB for optimal performance.")
-st.markdown("Aggregation & Read Data is cached in the session state for an hour - to clear the cache either clear the cache in the Streamlit Developer Options or Disconnect then reconnect again.")
+st.markdown("Aggregation & Read Data is cached per cluster for an hour and refreshed automatically when a collection or tenant is changed through this app - to clear it manually use the Cache panel in the side bar or Disconnect then reconnect again.")
 
 # --------------------------------------------------------------------------
 # Buttons (calls a function)
@@ -0,0 +1,235 @@
+import copy
+import datetime
+import enum
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.cache import disk_cache
+
+# Process-wide cache shared by all sessions. Every entry is keyed by the cluster it came from,
+# so results from one cluster are never served for another, and carries the collection/tenant
+# it depends on so writes can invalidate exactly what they touch.
+MAX_ENTRIES = 512
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "disk_loads": 0}
+_refreshing = set()
+
+# Identify the connected cluster: endpoint plus a hash of the API key (different keys can see different data under RBAC).
+# It comes from the session, so it is only known on a script thread: worker threads would silently see an empty session
+# and key their entries to the wrong cluster, so they get an error instead (read the data on the script thread).
+def get_cluster_id():
+	if get_script_run_ctx(suppress_warning=True) is None:
+		raise RuntimeError("get_cluster_id() needs a Streamlit script thread: call cached functions before handing work to other threads")
+	endpoint = st.session_state.get("active_endpoint", "")
+	api_key = st.session_state.get("active_api_key", "")
+	key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12] if api_key else "anonymous"
+	return f"{endpoint}#{key_hash}"
+
+# Scalar argument types whose repr is a complete, stable key
+KEY_SCALAR_TYPES = (str, bytes, int, float, bool, type(None), datetime.date, datetime.time, datetime.timedelta, enum.Enum)
+
+# Stable key form of an argument. Containers are walked, arrays and DataFrames are hashed over their full contents
+# (their repr is truncated, so two different large arguments could share a key); anything else is rejected.
+def key_part(value):
+	if isinstance(value, KEY_SCALAR_TYPES):
+		return value
+	if isinstance(value, (list, tuple)):
+		return (type(value).__name__, tuple(key_part(item) for item in value))
+	if isinstance(value, (set, frozenset)):
+		return ("set", tuple(sorted(repr(key_part(item)) for item in value)))
+	if isinstance(value, dict):
+		return ("dict", tuple((key_part(item_key), key_part(item)) for item_key, item in value.items()))
+	if isinstance(value, np.ndarray):
+		array = np.ascontiguousarray(value)
+		return ("ndarray", str(array.dtype), array.shape, hashlib.sha256(array.tobytes()).hexdigest())
+	if isinstance(value, np.generic):
+		return value.item()
+	if isinstance(value, (pd.DataFrame, pd.Series)):
+		hashed = pd.util.hash_pandas_object(value, index=True).to_numpy()
+		columns = tuple(map(str, value.columns)) if isinstance(value, pd.DataFrame) else value.name
+		return (type(value).__name__, columns, hashlib.sha256(hashed.tobytes()).hexdigest())
+	raise TypeError(f"Cannot build a cache key from an argument of type {type(value).__name__}")
+
+# Key of a call's arguments (the client excluded): a hash of their stable key form
+def arguments_key(arguments):
+	return hashlib.sha256(repr(key_part(arguments)).encode("utf-8")).hexdigest()
+
+# Cached values are shared by every session of the process, so callers get their own copy to mutate
+def copy_value(value):
+	if isinstance(value, (pd.DataFrame, pd.Series)):
+		return value.copy()
+	return copy.deepcopy(value)
+
+# Decorator caching a function's result per cluster for ttl seconds.
+# The first argument (the client) is excluded from the key, like the _client convention of st.cache_data.
+# collection_arg / tenant_arg name the parameters holding the collection and tenant, so invalidate() can target them.
+# Functions without a collection_arg are cluster-wide and are dropped on any write.
+# persist=True also keeps a snapshot on disk (when enabled, see disk_cache): after a restart the snapshot is
+# served straight away marked stale, while the function re-runs in a background thread to refresh it.
+# Results that are error dicts are returned but never cached.
+# max_entries bounds the entries of this namespace (least recently used go first) on top of the global MAX_ENTRIES.
+def cluster_cache(namespace, ttl=3600, collection_arg=None, tenant_arg=None, persist=False, max_entries=None):
+	def decorator(func):
+		signature = inspect.signature(func)
+
+		@wraps(func)
+		def wrapper(*args, **kwargs):
+			bound = signature.bind(*args, **kwargs)
+			bound.apply_defaults()
+			arguments = arguments_key(list(bound.arguments.items())[1:])
+			collection_name = bound.arguments.get(collection_arg) if collection_arg else None
+			tenant_name = bound.arguments.get(tenant_arg) if tenant_arg else None
+			cluster_id = get_cluster_id()
+			key = (cluster_id, namespace, arguments)
+
+			now = time.monotonic()
+			with _lock:
+				entry = _entries.get(key)
+				if entry is not None:
+					if now - entry["created"] < ttl:
+						_entries.move_to_end(key)
+						_stats["hits"] += 1
+						return copy_value(entry["value"])
+					del _entries[key]
+					_stats["evictions"] += 1
+				_stats["misses"] += 1
+
+			if persist:
+				snapshot = disk_cache.load_snapshot(cluster_id, namespace, arguments)
+				if snapshot is not None:
+					value, saved_at = snapshot
+					with _lock:
+						_stats["disk_loads"] += 1
+					store(key, value, collection_name, tenant_name, saved_at=saved_at, stale=True, max_entries=max_entries)
+					refresh_in_background(key, func, args, kwargs, collection_name, tenant_name)
+					return copy_value(value)
+
+			value = func(*args, **kwargs)
+			if not is_error(value):
+				store(key, value, collection_name, tenant_name, max_entries=max_entries)
+				if persist:
+					disk_cache.save_snapshot(cluster_id, namespace, arguments, collection_name, value)
+				return copy_value(value)
+			return value
+
+		return wrapper
+	return decorator
+
+def is_error(value):
+	return isinstance(value, dict) and "error" in value
+
+# Put a value in the memory cache, evicting the least recently used entries beyond MAX_ENTRIES (and beyond max_entries in its namespace)
+def store(key, value, collection_name, tenant_name, saved_at=None, stale=False, max_entries=None):
+	with _lock:
+		_entries[key] = {
+			"value": value,
+			"created": time.monotonic(),
+			"saved_at": saved_at or time.time(),
+			"stale": stale,
+			"namespace": key[1],
+			"collection": collection_name,
+			"tenant": tenant_name,
+		}
+		_entries.move_to_end(key)
+		if max_entries is not None:
+			namespace_keys = [entry_key for entry_key in _entries if entry_key[1] == key[1]]
+			for entry_key in namespace_keys[:max(len(namespace_keys) - max_entries, 0)]:
+				del _entries[entry_key]
+				_stats["evictions"] += 1
+		while len(_entries) > MAX_ENTRIES:
+			_entries.popitem(last=False)
+			_stats["evictions"] += 1
+
+# Re-run a function whose result was served from a disk snapshot and replace the stale entry once done.
+# Only one refresh per key runs at a time.
+def refresh_in_background(key, func, args, kwargs, collection_name, tenant_name):
+	with _lock:
+		if key in _refreshing:
+			return
+		_refreshing.add(key)
+
+	def refresh():
+		try:
+			value = func(*args, **kwargs)
+			if is_error(value):
+				return
+			with _lock:
+				# Skip if the entry was invalidated meanwhile - the next call will fetch fresh data anyway
+				still_cached = key in _entries
+			if still_cached:
+				store(key, value, collection_name, tenant_name)
+				disk_cache.save_snapshot(key[0], key[1], key[2], collection_name, value)
+		except Exception as e:
+			print(f"Error refreshing '{key[1]}' in the background: {e}")
+		finally:
+			with _lock:
+				_refreshing.discard(key)
+
+	threading.Thread(target=refresh, name=f"refresh-{key[1]}", daemon=True).start()
+
+# Wall-clock time and staleness of the cached entry of a namespace on the connected cluster (latest one if several)
+def get_snapshot_info(namespace):
+	cluster_id = get_cluster_id()
+	with _lock:
+		matches = [entry for key, entry in _entries.items() if key[0] == cluster_id and entry["namespace"] == namespace]
+	if not matches:
+		return None
+	entry = max(matches, key=lambda e: e["created"])
+	return {"saved_at": entry["saved_at"], "stale": entry["stale"]}
+
+# Drop the entries a write to collection_name (and optionally tenant_name) can affect on the connected cluster.
+# Cluster-wide entries (e.g. aggregations) always go; tenant-scoped writes keep other tenants' entries.
+# The matching disk snapshots are deleted too unless include_disk is False.
+def invalidate(collection_name=None, tenant_name=None, include_disk=True):
+	cluster_id = get_cluster_id()
+	print(f"invalidate() called for collection: {collection_name}, tenant: {tenant_name}")
+	if include_disk:
+		disk_cache.delete_snapshots(cluster_id, collection_name)
+	with _lock:
+		for key in list(_entries.keys()):
+			if key[0] != cluster_id:
+				continue
+			entry = _entries[key]
+			if collection_name is not None and entry["collection"] is not None:
+				if entry["collection"] != collection_name:
+					continue
+				if tenant_name is not None and entry["tenant"] is not None and entry["tenant"] != tenant_name:
+					continue
+			del _entries[key]
+			_stats["invalidations"] += 1
+
+# Drop everything cached in memory for the connected cluster (used on disconnect).
+# Disk snapshots are kept so the next connection starts from them.
+def clear_cluster_cache():
+	print("clear_cluster_cache() called")
+	invalidate(include_disk=False)
+
+# Hit/miss/eviction counters plus a table of the entries held for the connected cluster
+def get_cache_stats():
+	cluster_id = get_cluster_id()
+	now = time.monotonic()
+	with _lock:
+		stats = dict(_stats)
+		stats["entries"] = len(_entries)
+		rows = [
+			{
+				"Namespace": entry["namespace"],
+				"Collection": entry["collection"] or "(cluster-wide)",
+				"Tenant": entry["tenant"] or "",
+				"Age (s)": round(now - entry["created"], 1),
+				"Stale": entry["stale"],
+			}
+			for key, entry in _entries.items() if key[0] == cluster_id
+		]
+	lookups = stats["hits"] + stats["misses"]
+	stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+	return stats, pd.DataFrame(rows)
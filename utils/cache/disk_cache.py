@@ -0,0 +1,105 @@
+import os
+import pickle
+import sqlite3
+import time
+import threading
+
+# Optional on-disk snapshots (SQLite) for schema, nodes and aggregation results so they survive restarts/disconnects.
+# Enabled by pointing WEAVIATE_APP_CACHE_DIR at a writable directory, e.g. WEAVIATE_APP_CACHE_DIR=.cache
+# Only point it at a directory you trust: snapshots are stored with pickle.
+CACHE_DIR_ENV = "WEAVIATE_APP_CACHE_DIR"
+DB_FILE = "snapshots.sqlite3"
+
+_lock = threading.Lock()
+_initialized = set()
+
+# Directory configured for snapshots, or None when the disk cache is disabled
+def get_cache_dir():
+	cache_dir = os.environ.get(CACHE_DIR_ENV, "").strip()
+	return cache_dir or None
+
+def is_enabled():
+	return get_cache_dir() is not None
+
+# Open the snapshot database, creating the directory and table on first use
+def connect():
+	cache_dir = get_cache_dir()
+	os.makedirs(cache_dir, exist_ok=True)
+	path = os.path.join(cache_dir, DB_FILE)
+	conn = sqlite3.connect(path, timeout=10)
+	if path not in _initialized:
+		conn.execute("""
+			CREATE TABLE IF NOT EXISTS snapshots (
+				cluster_id TEXT NOT NULL,
+				namespace TEXT NOT NULL,
+				arguments TEXT NOT NULL,
+				collection TEXT,
+				saved_at REAL NOT NULL,
+				value BLOB NOT NULL,
+				PRIMARY KEY (cluster_id, namespace, arguments)
+			)
+		""")
+		conn.commit()
+		_initialized.add(path)
+	return conn
+
+# Load a snapshot. Returns (value, saved_at) or None when missing, disabled or unreadable.
+def load_snapshot(cluster_id, namespace, arguments):
+	if not is_enabled():
+		return None
+	try:
+		with _lock:
+			conn = connect()
+			try:
+				row = conn.execute(
+					"SELECT value, saved_at FROM snapshots WHERE cluster_id = ? AND namespace = ? AND arguments = ?",
+					(cluster_id, namespace, arguments)
+				).fetchone()
+			finally:
+				conn.close()
+		if row is None:
+			return None
+		return pickle.loads(row[0]), row[1]
+	except Exception as e:
+		print(f"Error loading snapshot '{namespace}' from disk: {e}")
+		return None
+
+# Save (or replace) a snapshot, timestamped now. Values that cannot be pickled are skipped.
+def save_snapshot(cluster_id, namespace, arguments, collection_name, value):
+	if not is_enabled():
+		return
+	try:
+		payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+		with _lock:
+			conn = connect()
+			try:
+				conn.execute(
+					"INSERT OR REPLACE INTO snapshots (cluster_id, namespace, arguments, collection, saved_at, value) VALUES (?, ?, ?, ?, ?, ?)",
+					(cluster_id, namespace, arguments, collection_name, time.time(), payload)
+				)
+				conn.commit()
+			finally:
+				conn.close()
+	except Exception as e:
+		print(f"Error saving snapshot '{namespace}' to disk: {e}")
+
+# Delete snapshots of a cluster. collection_name limits it to snapshots of that collection plus cluster-wide ones.
+def delete_snapshots(cluster_id, collection_name=None):
+	if not is_enabled():
+		return
+	try:
+		with _lock:
+			conn = connect()
+			try:
+				if collection_name is None:
+					conn.execute("DELETE FROM snapshots WHERE cluster_id = ?", (cluster_id,))
+				else:
+					conn.execute(
+						"DELETE FROM snapshots WHERE cluster_id = ? AND (collection IS NULL OR collection = ?)",
+						(cluster_id, collection_name)
+					)
+				conn.commit()
+			finally:
+				conn.close()
+	except Exception as e:
+		print(f"Error deleting snapshots from disk: {e}")
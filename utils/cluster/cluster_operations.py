@@ -148,7 +148,7 @@ def diagnose_schema(cluster_url, api_key):
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to fetch schema for diagnostics: {e}"}
 
-# Get shards information
+# Get shards information. Not cached: this is the live shard status (READONLY checks) and must be current.
 def get_shards_info(client):
     print("get_shards_info() called")
     node_info = client.cluster.nodes(output="verbose")
@@ -4,11 +4,24 @@ import requests
 import time
 from utils.cluster.collection import aggregate_collections, get_schema, list_collections, process_collection_config, fetch_collection_config, get_collectios_count
 from utils.cluster.cluster_operations import fetch_cluster_statistics, process_statistics, get_shards_info, process_shards_data, get_metadata, check_shard_consistency, read_repairs, diagnose_schema
+from utils.cache.cluster_cache import get_snapshot_info, invalidate
+from datetime import datetime
 
 # --------------------------------------------------------------------------
 # Action Handlers (one function per button) for Cluster Operations
 # --------------------------------------------------------------------------
 
+# Show when a cached/snapshotted result was taken and whether it is still being refreshed
+def display_snapshot_status(namespace):
+	info = get_snapshot_info(namespace)
+	if not info:
+		return
+	saved_at = datetime.fromtimestamp(info["saved_at"]).strftime("%Y-%m-%d %H:%M:%S")
+	if info["stale"]:
+		st.warning(f"Showing snapshot from {saved_at} (stale) - refreshing in the background, rerun to see the latest data.")
+	else:
+		st.caption(f"Data as of {saved_at}")
+
 # Fetch node info and display node and shard details.
 def action_nodes_and_shards():
 	print("action_nodes_and_shards called")
@@ -52,6 +65,7 @@ def action_nodes_and_shards():
 							status="READY",
 							shard_names=shard_names
 						)
+						invalidate(collection_name)
 						st.success(f"Updated {len(shard_names)} shard(s) in '{collection_name}' to READY.")
 						st.success(result)
 					except Exception as e:
@@ -85,6 +99,7 @@ def action_aggregate_collections_tenants():
 	if "error" in result:
 		st.error(f"Error retrieving collections: {result['error']}")
 		return
+	display_snapshot_status("aggregate_collections")
 
 	# Display collection statistics
 	collection_count = result["collection_count"]
@@ -157,6 +172,7 @@ def action_collection_schema():
 		if "error" in schema:
 			st.error(schema["error"])
 		else:
+			display_snapshot_status("schema")
 			st.markdown("#### Collection Properties")
 			for collection_name, collection_details in schema.items():
 				with st.expander(f"{collection_name}", expanded=False):
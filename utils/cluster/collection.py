@@ -1,6 +1,7 @@
 import pandas as pd
 import requests
 import streamlit as st
+from utils.cache.cluster_cache import cluster_cache
 
 # Get collections count
 def get_collectios_count(client):
@@ -9,8 +10,8 @@ def get_collectios_count(client):
 	collection_count = len(collections)
 	return collection_count
 
-# Aggregate collections. Caches the results for 1 hour (Feel free to change).
-@st.cache_data(ttl=3600)
+# Aggregate collections. Caches the results per cluster for 1 hour (Feel free to change).
+@cluster_cache("aggregate_collections", ttl=3600, persist=True)
 def aggregate_collections(_client):
 	print(f"aggregate_collections() called")
 	try:
@@ -115,7 +116,8 @@ def aggregate_collections(_client):
 	except Exception as e:
 		return {"error": str(e)}
 
-# Get the schema of the Weaviate instance.
+# Get the schema of the Weaviate instance. Cached per cluster for 5 minutes and snapshotted to disk when enabled.
+@cluster_cache("schema", ttl=300, persist=True)
 def get_schema(client):
 	print("get_schema() called")
 	try:
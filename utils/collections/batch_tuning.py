@@ -0,0 +1,104 @@
+import time
+
+# Batching modes offered on the Create page
+BATCH_MODES = ["fixed", "dynamic", "rate_limit", "auto"]
+
+# Bounds for the auto-tune mode
+AUTOTUNE_MIN_BATCH_SIZE = 100
+AUTOTUNE_MAX_BATCH_SIZE = 5000
+AUTOTUNE_MAX_CONCURRENCY = 8
+# Objects per tuning window, in batches of the current size (times the concurrency)
+AUTOTUNE_WINDOW_BATCHES = 5
+# Back off when the async vector indexing queue of the collection grows beyond this many objects
+AUTOTUNE_MAX_VECTOR_QUEUE = 100000
+# How long to wait for the vector queue to drain before continuing anyway
+AUTOTUNE_MAX_WAIT_SECONDS = 60
+
+# Open the client batch context for a mode.
+# fixed: batch_size/concurrent_requests as given. dynamic: the client sizes batches from server load.
+# rate_limit: at most requests_per_minute objects per minute (for rate-limited vectorizer APIs).
+# auto: fixed-size windows whose size and concurrency are retuned between windows (see autotune_step).
+def open_batch(client, batch_mode, batch_size, concurrent_requests=None, requests_per_minute=None):
+	if batch_mode == "dynamic":
+		return client.batch.dynamic()
+	if batch_mode == "rate_limit":
+		return client.batch.rate_limit(requests_per_minute=requests_per_minute or 600)
+	if concurrent_requests:
+		return client.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests)
+	return client.batch.fixed_size(batch_size=batch_size)
+
+# Number of objects auto mode sends before re-evaluating its settings
+def window_size(state):
+	return state["batch_size"] * state["concurrent_requests"] * AUTOTUNE_WINDOW_BATCHES
+
+# Vector queue length summed over the collection's shards and whether any shard went READONLY (from the nodes endpoint)
+def get_indexing_pressure(client, collection_name):
+	try:
+		nodes = client.cluster.nodes(collection=collection_name, output="verbose")
+	except Exception as e:
+		print(f"Error reading nodes for collection '{collection_name}': {e}")
+		return 0, False
+	queue_length = 0
+	readonly = False
+	for node in nodes:
+		for shard in node.shards or []:
+			queue_length += shard.vector_queue_length or 0
+			if shard.vector_indexing_status == "READONLY":
+				readonly = True
+	return queue_length, readonly
+
+# Wait (bounded) for the vector queue to fall below the limit. Returns the last queue length seen.
+def wait_for_vector_queue(client, collection_name, max_vector_queue, max_wait=AUTOTUNE_MAX_WAIT_SECONDS):
+	deadline = time.monotonic() + max_wait
+	queue_length, _ = get_indexing_pressure(client, collection_name)
+	while queue_length > max_vector_queue and time.monotonic() < deadline:
+		time.sleep(2)
+		queue_length, _ = get_indexing_pressure(client, collection_name)
+	return queue_length
+
+# Initial auto-tune state
+def autotune_state(batch_size, concurrent_requests=None):
+	return {
+		"batch_size": max(AUTOTUNE_MIN_BATCH_SIZE, min(batch_size, AUTOTUNE_MAX_BATCH_SIZE)),
+		"concurrent_requests": max(1, min(concurrent_requests or 2, AUTOTUNE_MAX_CONCURRENCY)),
+		"best_objects_per_sec": 0.0,
+		"grow_concurrency": False,
+		# Knob raised by the last step ("concurrent_requests", "batch_size" or None), undone if throughput then drops
+		"last_change": None,
+	}
+
+# Adjust batch size and concurrency after a window (additive increase, multiplicative decrease).
+# window holds objects, failed, seconds; queue_length comes from get_indexing_pressure.
+# Returns a short note describing the decision.
+def autotune_step(state, window, queue_length, max_vector_queue=AUTOTUNE_MAX_VECTOR_QUEUE):
+	objects_per_sec = window["objects"] / max(window["seconds"], 1e-9)
+	error_rate = window["failed"] / window["objects"] if window["objects"] else 0.0
+
+	if error_rate > 0.01 or queue_length > max_vector_queue:
+		state["batch_size"] = max(AUTOTUNE_MIN_BATCH_SIZE, state["batch_size"] // 2)
+		state["concurrent_requests"] = max(1, state["concurrent_requests"] - 1)
+		state["last_change"] = None
+		reason = f"{error_rate:.1%} errors" if error_rate > 0.01 else f"vector queue at {queue_length:,}"
+		return f"Backing off ({reason}): batch size {state['batch_size']}, concurrency {state['concurrent_requests']}"
+
+	if objects_per_sec < state["best_objects_per_sec"] * 0.9:
+		# Throughput dropped after the last increase: undo part of the knob that was raised and hold
+		if state["last_change"] == "concurrent_requests":
+			state["concurrent_requests"] = max(1, state["concurrent_requests"] - 1)
+		elif state["last_change"] == "batch_size":
+			state["batch_size"] = max(AUTOTUNE_MIN_BATCH_SIZE, int(state["batch_size"] * 0.75))
+		state["last_change"] = None
+		return f"Throughput dropped to {objects_per_sec:,.0f} objects/sec: batch size {state['batch_size']}, concurrency {state['concurrent_requests']}"
+
+	state["best_objects_per_sec"] = max(state["best_objects_per_sec"], objects_per_sec)
+	# Alternate between growing concurrency and batch size
+	state["grow_concurrency"] = not state["grow_concurrency"]
+	if state["grow_concurrency"] and state["concurrent_requests"] < AUTOTUNE_MAX_CONCURRENCY:
+		state["concurrent_requests"] += 1
+		state["last_change"] = "concurrent_requests"
+	elif state["batch_size"] < AUTOTUNE_MAX_BATCH_SIZE:
+		state["batch_size"] = min(AUTOTUNE_MAX_BATCH_SIZE, state["batch_size"] + max(100, state["batch_size"] // 4))
+		state["last_change"] = "batch_size"
+	else:
+		state["last_change"] = None
+	return f"{objects_per_sec:,.0f} objects/sec: batch size {state['batch_size']}, concurrency {state['concurrent_requests']}"
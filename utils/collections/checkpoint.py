@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Local checkpoints of imports from the Create page, so an interrupted upload can be resumed.
+# One JSON file per (cluster, collection, file) holding the number of rows committed from the start of the
+# file and the rows that failed. Stored under WEAVIATE_APP_CHECKPOINT_DIR (default .cache/checkpoints).
+CHECKPOINT_DIR_ENV = "WEAVIATE_APP_CHECKPOINT_DIR"
+DEFAULT_CHECKPOINT_DIR = os.path.join(".cache", "checkpoints")
+
+# Rows between two checkpoints. The batch is flushed at each checkpoint so failures are known.
+CHECKPOINT_INTERVAL = 10000
+
+def get_checkpoint_dir():
+	return os.environ.get(CHECKPOINT_DIR_ENV, "").strip() or DEFAULT_CHECKPOINT_DIR
+
+# Identify an import: same cluster, collection and file (name and size)
+def get_checkpoint_id(cluster_id: str, collection_name: str, file_name: str, file_size: int) -> str:
+	key = json.dumps([cluster_id, collection_name, file_name, file_size])
+	return hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+
+def get_checkpoint_path(checkpoint_id: str) -> str:
+	return os.path.join(get_checkpoint_dir(), f"{checkpoint_id}.json")
+
+# Load a checkpoint, or None when there is none (or it is unreadable)
+def load_checkpoint(checkpoint_id: str) -> Optional[Dict[str, Any]]:
+	path = get_checkpoint_path(checkpoint_id)
+	if not os.path.exists(path):
+		return None
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return json.load(f)
+	except Exception as e:
+		print(f"Error loading checkpoint '{checkpoint_id}': {e}")
+		return None
+
+# Save a checkpoint. Written to a temporary file first so a crash never leaves a truncated checkpoint.
+def save_checkpoint(checkpoint_id: str, collection_name: str, committed_rows: int, failed: List[Dict[str, Any]]):
+	checkpoint = {
+		"collection": collection_name,
+		"committed_rows": committed_rows,
+		"failed": failed,
+		"updated_at": time.time(),
+	}
+	try:
+		os.makedirs(get_checkpoint_dir(), exist_ok=True)
+		path = get_checkpoint_path(checkpoint_id)
+		with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+			json.dump(checkpoint, f, default=str)
+		os.replace(f"{path}.tmp", path)
+	except Exception as e:
+		print(f"Error saving checkpoint '{checkpoint_id}': {e}")
+
+def delete_checkpoint(checkpoint_id: str):
+	try:
+		os.remove(get_checkpoint_path(checkpoint_id))
+	except FileNotFoundError:
+		pass
+	except Exception as e:
+		print(f"Error deleting checkpoint '{checkpoint_id}': {e}")
+
+# Failed rows to keep in a checkpoint: this run's failures plus the previous run's failures that were not
+# re-processed yet (at or after processed_row, the first row this run has not sent or recorded as failed; retried rows
+# lie before the resume point, so this is not the checkpoint's committed_rows). A retried row that succeeded is dropped,
+# one that failed again is in errors. One entry per row, entries without a row are dropped.
+def pending_failures(errors: List[Dict[str, Any]], previous_failed: List[Dict[str, Any]], processed_row: int) -> List[Dict[str, Any]]:
+	failed = {entry["row"]: entry for entry in previous_failed if entry["row"] >= processed_row}
+	for error in errors:
+		if error.get("row") is not None:
+			failed[error["row"]] = {"row": error["row"], "uuid": error["uuid"], "error": error["error"]}
+	return [failed[row] for row in sorted(failed)]
+
+# Checkpoint state of one upload (see batch_upload), None when checkpoints are off. With resume the rows the previous
+# run committed are skipped and its failed rows retried. window_rows maps the UUIDs sent since the last checkpoint to
+# their rows, to put the failures reported by the client back on their row.
+def checkpoint_state(checkpoint_id: Optional[str], resume: bool = False, interval: int = CHECKPOINT_INTERVAL) -> Optional[Dict[str, Any]]:
+	if not checkpoint_id:
+		return None
+	previous = load_checkpoint(checkpoint_id) if resume else None
+	previous_failed = previous["failed"] if previous else []
+	return {
+		"id": checkpoint_id,
+		"interval": interval,
+		"resumed": previous is not None,
+		"skip_rows": previous["committed_rows"] if previous else 0,
+		"previous_failed": previous_failed,
+		"retry_rows": {entry["row"] for entry in previous_failed},
+		"window_rows": {},
+	}
+
+# Whether this run sends a row of the file
+def include_row(state: Optional[Dict[str, Any]], row_index: int) -> bool:
+	return state is None or row_index >= state["skip_rows"] or row_index in state["retry_rows"]
+
+def track_row(state: Optional[Dict[str, Any]], uuid, row_index: int):
+	if state is not None:
+		state["window_rows"][str(uuid)] = row_index
+
+# Row of an object sent since the last checkpoint (None when unknown or without checkpoints)
+def tracked_row(state: Optional[Dict[str, Any]], uuid) -> Optional[int]:
+	return state["window_rows"].get(str(uuid)) if state is not None else None
+
+# Whether the rows read in the current window have reached the checkpoint interval
+def checkpoint_due(state: Optional[Dict[str, Any]], window_rows: int) -> bool:
+	return state is not None and window_rows >= state["interval"]
+
+# Save the checkpoint at the end of a window. processed_row is the first row this run has not sent or recorded yet.
+def save_window_checkpoint(state: Dict[str, Any], collection_name: str, errors: List[Dict[str, Any]], processed_row: int):
+	state["window_rows"].clear()
+	save_checkpoint(state["id"], collection_name, max(state["skip_rows"], processed_row), pending_failures(errors, state["previous_failed"], processed_row))
@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterator, BinaryIO, List, Optional
+from weaviate.classes.config import DataType
+
+# Columnar file types read with pyarrow, record batch by record batch
+COLUMNAR_FILE_TYPES = ["parquet", "arrow", "feather", "ipc"]
+
+# Import pyarrow lazily so CSV/JSON imports work without it
+def import_pyarrow():
+	try:
+		import pyarrow  # type: ignore
+		import pyarrow.parquet  # type: ignore
+		import pyarrow.ipc  # type: ignore
+	except ImportError:
+		raise RuntimeError("pyarrow is required for Parquet/Arrow files. Please install requirements.")
+	return pyarrow
+
+# Open an Arrow IPC file; falls back to the streaming format (.arrows) when the file has no footer
+def open_ipc(file_obj: BinaryIO):
+	pa = import_pyarrow()
+	file_obj.seek(0)
+	try:
+		return pa.ipc.open_file(file_obj), True
+	except pa.ArrowInvalid:
+		file_obj.seek(0)
+		return pa.ipc.open_stream(file_obj), False
+
+# Arrow schema of a columnar file, read from its metadata without loading any data
+def read_arrow_schema(file_obj: BinaryIO, file_type: str):
+	pa = import_pyarrow()
+	if file_type == "parquet":
+		file_obj.seek(0)
+		return pa.parquet.ParquetFile(file_obj).schema_arrow
+	reader, _ = open_ipc(file_obj)
+	return reader.schema
+
+# Number of rows from the file metadata (None when only known after reading, e.g. IPC streams)
+def count_columnar_rows(file_obj: BinaryIO, file_type: str) -> Optional[int]:
+	pa = import_pyarrow()
+	if file_type == "parquet":
+		file_obj.seek(0)
+		return pa.parquet.ParquetFile(file_obj).metadata.num_rows
+	reader, is_file = open_ipc(file_obj)
+	if not is_file:
+		return None
+	return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+# Weaviate data type for an Arrow type, or None to leave the column to auto-schema (structs, binary, ...)
+def arrow_to_weaviate_type(arrow_type) -> Optional[DataType]:
+	pa = import_pyarrow()
+	types = pa.types
+	if types.is_list(arrow_type) or types.is_large_list(arrow_type) or types.is_fixed_size_list(arrow_type):
+		value_type = arrow_to_weaviate_type(arrow_type.value_type)
+		return {
+			DataType.TEXT: DataType.TEXT_ARRAY,
+			DataType.INT: DataType.INT_ARRAY,
+			DataType.NUMBER: DataType.NUMBER_ARRAY,
+			DataType.BOOL: DataType.BOOL_ARRAY,
+			DataType.DATE: DataType.DATE_ARRAY,
+		}.get(value_type)
+	if types.is_boolean(arrow_type):
+		return DataType.BOOL
+	if types.is_integer(arrow_type):
+		return DataType.INT
+	if types.is_floating(arrow_type) or types.is_decimal(arrow_type):
+		return DataType.NUMBER
+	if types.is_string(arrow_type) or types.is_large_string(arrow_type) or types.is_dictionary(arrow_type):
+		return DataType.TEXT
+	if types.is_timestamp(arrow_type) or types.is_date(arrow_type):
+		return DataType.DATE
+	return None
+
+# Column name -> Weaviate data type for every column with a known mapping, straight from the Arrow schema
+def arrow_schema_to_weaviate_types(schema) -> Dict[str, DataType]:
+	mapped = {}
+	for field in schema:
+		data_type = arrow_to_weaviate_type(field.type)
+		if data_type is not None:
+			mapped[field.name] = data_type
+	return mapped
+
+# Column-level conversions done once per record batch: decimals to float64, dates and naive timestamps to
+# UTC timestamps, dictionary-encoded columns to plain strings. Keeps per-row work to building the final dict.
+def normalize_record_batch(batch):
+	pa = import_pyarrow()
+	types = pa.types
+	columns = []
+	for column in batch.columns:
+		column_type = column.type
+		if types.is_decimal(column_type):
+			column = column.cast(pa.float64())
+		elif types.is_date(column_type):
+			column = column.cast(pa.timestamp("ms")).cast(pa.timestamp("ms", tz="UTC"))
+		elif types.is_timestamp(column_type) and column_type.tz is None:
+			column = column.cast(pa.timestamp(column_type.unit, tz="UTC"))
+		elif types.is_dictionary(column_type):
+			column = column.cast(column_type.value_type)
+		columns.append(column)
+	return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+# Lazily read record batches of batch_size rows from a Parquet or Arrow IPC file
+def iter_record_batches(file_obj: BinaryIO, file_type: str, batch_size: int = 10000):
+	pa = import_pyarrow()
+	if file_type == "parquet":
+		file_obj.seek(0)
+		yield from pa.parquet.ParquetFile(file_obj).iter_batches(batch_size=batch_size)
+		return
+	reader, is_file = open_ipc(file_obj)
+	if is_file:
+		for i in range(reader.num_record_batches):
+			yield reader.get_batch(i)
+	else:
+		yield from reader
+
+# 2-D NumPy view of a list<float> column whose lists all have the same length (e.g. embeddings), or None.
+# Saves building one Python list per row for vector columns.
+def list_column_to_matrix(column):
+	pa = import_pyarrow()
+	types = pa.types
+	if types.is_fixed_size_list(column.type):
+		size = column.type.list_size
+	elif types.is_list(column.type) or types.is_large_list(column.type):
+		offsets = column.offsets.to_numpy()
+		lengths = offsets[1:] - offsets[:-1]
+		if len(lengths) == 0 or (lengths != lengths[0]).any():
+			return None
+		size = int(lengths[0])
+	else:
+		return None
+	if column.null_count or not types.is_floating(column.type.value_type) or size == 0:
+		return None
+	return column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), size)
+
+# Stream the rows of a columnar file. Columns are converted to Python lists once per record batch
+# and a dict is only built per row as it is handed to the batcher. Null values are left out of the row.
+# array_columns (e.g. vector columns) are handed out as rows of a NumPy array instead, when they have a fixed length.
+def iter_columnar_rows(file_obj: BinaryIO, file_type: str, batch_size: int = 10000, array_columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+	for record_batch in iter_record_batches(file_obj, file_type, batch_size):
+		record_batch = normalize_record_batch(record_batch)
+		names = record_batch.schema.names
+		columns = []
+		for name, column in zip(names, record_batch.columns):
+			matrix = list_column_to_matrix(column) if array_columns and name in array_columns else None
+			columns.append(matrix if matrix is not None else column.to_pylist())
+		for values in zip(*columns):
+			yield {name: value for name, value in zip(names, values) if value is not None}
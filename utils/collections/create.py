@@ -1,48 +1,209 @@
 import csv
+import io
+import itertools
 import json
 import pandas as pd
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Iterable, Iterator, BinaryIO, Callable
 from weaviate import Client
 from weaviate.util import generate_uuid5
-from weaviate.classes.config import Configure
+from weaviate.classes.config import Configure, Property
 from utils.cluster.cluster_operations import get_schema
+from utils.cache.cluster_cache import invalidate
+from utils.collections.columnar import COLUMNAR_FILE_TYPES, iter_columnar_rows, read_arrow_schema, count_columnar_rows, arrow_schema_to_weaviate_types
+from utils.collections.batch_tuning import BATCH_MODES, open_batch, autotune_state, autotune_step, window_size, get_indexing_pressure, wait_for_vector_queue, AUTOTUNE_MAX_VECTOR_QUEUE
+from utils.collections.vectors import row_vectors, DEFAULT_VECTOR_NAME
+from utils.collections.schema_inference import infer_column_types, schema_rows, build_properties, convert_properties
+from utils.collections.checkpoint import CHECKPOINT_INTERVAL, checkpoint_state, include_row, track_row, tracked_row, checkpoint_due, save_window_checkpoint, delete_checkpoint
+from utils.collections.upsert import upsert_state, changed_items
+from utils.collections.tenant_batching import tenant_state, buffer_tenant_row, first_buffered_row, take_tenant_batches, record_tenant_send, record_tenant_failures, tenant_report
 import streamlit as st
 import re
+from functools import lru_cache
 
 # Supported vectorizers
 def get_supported_vectorizers() -> List[str]:
 	print("get_supported_vectorizers() called")
 	return ["text2vec_weaviate", "text2vec_openai", "text2vec_huggingface", "text2vec_cohere", "text2vec_jinaai", "BYOV"]
 
-# Validate file format
-def validate_file_format(file_content: str, file_type: str) -> tuple[bool, str, Optional[List[Dict[str, Any]]]]:
-	print("validate_file_format() called")
+# File types accepted by the Create page. JSON Lines (.jsonl/.ndjson) holds one object per line.
+# Parquet and Arrow IPC (.arrow/.feather/.ipc) are read record batch by record batch with pyarrow.
+SUPPORTED_FILE_TYPES = ["csv", "json", "jsonl", "ndjson"] + COLUMNAR_FILE_TYPES
+
+# Read size used when streaming JSON arrays
+JSON_CHUNK_SIZE = 1024 * 1024
+
+# Largest single JSON object accepted. A malformed object never decodes, so without a bound the parser would keep
+# reading chunks to the end of the file before failing.
+JSON_MAX_OBJECT_SIZE = 64 * 1024 * 1024
+
+# Stream the objects of a JSON array one by one without loading the whole array.
+# Elements must be separated by exactly one comma, with none before the first or after the last, as json.loads requires.
+# Errors are ValueErrors giving the character offset in the file.
+def iter_json_array(text_stream, chunk_size: int = JSON_CHUNK_SIZE, max_object_size: int = JSON_MAX_OBJECT_SIZE) -> Iterator[Dict[str, Any]]:
+	decoder = json.JSONDecoder()
+	buffer = ""
+	pos = 0
+	# Characters dropped from the front of the buffer, to report offsets in the file
+	dropped = 0
+	eof = False
+	# "open": before "[", "first": after "[", "next": after an element, "element": after a comma
+	expect = "open"
+
+	# Read the next chunk onto the unconsumed part of the buffer
+	def read_more():
+		nonlocal buffer, pos, dropped, eof
+		chunk = text_stream.read(chunk_size)
+		if not chunk:
+			eof = True
+		dropped += pos
+		buffer = buffer[pos:] + chunk
+		pos = 0
+
+	while True:
+		# Skip whitespace, reading more when the buffer runs out
+		while True:
+			while pos < len(buffer) and buffer[pos].isspace():
+				pos += 1
+			if pos < len(buffer) or eof:
+				break
+			read_more()
+
+		offset = dropped + pos
+		if pos >= len(buffer):
+			raise ValueError(f"Unexpected end of file at character {offset}: JSON array is not closed")
+		char = buffer[pos]
+		if expect == "open":
+			if char != "[":
+				raise ValueError("JSON must be an array of objects")
+			expect = "first"
+			pos += 1
+			continue
+		if char == "]" and expect in ("first", "next"):
+			# Only whitespace may follow the closing bracket
+			rest = buffer[pos + 1:]
+			while True:
+				if rest.strip():
+					raise ValueError(f"Unexpected data after the end of the JSON array at character {offset + 1}")
+				if eof:
+					return
+				rest = text_stream.read(chunk_size)
+				eof = not rest
+		if expect == "next":
+			if char != ",":
+				raise ValueError(f"Expected ',' or ']' after an array element at character {offset}")
+			expect = "element"
+			pos += 1
+			continue
+		if char in ",]":
+			raise ValueError(f"Unexpected '{char}' at character {offset}: expected an object")
+
+		try:
+			item, end = decoder.raw_decode(buffer, pos)
+		except json.JSONDecodeError as e:
+			if eof:
+				raise ValueError(f"Invalid JSON at character {dropped + e.pos}: {e.msg}") from e
+			if len(buffer) - pos > max_object_size:
+				raise ValueError(f"Invalid JSON at character {dropped + e.pos}, or an object larger than {max_object_size:,} characters: {e.msg}") from e
+			# Object spans the chunk boundary: read more and retry
+			read_more()
+			continue
+		if not isinstance(item, dict):
+			raise ValueError(f"All JSON elements must be objects (character {offset})")
+		yield item
+		expect = "next"
+		pos = end
+		# Drop consumed text so the buffer stays around one chunk
+		if pos > chunk_size:
+			dropped += pos
+			buffer = buffer[pos:]
+			pos = 0
+
+# Stream the rows of an uploaded file (a binary file-like object) as dictionaries, one at a time.
+# Rows are parsed as they are consumed so memory stays bounded by what the caller keeps.
+# array_columns are passed to iter_columnar_rows so vector columns of columnar files arrive as NumPy rows.
+def iter_file_rows(file_obj: BinaryIO, file_type: str, array_columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+	if file_type in COLUMNAR_FILE_TYPES:
+		yield from iter_columnar_rows(file_obj, file_type, array_columns=array_columns)
+		return
+	file_obj.seek(0)
+	text_stream = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
 	try:
 		if file_type == "csv":
-			# Try to parse CSV
-			csv_reader = csv.DictReader(file_content.splitlines())
-			headers = csv_reader.fieldnames
-			if not headers:
-				return False, "CSV file has no headers", None
-			data = list(csv_reader)
-			if not data:
-				return False, "CSV file is empty", None
-			return True, "Valid CSV format", data
+			for row in csv.DictReader(text_stream):
+				yield row
 		elif file_type == "json":
-			# Try to parse JSON
-			data = json.loads(file_content)
-			if not isinstance(data, list):
-				return False, "JSON must be an array of objects", None
-			if not data:
-				return False, "JSON array is empty", None
-			if not all(isinstance(item, dict) for item in data):
-				return False, "All JSON elements must be objects", None
-			return True, "Valid JSON format", data
+			yield from iter_json_array(text_stream)
+		elif file_type in ("jsonl", "ndjson"):
+			for line_number, line in enumerate(text_stream, 1):
+				if not line.strip():
+					continue
+				item = json.loads(line)
+				if not isinstance(item, dict):
+					raise ValueError(f"Line {line_number} is not a JSON object")
+				yield item
 		else:
+			raise ValueError(f"Unsupported file type: {file_type}")
+	finally:
+		# Detach so closing the wrapper does not close the uploaded file
+		text_stream.detach()
+
+# Validate file format on a sample of rows (the rest is validated while streaming during upload)
+def validate_file_format(file_obj: BinaryIO, file_type: str, sample_size: int = 100) -> tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+	print("validate_file_format() called")
+	try:
+		if file_type not in SUPPORTED_FILE_TYPES:
 			return False, f"Unsupported file type: {file_type}", None
+		if file_type == "csv":
+			file_obj.seek(0)
+			text_stream = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+			try:
+				headers = csv.DictReader(text_stream).fieldnames
+			finally:
+				text_stream.detach()
+			if not headers:
+				return False, "CSV file has no headers", None
+		rows = iter_file_rows(file_obj, file_type)
+		try:
+			sample = list(itertools.islice(rows, sample_size))
+		finally:
+			rows.close()
+		if not sample:
+			return False, f"{file_type.upper()} file is empty", None
+		return True, f"Valid {file_type.upper()} format (checked first {len(sample)} rows)", sample
+	except RuntimeError as e:
+		return False, str(e), None
 	except Exception as e:
 		return False, f"Error parsing file: {str(e)}", None
 
+# Number of rows when the file metadata has it (columnar files), so progress can show a percentage and ETA
+def count_file_rows(file_obj: BinaryIO, file_type: str) -> Optional[int]:
+	if file_type not in COLUMNAR_FILE_TYPES:
+		return None
+	try:
+		return count_columnar_rows(file_obj, file_type)
+	except Exception as e:
+		print(f"Error counting rows: {e}")
+		return None
+
+# Editable property schema of a file (see schema_inference.schema_rows), so the server does not have to infer types
+# per value. Columnar files use their own column types, CSV/JSON types are inferred from a sample of rows.
+# Columns without a known type are left to auto-schema. exclude_columns (e.g. vector columns) are not turned into properties.
+def infer_file_schema(file_obj: BinaryIO, file_type: str, sample: Optional[List[Dict[str, Any]]] = None, exclude_columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+	print("infer_file_schema() called")
+	if file_type in COLUMNAR_FILE_TYPES:
+		column_types = {column: data_type.value for column, data_type in arrow_schema_to_weaviate_types(read_arrow_schema(file_obj, file_type)).items()}
+	else:
+		column_types = infer_column_types(sample or [])
+	for column in exclude_columns or []:
+		column_types.pop(column, None)
+	return schema_rows(column_types, build_key_mapping(tuple(column_types)))
+
+# Typed property definitions for a file with the default index settings (see infer_file_schema)
+def derive_file_properties(file_obj: BinaryIO, file_type: str, sample: Optional[List[Dict[str, Any]]] = None, exclude_columns: Optional[List[str]] = None) -> List[Property]:
+	print("derive_file_properties() called")
+	return build_properties(infer_file_schema(file_obj, file_type, sample, exclude_columns))
+
 # Check if required API keys are present for the selected vectorizer
 def check_vectorizer_keys(vectorizer: str) -> tuple[bool, str]:
 	print(f"check_vectorizer_keys() called with vectorizer: {vectorizer}")
@@ -57,7 +218,10 @@ def check_vectorizer_keys(vectorizer: str) -> tuple[bool, str]:
 	return True, ""
 
 # Create a new collection
-def create_collection(client: Client, collection_name: str, vectorizer: str) -> tuple[bool, str]:
+# properties optionally defines the property schema up front instead of relying on auto-schema
+# vector_names creates one named self-provided vector per name for BYOV (default: a single unnamed vector)
+# multi_tenancy enables multi-tenancy: "create" (tenants are created by the importer) or "auto" (auto_tenant_creation)
+def create_collection(client: Client, collection_name: str, vectorizer: str, properties: Optional[List[Property]] = None, vector_names: Optional[List[str]] = None, multi_tenancy: Optional[str] = None) -> tuple[bool, str]:
 	print(f"create_collection() called with collection_name: {collection_name}, vectorizer: {vectorizer}")
 	try:
 		# Check if collection already exists
@@ -81,53 +245,399 @@ def create_collection(client: Client, collection_name: str, vectorizer: str) ->
 		elif vectorizer == "text2vec_jinaai":
 			vector_config = Configure.Vectors.text2vec_jinaai()
 		elif vectorizer == "BYOV":
-			vector_config = Configure.Vectors.self_provided()
+			if vector_names and vector_names != [DEFAULT_VECTOR_NAME]:
+				vector_config = [Configure.Vectors.self_provided(name=name) for name in vector_names]
+			else:
+				vector_config = Configure.Vectors.self_provided()
+		multi_tenancy_config = None
+		if multi_tenancy:
+			multi_tenancy_config = Configure.multi_tenancy(enabled=True, auto_tenant_creation=multi_tenancy == "auto", auto_tenant_activation=True)
 		# Create collection
 		client.collections.create(
 			name=collection_name,
 			vector_config=vector_config,
+			properties=properties,
+			multi_tenancy_config=multi_tenancy_config,
 			replication_config=Configure.replication(3)
 		)
+		invalidate(collection_name)
 		return True, f"Collection '{collection_name}' created successfully"
 	except Exception as e:
 		return False, f"Error creating collection: {str(e)}"
 
+# Property names must start with a letter or underscore and only contain letters, digits and underscores
+INVALID_KEY_CHARS = re.compile(r'[^0-9a-zA-Z_]+')
+VALID_KEY_START = re.compile(r'^[A-Za-z_]')
+
+# Sanitize a single key for Weaviate
+def sanitize_key(key: str) -> str:
+	# Replace spaces and invalid characters with underscores
+	sanitized_key = INVALID_KEY_CHARS.sub('_', key)
+	# Ensure the key starts with a letter or underscore
+	if not VALID_KEY_START.match(sanitized_key):
+		sanitized_key = '_' + sanitized_key
+	return sanitized_key
+
+# Original key -> sanitized key for a header set. Computed once per distinct set of keys, not per object.
+@lru_cache(maxsize=256)
+def build_key_mapping(keys: tuple) -> Dict[str, str]:
+	return {key: sanitize_key(key) for key in keys}
+
 # Sanitize keys for Weaviate
 def sanitize_keys(data_item: Dict[str, Any]) -> Dict[str, Any]:
-	print("sanitize_keys() called")
-	sanitized_item = {}
-	for key, value in data_item.items():
-		# Replace spaces and invalid characters with underscores
-		sanitized_key = re.sub(r'[^0-9a-zA-Z_]+', '_', key)
-		# Ensure the key starts with a letter or underscore
-		if not re.match(r'^[A-Za-z_]', sanitized_key):
-			sanitized_key = '_' + sanitized_key
-		sanitized_item[sanitized_key] = value
-	return sanitized_item
-
-# Batch data. Reduce/Increase Batch Size as per your requirement. You can also pass concurrent_requests in batch.fixed_size(batch_size=1000, concurrent_requests=4)
-def batch_upload(client: Client, collection_name: str, data: List[Dict[str, Any]], batch_size: int = 1000):
-	print(f"batch_upload() called")
+	mapping = build_key_mapping(tuple(data_item))
+	return {mapping[key]: value for key, value in data_item.items()}
+
+# Deterministic UUID of a row. With uuid_columns only those columns identify the row (so edits to other
+# columns update the same object), otherwise the whole row is used as before.
+def row_uuid(row: Dict[str, Any], uuid_columns: Optional[List[str]] = None) -> str:
+	if uuid_columns:
+		return generate_uuid5(tuple(row.get(column) for column in uuid_columns))
+	return generate_uuid5(row)
+
+# Turn a chunk of rows into (properties, uuid) pairs. Rows from one file share their keys, so the
+# key mapping is looked up once per chunk and only rebuilt when the key set changes (e.g. ragged JSON).
+# exclude_columns (vector columns) are left out of the properties and of the whole-row UUID.
+def prepare_rows(rows: List[Dict[str, Any]], uuid_columns: Optional[List[str]] = None, exclude_columns: Optional[List[str]] = None) -> List[tuple]:
+	prepared = []
+	last_keys = None
+	mapping = None
+	for row in rows:
+		if exclude_columns:
+			row = {key: value for key, value in row.items() if key not in exclude_columns}
+		keys = tuple(row)
+		if keys != last_keys:
+			mapping = build_key_mapping(keys)
+			last_keys = keys
+		prepared.append(({mapping[key]: value for key, value in row.items()}, row_uuid(row, uuid_columns)))
+	return prepared
+
+# Read rows in chunks. Yields (chunk, error): a parse error ends the stream after the rows read before it.
+def read_chunks(data: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[tuple]:
+	rows = iter(data)
+	while True:
+		chunk = []
+		try:
+			for row in rows:
+				chunk.append(row)
+				if len(chunk) >= chunk_size:
+					break
+		except Exception as e:
+			yield chunk, e
+			return
+		if not chunk:
+			return
+		yield chunk, None
+
+# Progress snapshot reported by batch_upload. Rates are averaged since the start of the upload.
+# "sent" counts objects in batches already handed to the server (exact once the upload is done).
+def build_progress(started, queued, sent, failed, total_objects=None, bytes_read=None, total_bytes=None, done=False):
+	elapsed = max(time.perf_counter() - started, 1e-9)
+	objects_per_sec = queued / elapsed
+	bytes_per_sec = bytes_read / elapsed if bytes_read is not None else None
+	eta = None
+	if not done:
+		if total_objects and objects_per_sec > 0:
+			eta = max(total_objects - queued, 0) / objects_per_sec
+		elif total_bytes and bytes_per_sec:
+			eta = max(total_bytes - bytes_read, 0) / bytes_per_sec
+	fraction = None
+	if done:
+		fraction = 1.0
+	elif total_objects:
+		fraction = min(queued / total_objects, 1.0)
+	elif total_bytes and bytes_read is not None:
+		fraction = min(bytes_read / total_bytes, 1.0)
+	return {
+		"queued": queued,
+		"sent": sent,
+		"failed": failed,
+		"total_objects": total_objects,
+		"elapsed": elapsed,
+		"objects_per_sec": objects_per_sec,
+		"bytes_read": bytes_read,
+		"bytes_per_sec": bytes_per_sec,
+		"eta": eta,
+		"fraction": fraction,
+		"done": done,
+	}
+
+# Rows for the downloadable error report from client.batch.failed_objects
+def failed_objects_report(failed_objects) -> List[Dict[str, Any]]:
+	report = []
+	for failed in failed_objects:
+		obj = getattr(failed, "object_", None)
+		report.append({
+			"uuid": str(getattr(obj, "uuid", "") or getattr(failed, "original_uuid", "") or ""),
+			"tenant": getattr(obj, "tenant", None) or "",
+			"error": getattr(failed, "message", str(failed)),
+			"properties": json.dumps(getattr(obj, "properties", None), default=str),
+		})
+	return report
+
+# Options of batch_upload and their defaults, passed as one dict (the Create page's upload options):
+# batch_mode picks the client batching strategy (see batch_tuning.open_batch): "fixed" with batch_size and optional concurrent_requests,
+# "dynamic", "rate_limit" with requests_per_minute, or "auto", which retunes batch size and concurrency between windows
+# from observed throughput, errors and the collection's vector queue length (max_vector_queue), and stops if a shard goes READONLY.
+# uuid_columns optionally names the columns the deterministic object UUID is derived from.
+# BYOV: vector_columns maps vector names to the columns holding them; the rows of a side-car vector file are sent as vector_file_name.
+# tenant_column / tenant_creation: multi-tenant imports (see tenant_batching.tenant_state).
+# resume / checkpoint_interval: checkpoints (see checkpoint.checkpoint_state), upsert: change-only upserts (see upsert.upsert_state).
+DEFAULT_UPLOAD_OPTIONS = {
+	"batch_mode": "fixed",
+	"batch_size": 1000,
+	"concurrent_requests": None,
+	"requests_per_minute": None,
+	"max_vector_queue": AUTOTUNE_MAX_VECTOR_QUEUE,
+	"uuid_columns": None,
+	"vector_columns": None,
+	"vector_file_name": DEFAULT_VECTOR_NAME,
+	"tenant_column": None,
+	"tenant_creation": "create",
+	"resume": False,
+	"checkpoint_interval": CHECKPOINT_INTERVAL,
+	"upsert": False,
+}
+
+# Upload options with defaults filled in; unknown names are rejected so a typo does not silently fall back to a default
+def upload_options(options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+	unknown = set(options or {}) - set(DEFAULT_UPLOAD_OPTIONS)
+	if unknown:
+		raise ValueError(f"Unknown upload options: {', '.join(sorted(unknown))}")
+	return dict(DEFAULT_UPLOAD_OPTIONS, **(options or {}))
+
+# Row of the downloadable error report for an object that could not be prepared, queued or sent
+def failed_row(row_index: Optional[int], uuid, error: str, properties, tenant: Optional[str] = None) -> Dict[str, Any]:
+	return {"row": row_index, "uuid": uuid, "tenant": tenant or "", "error": error, "properties": json.dumps(properties, default=str)}
+
+# Prepare the (row index, row) pairs of a chunk as (properties, uuid, vector, row index) items: keys sanitized, properties
+# converted to the declared types and vectors parsed. With a tenant state the items are buffered per tenant instead of returned.
+# Rows that fail are added to errors. Returns (items ready to send, error messages).
+def prepare_items(chunk: List[tuple], options: Dict[str, Any], errors: List[Dict[str, Any]], dimensions: Dict[str, int], property_types: Optional[Dict[str, str]] = None, vector_file=None, tenants: Optional[Dict[str, Any]] = None) -> tuple:
+	vector_columns = options["vector_columns"]
+	exclude_columns = list(vector_columns.values()) if vector_columns else None
+	ready = []
+	messages = []
+	for (row_index, row), (properties, uuid) in zip(chunk, prepare_rows([row for _, row in chunk], options["uuid_columns"], exclude_columns)):
+		try:
+			if property_types:
+				properties = convert_properties(properties, property_types)
+			vector = None
+			if vector_columns or vector_file is not None:
+				vector = row_vectors(row, row_index, vector_columns, vector_file, options["vector_file_name"], dimensions)
+			if tenants:
+				buffer_tenant_row(tenants, row, (properties, uuid, vector, row_index))
+			else:
+				ready.append((properties, uuid, vector, row_index))
+		except Exception as e:
+			errors.append(failed_row(row_index, uuid, str(e), properties))
+			messages.append(f"Failed to queue object {uuid}: {str(e)}")
+	return ready, messages
+
+# Hand items to the batcher. Objects that cannot be queued are added to errors. Returns (objects queued, error messages).
+def add_objects(batch, collection_name: str, items: List[tuple], errors: List[Dict[str, Any]], checkpoint: Optional[Dict[str, Any]] = None, tenant: Optional[str] = None) -> tuple:
+	sent = 0
+	messages = []
+	for properties, uuid, vector, row_index in items:
+		try:
+			batch.add_object(
+				collection=collection_name,
+				properties=properties,
+				uuid=uuid,
+				vector=vector,
+				tenant=tenant
+			)
+			sent += 1
+			track_row(checkpoint, uuid, row_index)
+		except Exception as e:
+			errors.append(failed_row(row_index, uuid, str(e), properties, tenant))
+			messages.append(f"Failed to queue object {uuid}{f' for tenant {tenant}' if tenant else ''}: {str(e)}")
+	return sent, messages
+
+# Send the buffered objects of the tenants due now (all of them with flush_all), one tenant after the other.
+# Objects of tenants that could not be created are reported as failed. Returns (objects queued, error messages).
+def send_tenant_batches(client: Client, batch, collection_name: str, tenants: Dict[str, Any], batch_size: int, errors: List[Dict[str, Any]], checkpoint: Optional[Dict[str, Any]] = None, upsert: Optional[Dict[str, Any]] = None, flush_all: bool = False) -> tuple:
+	ready, failed, error = take_tenant_batches(client, collection_name, tenants, batch_size, flush_all)
+	messages = [error] if error else []
+	for tenant, items in failed:
+		failed_rows = [failed_row(row_index, uuid, error, properties, tenant) for properties, uuid, vector, row_index in items]
+		errors.extend(failed_rows)
+		record_tenant_failures(tenants["stats"], failed_rows)
+	queued = 0
+	for tenant, items in ready:
+		items, upsert_error = changed_items(upsert, items, tenant)
+		if upsert_error:
+			messages.append(f"Tenant {tenant}: {upsert_error}")
+		send_started = time.perf_counter()
+		failed_before = len(errors)
+		sent, tenant_messages = add_objects(batch, collection_name, items, errors, checkpoint, tenant)
+		record_tenant_failures(tenants["stats"], errors[failed_before:])
+		record_tenant_send(tenants["stats"], tenant, sent, time.perf_counter() - send_started)
+		queued += sent
+		messages.extend(tenant_messages)
+	return queued, messages
+
+# Batch data. Reduce/Increase Batch Size as per your requirement (options: see DEFAULT_UPLOAD_OPTIONS).
+# data can be a list or any iterable of rows (e.g. iter_file_rows), which is consumed lazily so only the current batch is held in memory.
+# total_objects overrides len(data) when the row count is known up front (e.g. from Parquet metadata).
+# Yields (success, message, progress): a progress snapshot (see build_progress) at most every progress_interval seconds,
+# plus one message per queue/read error. The last yield has progress["done"] set and progress["errors"] holding the error report rows.
+# bytes_read is an optional callable returning how many bytes of the source were consumed (for bytes/sec and ETA on streamed files).
+# vector_file is a side-car array (see vectors.load_vector_file) whose rows are matched to the data rows by position.
+# Vectors are passed to the client as float32 arrays.
+# property_types (property name -> data type, see schema_inference.property_types) converts values such as CSV strings to the declared types.
+# Multi-tenant imports buffer rows per tenant and send a full batch at a time so each request targets one tenant; the last progress
+# then has progress["tenants"] with per-tenant throughput and failures.
+# checkpoint_id saves a checkpoint every checkpoint_interval rows read: the batch is flushed and the rows committed so far and the
+# failed rows are recorded. The checkpoint is deleted once an upload finishes without failures.
+# Upserts only send new or changed objects; the last progress then has progress["upsert"] with new/changed/unchanged/unverified counts.
+def batch_upload(client: Client, collection_name: str, data: Iterable[Dict[str, Any]], options: Optional[Dict[str, Any]] = None, total_objects: Optional[int] = None, bytes_read: Optional[Callable[[], int]] = None, total_bytes: Optional[int] = None, vector_file=None, property_types: Optional[Dict[str, str]] = None, checkpoint_id: Optional[str] = None, progress_interval: float = 0.5):
+	options = upload_options(options)
+	batch_mode = options["batch_mode"]
+	batch_size = options["batch_size"]
+	print(f"batch_upload() called with batch_mode: {batch_mode}")
 	if not client.collections.exists(collection_name):
 		yield False, f"Collection '{collection_name}' does not exist", None
 		return
 
-	total_objects = len(data)
+	if total_objects is None and hasattr(data, "__len__"):
+		total_objects = len(data)
 
-	with client.batch.fixed_size(batch_size=batch_size) as batch:
-		for i, obj in enumerate(data, 1):
-			sanitized_obj = sanitize_keys(obj)
-			uuid = generate_uuid5(obj)
-			try:
-				batch.add_object(
-					collection=collection_name,
-					properties=sanitized_obj,
-					uuid=uuid
-				)
-				# Yield a queuing message immediately for real-time feedback
-				yield True, f"Queuing object {i}/{total_objects}: {uuid}", None
-			except Exception as e:
-				yield False, f"Failed to queue object {i}/{total_objects}: {str(e)}", None
+	try:
+		upsert = upsert_state(client, collection_name, options["upsert"])
+	except Exception as e:
+		yield False, f"Could not prepare '{collection_name}' for upserts: {str(e)}", None
+		return
+	try:
+		tenants = tenant_state(client, collection_name, options["tenant_column"], options["tenant_creation"])
+	except Exception as e:
+		yield False, f"Could not read the tenants of '{collection_name}': {str(e)}", None
+		return
+
+	# Resume: skip the rows the previous run committed, except the ones that failed
+	checkpoint = checkpoint_state(checkpoint_id, options["resume"], options["checkpoint_interval"])
+	if checkpoint and checkpoint["resumed"]:
+		print(f"batch_upload() resuming after row {checkpoint['skip_rows']} with {len(checkpoint['retry_rows'])} rows to retry")
+		if total_objects is not None:
+			total_objects = max(total_objects - checkpoint["skip_rows"], 0) + len(checkpoint["retry_rows"])
+	tuning = autotune_state(batch_size, options["concurrent_requests"]) if batch_mode == "auto" else None
+	tuning_note = ""
+	started = time.perf_counter()
+	last_report = started
+	queued = 0
+	committed = 0
+	errors = []
+	next_row = 0
+	dimensions = {}
+	chunks = read_chunks(((index, row) for index, row in enumerate(data) if include_row(checkpoint, index)), batch_size)
+	finished = False
+
+	# One batch context for the whole upload, or one per tuning window (auto mode) or checkpoint interval
+	while not finished:
+		finished = True
+		window_started = time.perf_counter()
+		window_queued = 0
+		# Rows read this window: checkpoints follow the file, so upserts that skip unchanged rows still save progress
+		window_rows = 0
+		current_batch_size = tuning["batch_size"] if tuning else batch_size
+		if tuning:
+			batch_context = open_batch(client, "fixed", tuning["batch_size"], tuning["concurrent_requests"])
+		else:
+			batch_context = open_batch(client, batch_mode, batch_size, options["concurrent_requests"], options["requests_per_minute"])
+
+		with batch_context as batch:
+			for chunk, read_error in chunks:
+				if chunk:
+					next_row = chunk[-1][0] + 1
+					window_rows += len(chunk)
+				ready, messages = prepare_items(chunk, options, errors, dimensions, property_types, vector_file, tenants)
+				ready, upsert_error = changed_items(upsert, ready)
+				if upsert_error:
+					messages.append(upsert_error)
+				sent, send_messages = add_objects(batch, collection_name, ready, errors, checkpoint)
+				queued += sent
+				window_queued += sent
+				for message in messages + send_messages:
+					yield False, message, None
+				if read_error is not None:
+					# Malformed row further down the file: stop reading, objects already queued are still sent
+					errors.append(failed_row(next_row, "", f"Stopped reading file after object {queued}: {str(read_error)}", None))
+					yield False, f"Stopped reading file after object {queued}: {str(read_error)}", None
+
+				if tenants:
+					sent, messages = send_tenant_batches(client, batch, collection_name, tenants, current_batch_size, errors, checkpoint, upsert)
+					queued += sent
+					window_queued += sent
+					for message in messages:
+						yield False, message, None
+
+				now = time.perf_counter()
+				if now - last_report >= progress_interval:
+					last_report = now
+					progress = build_progress(
+						started, queued, committed + window_queued - window_queued % current_batch_size, len(errors) + batch.number_errors,
+						total_objects, bytes_read() if bytes_read else None, total_bytes
+					)
+					progress["tuning"] = dict(tuning, note=tuning_note) if tuning else None
+					yield True, f"Queued {queued:,} objects ({progress['objects_per_sec']:,.0f} objects/sec)", progress
+
+				if (tuning and window_queued >= window_size(tuning)) or checkpoint_due(checkpoint, window_rows):
+					finished = False
+					break
+
+			# End of the file: send what is left in the tenant buffers
+			if tenants and finished:
+				sent, messages = send_tenant_batches(client, batch, collection_name, tenants, current_batch_size, errors, checkpoint, upsert, flush_all=True)
+				queued += sent
+				window_queued += sent
+				for message in messages:
+					yield False, message, None
+
+		# The batch context flushes the remaining objects on exit, failures are only final afterwards
+		window_errors = failed_objects_report(client.batch.failed_objects)
+		for error in window_errors:
+			error["row"] = tracked_row(checkpoint, error["uuid"])
+		errors.extend(window_errors)
+		if tenants:
+			record_tenant_failures(tenants["stats"], window_errors)
+		committed += window_queued - len(window_errors)
+		# First row not sent yet: tenant buffers may still hold rows before the last one read
+		buffered_row = first_buffered_row(tenants)
+		processed_row = min(next_row, buffered_row) if buffered_row is not None else next_row
+		if checkpoint:
+			save_window_checkpoint(checkpoint, collection_name, errors, processed_row)
+
+		if tuning and not finished:
+			queue_length, readonly = get_indexing_pressure(client, collection_name)
+			if readonly:
+				errors.append(failed_row(processed_row, "", f"Stopped after {queued} objects: a shard of '{collection_name}' is READONLY", None))
+				yield False, f"A shard of '{collection_name}' went READONLY - stopping the upload. Check disk usage, then set the shards back to READY on the Cluster page.", None
+				break
+			window = {"objects": window_queued, "failed": len(window_errors), "seconds": time.perf_counter() - window_started}
+			tuning_note = autotune_step(tuning, window, queue_length, options["max_vector_queue"])
+			print(f"batch_upload() auto-tune: {tuning_note}")
+			if queue_length > options["max_vector_queue"]:
+				queue_length = wait_for_vector_queue(client, collection_name, options["max_vector_queue"])
+				tuning_note += f" (waited for vector queue, now {queue_length:,})"
+
+	failed = len(errors)
+	progress = build_progress(
+		started, queued, committed, failed,
+		total_objects, bytes_read() if bytes_read else None, total_bytes, done=True
+	)
+	progress["tuning"] = dict(tuning, note=tuning_note) if tuning else None
+	progress["errors"] = errors
+	progress["tenants"] = tenant_report(tenants["stats"]) if tenants else None
+	progress["upsert"] = upsert["counts"] if upsert else None
+	if failed:
+		print(f"batch_upload() finished with {failed} failed objects")
+	if checkpoint and finished and not failed:
+		delete_checkpoint(checkpoint["id"])
+
+	# New objects change the counts and pages cached for this collection
+	invalidate(collection_name)
+
+	yield failed == 0, f"Upload finished: {progress['sent']:,} objects imported, {failed:,} failed in {progress['elapsed']:.1f}s", progress
 
 # Get the newely created collection
 def get_collection_info(client: Client, collection_name: str) -> tuple[bool, str, Optional[Dict[str, Any]]]:
@@ -1,8 +1,12 @@
+from utils.cache.cluster_cache import invalidate
+
 # Delete collections and tenants from collections in Weaviate
 def delete_collections(client, collection_names):
 	print(f"delete_collections() called with: {collection_names}")
 	try:
 		client.collections.delete(collection_names)
+		for collection_name in (collection_names if isinstance(collection_names, list) else [collection_names]):
+			invalidate(collection_name)
 		return True, f"Successfully deleted collections: {', '.join(collection_names if isinstance(collection_names, list) else [collection_names])}"
 	except Exception as e:
 		return False, f"Error deleting collections: {str(e)}"
@@ -12,6 +16,9 @@ def delete_tenants_from_collection(client, collection_name, tenant_names):
 	try:
 		collection = client.collections.get(collection_name)
 		collection.tenants.remove(tenant_names)
+		# Collection-wide entries (like the cached tenant list) are dropped along with each tenant's own entries
+		for tenant_name in tenant_names:
+			invalidate(collection_name, tenant_name)
 		return True, f"Successfully deleted tenants: {', '.join(tenant_names)} from collection {collection_name}"
 	except Exception as e:
 		return False, f"Error deleting tenants from collection {collection_name}: {str(e)}"
@@ -0,0 +1,102 @@
+from datetime import datetime, date, time, timezone
+from weaviate.classes.query import Filter
+
+# Operators offered by the filter builder, grouped by the property types they apply to
+FILTER_OPERATORS = {
+	"text": ["Equal", "Not Equal", "Like", "Contains Any", "Contains All"],
+	"number": ["Equal", "Not Equal", "Greater Than", "Greater or Equal", "Less Than", "Less or Equal"],
+	"boolean": ["Equal", "Not Equal"],
+	"date": ["Equal", "Greater Than", "Greater or Equal", "Less Than", "Less or Equal"],
+	"array": ["Contains Any", "Contains All"],
+}
+
+# Creation time window operators (needs index_timestamps enabled on the inverted index)
+CREATION_TIME_OPERATORS = ["Created After", "Created Before"]
+
+# Get the property names and data types of a collection (used by the property picker and filter builder)
+def get_collection_properties(client, collection_name):
+	print(f"get_collection_properties() called for collection: {collection_name}")
+	try:
+		config = client.collections.get(collection_name).config.get()
+		return {prop.name: getattr(prop.data_type, "value", str(prop.data_type)) for prop in config.properties}
+	except Exception as e:
+		print(f"Error retrieving properties for collection '{collection_name}': {e}")
+		return {}
+
+# Map a Weaviate data type (e.g. "text", "int", "text[]") to a FILTER_OPERATORS group
+def get_operator_group(data_type):
+	if data_type.endswith("[]"):
+		return "array"
+	if data_type in ("int", "number"):
+		return "number"
+	if data_type in ("boolean", "date"):
+		return data_type
+	return "text"
+
+# Convert the raw text typed in the filter builder to the Python type the property expects
+def coerce_filter_value(value, data_type, operator):
+	base_type = data_type[:-2] if data_type.endswith("[]") else data_type
+	if operator in ("Contains Any", "Contains All"):
+		return [coerce_filter_value(item.strip(), base_type, "Equal") for item in str(value).split(",") if item.strip()]
+	if base_type == "int":
+		return int(value)
+	if base_type == "number":
+		return float(value)
+	if base_type == "boolean":
+		return str(value).strip().lower() in ("true", "1", "yes")
+	if base_type == "date":
+		return to_utc_datetime(value)
+	return str(value)
+
+# Dates from st.date_input or ISO strings must be timezone aware for the filter API
+def to_utc_datetime(value):
+	if isinstance(value, datetime):
+		dt = value
+	elif isinstance(value, date):
+		dt = datetime.combine(value, time.min)
+	else:
+		dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+	return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+# Compile a single (property, operator, value) condition to a Weaviate Filter
+def build_condition(property_name, operator, value):
+	if operator == "Created After":
+		return Filter.by_creation_time().greater_or_equal(to_utc_datetime(value))
+	if operator == "Created Before":
+		return Filter.by_creation_time().less_or_equal(to_utc_datetime(value))
+
+	prop = Filter.by_property(property_name)
+	if operator == "Equal":
+		return prop.equal(value)
+	if operator == "Not Equal":
+		return prop.not_equal(value)
+	if operator == "Greater Than":
+		return prop.greater_than(value)
+	if operator == "Greater or Equal":
+		return prop.greater_or_equal(value)
+	if operator == "Less Than":
+		return prop.less_than(value)
+	if operator == "Less or Equal":
+		return prop.less_or_equal(value)
+	if operator == "Like":
+		return prop.like(value)
+	if operator == "Contains Any":
+		return prop.contains_any(value)
+	if operator == "Contains All":
+		return prop.contains_all(value)
+	raise ValueError(f"Unsupported filter operator: {operator}")
+
+# Compile a list of conditions into one Filter (AND-combined). Returns None when there is nothing to filter on.
+# Conditions are kept as plain tuples so they can be part of the cache key.
+def build_filters(conditions):
+	if not conditions:
+		return None
+	compiled = [build_condition(property_name, operator, value) for property_name, operator, value in conditions]
+	return compiled[0] if len(compiled) == 1 else Filter.all_of(compiled)
+
+# Human-readable label for a condition in the UI
+def describe_condition(condition):
+	property_name, operator, value = condition
+	if operator in CREATION_TIME_OPERATORS:
+		return f"creation_time {operator.replace('Created ', '').lower()} {value}"
+	return f"{property_name} {operator} {value}"
@@ -1,6 +1,8 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from weaviate.classes.query import Sort
-import streamlit as st
+from utils.collections.filters import build_filters
+from utils.cache.cluster_cache import cluster_cache
 # List all collections
 def list_all_collections(client):
 	print("list_all_collections() called")
@@ -12,10 +14,12 @@ def list_all_collections(client):
 		return []
 
 # Retrieves tenant names for a given collection if multi-tenancy is enabled.
-def get_tenant_names(client, collection_name):
+# Cached per collection for 5 minutes so reruns don't pull the full tenant list every time.
+@cluster_cache("tenant_names", ttl=300, collection_arg="collection_name")
+def get_tenant_names(_client, collection_name):
 	print(f"get_tenant_names() called for collection: {collection_name}")
 	try:
-		collection = client.collections.get(collection_name)
+		collection = _client.collections.get(collection_name)
 		tenants = collection.tenants.get()
 		return [tenant.name for tenant in tenants.values()] if tenants else []
 	except Exception as e:
@@ -25,17 +29,21 @@ def get_tenant_names(client, collection_name):
 			print(f"Error retrieving tenants: {e}")
 			return []
 
-# Fetches data from a collection with pagination. Caches the results for 1 hour (Feel free to change).
-@st.cache_data(ttl=3600)
-def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, items_per_page=1000):
+# Fetches data from a collection with pagination. Caches the results per cluster for 1 hour (Feel free to change).
+# return_properties limits the properties sent back (None = all), filter_conditions is a tuple of
+# (property, operator, value) conditions compiled server-side, include_vector toggles vector transfer.
+@cluster_cache("collection_data", ttl=3600, collection_arg="collection_name", tenant_arg="tenant_name")
+def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, items_per_page=1000, return_properties=None, filter_conditions=None, include_vector=True):
 	print(f"fetch_collection_data() called")
 	try:
 		collection = _client.collections.get(collection_name)
 		if tenant_name:
 			collection = collection.with_tenant(tenant_name)
 
-		# Get total count first
-		total_count = collection.aggregate.over_all(total_count=True).total_count
+		filters = build_filters(filter_conditions)
+
+		# Get total count first (with the same filter so the page count matches the filtered result)
+		total_count = collection.aggregate.over_all(filters=filters, total_count=True).total_count
 
 		collection_data = []
 
@@ -46,8 +54,10 @@ def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, it
 		query_result = collection.query.fetch_objects(
 			limit=items_per_page,
 			offset=items_to_skip,
+			filters=filters,
+			return_properties=list(return_properties) if return_properties is not None else None,
 			return_metadata=["creation_time", "last_update_time"],
-			include_vector=True,
+			include_vector=include_vector,
 			sort=Sort.by_property("_id", ascending=True)
 		)
 
@@ -55,7 +65,8 @@ def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, it
 		for item in query_result.objects:
 			row = item.properties.copy()
 			row['uuid'] = item.uuid
-			row['vector'] = item.vector
+			if include_vector:
+				row['vector'] = item.vector
 			row['creation_time'] = item.metadata.creation_time
 			row['last_update_time'] = item.metadata.last_update_time
 			if tenant_name:
@@ -90,3 +101,65 @@ def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, it
 			"current_page": page,
 			"items_per_page": items_per_page
 		}
+
+# Reads one tenant's slice for fetch_cross_tenant_data (runs in a worker thread)
+def fetch_tenant_slice(client, collection_name, tenant_name, limit_per_tenant, return_properties, filters, include_vector):
+	collection = client.collections.get(collection_name).with_tenant(tenant_name)
+	matching_count = collection.aggregate.over_all(filters=filters, total_count=True).total_count
+	query_result = collection.query.fetch_objects(
+		limit=limit_per_tenant,
+		filters=filters,
+		return_properties=list(return_properties) if return_properties is not None else None,
+		return_metadata=["creation_time", "last_update_time"],
+		include_vector=include_vector,
+		sort=Sort.by_property("_id", ascending=True)
+	)
+	rows = []
+	for item in query_result.objects:
+		row = item.properties.copy()
+		row['tenant'] = tenant_name
+		row['uuid'] = item.uuid
+		if include_vector:
+			row['vector'] = item.vector
+		row['creation_time'] = item.metadata.creation_time
+		row['last_update_time'] = item.metadata.last_update_time
+		rows.append(row)
+	return rows, matching_count
+
+# Reads a page-limited (optionally filtered) slice from many tenants at once and merges it into one table with a tenant column.
+# max_workers caps how many tenants are queried concurrently. Caches the results per cluster for 1 hour (Feel free to change).
+@cluster_cache("cross_tenant_data", ttl=3600, collection_arg="collection_name")
+def fetch_cross_tenant_data(_client, collection_name, tenant_names, limit_per_tenant=100, return_properties=None, filter_conditions=None, include_vector=False, max_workers=8):
+	print(f"fetch_cross_tenant_data() called for {len(tenant_names)} tenants")
+	filters = build_filters(filter_conditions)
+	collection_data = []
+	tenant_summary = []
+
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		futures = {
+			executor.submit(fetch_tenant_slice, _client, collection_name, tenant_name, limit_per_tenant, return_properties, filters, include_vector): tenant_name
+			for tenant_name in tenant_names
+		}
+		for future in as_completed(futures):
+			tenant_name = futures[future]
+			try:
+				rows, matching_count = future.result()
+				collection_data.extend(rows)
+				tenant_summary.append({"Tenant": tenant_name, "Matching Objects": matching_count, "Returned": len(rows), "Error": ""})
+			except Exception as e:
+				# Inactive (COLD/FROZEN) tenants end up here
+				print(f"Error fetching data from collection '{collection_name}' for tenant '{tenant_name}': {e}")
+				tenant_summary.append({"Tenant": tenant_name, "Matching Objects": 0, "Returned": 0, "Error": str(e)})
+
+	summary_df = pd.DataFrame(tenant_summary)
+	if not summary_df.empty:
+		summary_df = summary_df.sort_values("Tenant").reset_index(drop=True)
+	df = pd.DataFrame(collection_data)
+	if not df.empty:
+		df = df.sort_values(["tenant", "uuid"], key=lambda col: col.astype(str)).reset_index(drop=True)
+	return {
+		"data": df,
+		"tenant_summary": summary_df,
+		"total_count": int(summary_df["Matching Objects"].sum()) if not summary_df.empty else 0,
+		"failed_tenants": int((summary_df["Error"] != "").sum()) if not summary_df.empty else 0
+	}
@@ -0,0 +1,153 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+from weaviate.classes.config import DataType, Property, Tokenization
+from utils.collections.filters import to_utc_datetime
+
+# Property types offered in the schema editor (the ones a flat file column can hold)
+SCHEMA_DATA_TYPES = ["text", "int", "number", "boolean", "date", "uuid", "text[]", "int[]", "number[]", "boolean[]", "date[]", "uuid[]"]
+
+# Tokenizations offered for text properties
+SCHEMA_TOKENIZATIONS = ["word", "lowercase", "whitespace", "field", "trigram"]
+
+# Types that support range filters and free-text (BM25) search
+RANGE_TYPES = ("int", "number", "date")
+TEXT_TYPES = ("text", "text[]")
+
+INT_PATTERN = re.compile(r"^[+-]?\d+$")
+NUMBER_PATTERN = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$")
+UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+BOOL_VALUES = ("true", "false")
+
+# Type of a single value. CSV cells are strings, so numbers, booleans, dates and UUIDs are recognised from their text.
+# Returns None for values that say nothing about the type (empty) or that need auto-schema (nested objects).
+def infer_value_type(value: Any) -> Optional[str]:
+	if value is None or value == "":
+		return None
+	if isinstance(value, bool):
+		return "boolean"
+	if isinstance(value, int):
+		return "int"
+	if isinstance(value, float):
+		return "number"
+	if isinstance(value, (list, tuple)):
+		item_types = {infer_value_type(item) for item in value} - {None}
+		item_type = merge_types(item_types)
+		return f"{item_type}[]" if item_type and not item_type.endswith("[]") else None
+	if isinstance(value, dict):
+		return None
+	text = str(value).strip()
+	if INT_PATTERN.match(text):
+		return "int"
+	if NUMBER_PATTERN.match(text):
+		return "number"
+	if text.lower() in BOOL_VALUES:
+		return "boolean"
+	if DATE_PATTERN.match(text):
+		return "date"
+	if UUID_PATTERN.match(text):
+		return "uuid"
+	return "text"
+
+# Single type for a column from the types seen in it: int and number widen to number, any other mix is text
+def merge_types(types) -> Optional[str]:
+	types = set(types)
+	if not types:
+		return None
+	if len(types) == 1:
+		return types.pop()
+	if types <= {"int", "number"}:
+		return "number"
+	if types <= {"int[]", "number[]"}:
+		return "number[]"
+	if all(t.endswith("[]") for t in types):
+		return "text[]"
+	return "text"
+
+# Column -> type for the columns of a sample of rows. Columns that are always empty (or nested) are left out.
+def infer_column_types(sample: List[Dict[str, Any]]) -> Dict[str, str]:
+	seen = {}
+	for row in sample:
+		for column, value in row.items():
+			value_type = infer_value_type(value)
+			seen.setdefault(column, set())
+			if value_type:
+				seen[column].add(value_type)
+	return {column: merge_types(types) for column, types in seen.items() if merge_types(types)}
+
+# Editable schema rows (one per column) with the default index settings: filterable everywhere,
+# searchable for text, range filters off (they build an extra index, enable them for range-heavy filters)
+def schema_rows(column_types: Dict[str, str], property_names: Dict[str, str]) -> List[Dict[str, Any]]:
+	return [
+		{
+			"Column": column,
+			"Property": property_names[column],
+			"Data Type": data_type,
+			"Tokenization": "word" if data_type in TEXT_TYPES else None,
+			"Filterable": True,
+			"Searchable": data_type in TEXT_TYPES,
+			"Range Filters": False,
+		}
+		for column, data_type in column_types.items()
+	]
+
+# Property definitions from (edited) schema rows. Settings that do not apply to a type are dropped,
+# e.g. tokenization and searchable on numbers, range filters on text.
+def build_properties(rows: List[Dict[str, Any]]) -> List[Property]:
+	properties = []
+	for row in rows:
+		data_type = row["Data Type"]
+		is_text = data_type in TEXT_TYPES
+		properties.append(Property(
+			name=row["Property"],
+			data_type=DataType(data_type),
+			tokenization=Tokenization(row["Tokenization"] or "word") if is_text else None,
+			index_filterable=bool(row["Filterable"]),
+			index_searchable=bool(row["Searchable"]) if is_text else False,
+			index_range_filters=bool(row["Range Filters"]) if data_type in RANGE_TYPES else False,
+		))
+	return properties
+
+# Convert one value to a property type. Values that already have the right type are passed through.
+def convert_value(value: Any, data_type: str) -> Any:
+	if data_type.endswith("[]"):
+		item_type = data_type[:-2]
+		if isinstance(value, str):
+			text = value.strip()
+			value = json.loads(text) if text.startswith("[") else [item.strip() for item in text.split(",") if item.strip()]
+		return [convert_value(item, item_type) for item in value]
+	if data_type in ("text", "uuid"):
+		return value if isinstance(value, str) else str(value)
+	if data_type == "int":
+		if isinstance(value, float):
+			return int(value)
+		return value if isinstance(value, int) and not isinstance(value, bool) else int(str(value).strip())
+	if data_type == "number":
+		return value if isinstance(value, float) else float(value)
+	if data_type == "boolean":
+		return value if isinstance(value, bool) else str(value).strip().lower() in ("true", "1", "yes")
+	if data_type == "date":
+		return to_utc_datetime(value)
+	return value
+
+# Property name -> data type of the typed properties, used to convert each object before it is queued
+def property_types(rows: List[Dict[str, Any]]) -> Dict[str, str]:
+	return {row["Property"]: row["Data Type"] for row in rows}
+
+# Convert an object's properties to their declared types (see property_types). Empty CSV cells of
+# non-text properties are dropped rather than sent as "".
+def convert_properties(properties: Dict[str, Any], types: Dict[str, str]) -> Dict[str, Any]:
+	converted = {}
+	for name, value in properties.items():
+		data_type = types.get(name)
+		if data_type is None:
+			converted[name] = value
+		elif value is None or (value == "" and data_type not in TEXT_TYPES):
+			continue
+		else:
+			try:
+				converted[name] = convert_value(value, data_type)
+			except (TypeError, ValueError) as e:
+				raise ValueError(f"Property '{name}': cannot convert {value!r} to {data_type} ({e})")
+	return converted
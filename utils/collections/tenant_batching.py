@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Optional
+
+# How tenants named in the tenant column come into existence:
+# "create" adds the missing ones in bulk before their first objects are sent, "auto" relies on auto_tenant_creation
+TENANT_CREATION_MODES = ["create", "auto"]
+
+# Tenants are created in requests of this many names
+TENANT_CREATE_CHUNK_SIZE = 100
+
+# Rows are buffered per tenant until a full batch is ready, so each request carries a single tenant (one shard).
+# When this many batches are buffered across all tenants, every buffer is flushed to bound memory.
+MAX_BUFFERED_BATCHES = 20
+
+# Names of the tenants the collection already has. Raises if they cannot be read: assuming there are none would
+# try to create every tenant of the file again.
+def get_existing_tenants(client, collection_name) -> set:
+	print(f"get_existing_tenants() called for collection: {collection_name}")
+	return set(client.collections.get(collection_name).tenants.get().keys())
+
+# Create the tenants not in known_tenants, TENANT_CREATE_CHUNK_SIZE per request, and add them to known_tenants.
+# Returns an error message, or None when all tenants exist.
+def ensure_tenants(client, collection_name, tenant_names, known_tenants: set) -> Optional[str]:
+	missing = sorted(set(tenant_names) - known_tenants)
+	if not missing:
+		return None
+	print(f"ensure_tenants() creating {len(missing)} tenants in '{collection_name}'")
+	tenants = client.collections.get(collection_name).tenants
+	for start in range(0, len(missing), TENANT_CREATE_CHUNK_SIZE):
+		chunk = missing[start:start + TENANT_CREATE_CHUNK_SIZE]
+		try:
+			tenants.create(chunk)
+		except Exception as e:
+			return f"Error creating tenants {', '.join(chunk[:5])}{'...' if len(chunk) > 5 else ''}: {e}"
+		known_tenants.update(chunk)
+	return None
+
+# Tenant state of one upload (see batch_upload), None without a tenant column: rows buffered per tenant,
+# per-tenant statistics and the tenants known to exist. Raises if the existing tenants cannot be read.
+def tenant_state(client, collection_name, tenant_column: Optional[str], tenant_creation: str = "create") -> Optional[Dict[str, Any]]:
+	if not tenant_column:
+		return None
+	return {
+		"column": tenant_column,
+		"creation": tenant_creation,
+		"buffers": {},
+		"stats": {},
+		"known": get_existing_tenants(client, collection_name) if tenant_creation == "create" else set(),
+	}
+
+# Hold an item back until its tenant has a full batch. Items are (properties, uuid, vector, row index) tuples.
+def buffer_tenant_row(state: Dict[str, Any], row: Dict[str, Any], item: tuple):
+	state["buffers"].setdefault(row_tenant(row, state["column"]), []).append(item)
+
+# Lowest row index still held in a tenant buffer (None when nothing is buffered)
+def first_buffered_row(state: Optional[Dict[str, Any]]) -> Optional[int]:
+	if state is None:
+		return None
+	buffered = [items[0][3] for items in state["buffers"].values() if items]
+	return min(buffered) if buffered else None
+
+# Take the buffers of the tenants to send now (all of them with flush_all), creating missing tenants first.
+# Returns (ready [(tenant, items)], failed [(tenant, items)] of tenants that could not be created, error message or None).
+def take_tenant_batches(client, collection_name, state: Dict[str, Any], batch_size: int, flush_all: bool = False) -> tuple:
+	tenants = tenants_to_flush(state["buffers"], batch_size, flush_all)
+	error = None
+	failed = []
+	if state["creation"] == "create":
+		error = ensure_tenants(client, collection_name, tenants, state["known"])
+		if error:
+			failed = [(tenant, state["buffers"].pop(tenant)) for tenant in tenants if tenant not in state["known"]]
+			tenants = [tenant for tenant in tenants if tenant in state["known"]]
+	return [(tenant, state["buffers"].pop(tenant)) for tenant in tenants], failed, error
+
+# Tenant name of a row from the tenant column
+def row_tenant(row: Dict[str, Any], tenant_column: str) -> str:
+	tenant = row.get(tenant_column)
+	if tenant is None or str(tenant).strip() == "":
+		raise ValueError(f"Row has no value in tenant column '{tenant_column}'")
+	return str(tenant).strip()
+
+# Tenants whose buffers should be sent now: the full ones, or all of them when too much is buffered or at the end
+def tenants_to_flush(buffers: Dict[str, List[tuple]], batch_size: int, flush_all: bool = False) -> List[str]:
+	if flush_all or sum(len(items) for items in buffers.values()) >= batch_size * MAX_BUFFERED_BATCHES:
+		return [tenant for tenant, items in buffers.items() if items]
+	return [tenant for tenant, items in buffers.items() if len(items) >= batch_size]
+
+# Record objects sent for a tenant. seconds is the time spent handing them to the batcher
+# (which blocks while the client's queue is full, so it follows the server's pace).
+def record_tenant_send(stats: Dict[str, Dict[str, Any]], tenant: str, objects: int, seconds: float):
+	tenant_stats = stats.setdefault(tenant, {"objects": 0, "failed": 0, "seconds": 0.0})
+	tenant_stats["objects"] += objects
+	tenant_stats["seconds"] += seconds
+
+# Count failed objects (error report rows with a "tenant") per tenant
+def record_tenant_failures(stats: Dict[str, Dict[str, Any]], errors: List[Dict[str, Any]]):
+	for error in errors:
+		tenant = error.get("tenant")
+		if tenant:
+			stats.setdefault(tenant, {"objects": 0, "failed": 0, "seconds": 0.0})["failed"] += 1
+
+# Per-tenant summary rows for the final progress report
+def tenant_report(stats: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+	return [
+		{
+			"tenant": tenant,
+			"objects": tenant_stats["objects"],
+			"failed": tenant_stats["failed"],
+			"seconds": round(tenant_stats["seconds"], 2),
+			"objects_per_sec": round(tenant_stats["objects"] / tenant_stats["seconds"], 1) if tenant_stats["seconds"] > 0 else None,
+		}
+		for tenant, tenant_stats in sorted(stats.items())
+	]
@@ -1,5 +1,6 @@
 from weaviate.classes.config import Reconfigure, PQEncoderType, PQEncoderDistribution, VectorFilterStrategy, ReplicationDeletionStrategy
 import pandas as pd
+from utils.cache.cluster_cache import invalidate
 
 # Get the current configuration of a collection
 def get_collection_config(client, collection_name):
@@ -37,6 +38,7 @@ def update_description_and_inverted_index(client, collection_name, description,
 			update_config['inverted_index_config'] = Reconfigure.inverted_index(**inverted_kwargs)
 		if update_config:
 			collection.config.update(**update_config)
+			invalidate(collection_name)
 		return True
 	except Exception as e:
 		raise Exception(f"Failed to update description/inverted index: {str(e)}")
@@ -67,11 +69,13 @@ def update_multi_tenancy_and_replication(client, collection_name, auto_tenant_cr
 			update_config['replication_config'] = Reconfigure.replication(**repl_kwargs)
 		if update_config:
 			collection.config.update(**update_config)
+			invalidate(collection_name)
 		return True
 	except Exception as e:
 		raise Exception(f"Failed to update multi-tenancy/replication: {str(e)}")
 
-def update_hnsw_vector_index(client, collection_name, dynamic_ef_factor, dynamic_ef_min, dynamic_ef_max, filter_strategy, flat_search_cutoff, vector_cache_max_objects):
+# ef and target_vector are optional: a static ef (-1 for dynamic ef) and the named vector whose index to update (None for the default vector index)
+def update_hnsw_vector_index(client, collection_name, dynamic_ef_factor, dynamic_ef_min, dynamic_ef_max, filter_strategy, flat_search_cutoff, vector_cache_max_objects, ef=None, target_vector=None):
 	print(f"update_hnsw_vector_index is called")
 	try:
 		collection = client.collections.get(collection_name)
@@ -93,8 +97,14 @@ def update_hnsw_vector_index(client, collection_name, dynamic_ef_factor, dynamic
 			hnsw_params['flat_search_cutoff'] = flat_search_cutoff
 		if vector_cache_max_objects is not None:
 			hnsw_params['vector_cache_max_objects'] = vector_cache_max_objects
-		if hnsw_params:
+		if ef is not None:
+			hnsw_params['ef'] = ef
+		if hnsw_params and target_vector:
+			collection.config.update(vector_config=Reconfigure.Vectors.update(name=target_vector, vector_index_config=Reconfigure.VectorIndex.hnsw(**hnsw_params)))
+			invalidate(collection_name)
+		elif hnsw_params:
 			collection.config.update(vectorizer_config=Reconfigure.VectorIndex.hnsw(**hnsw_params))
+			invalidate(collection_name)
 		return True
 	except Exception as e:
 		raise Exception(f"Failed to update HNSW vector index: {str(e)}")
@@ -127,6 +137,7 @@ def update_pq_quantizer(client, collection_name, pq_enabled, pq_centroids, pq_se
 			else:
 				raise Exception(f"Invalid PQEncoderDistribution: {pq_encoder_distribution}")
 		collection.config.update(vectorizer_config=Reconfigure.VectorIndex.hnsw(quantizer=Reconfigure.VectorIndex.Quantizer.pq(**pq_kwargs)))
+		invalidate(collection_name)
 		return True
 	except Exception as e:
 		raise Exception(f"Failed to update PQ quantizer: {str(e)}")
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from weaviate.classes.config import DataType, Property
+from weaviate.classes.query import Filter
+
+# Change-only upserts: every imported object stores a hash of its content in this property. On re-import the
+# hashes of the objects with the same UUIDs are fetched in bulk and only new or changed objects are sent,
+# so unchanged objects are not re-vectorized or re-indexed.
+UPSERT_HASH_PROPERTY = "import_hash"
+
+# The hash property is neither indexed nor vectorized
+def hash_property() -> Property:
+	return Property(
+		name=UPSERT_HASH_PROPERTY,
+		data_type=DataType.TEXT,
+		index_filterable=False,
+		index_searchable=False,
+		skip_vectorization=True,
+	)
+
+# Add the hash property to an existing collection that does not have it yet (before auto-schema would add it as an indexed, vectorized text)
+def ensure_hash_property(client, collection_name):
+	collection = client.collections.get(collection_name)
+	if not any(prop.name == UPSERT_HASH_PROPERTY for prop in collection.config.get().properties):
+		print(f"ensure_hash_property() adding '{UPSERT_HASH_PROPERTY}' to '{collection_name}'")
+		collection.config.add_property(hash_property())
+
+# Hash of an object's properties and vector(s). Keys are sorted so column order does not matter.
+def content_hash(properties: Dict[str, Any], vector=None) -> str:
+	digest = hashlib.blake2b(digest_size=16)
+	digest.update(json.dumps(properties, sort_keys=True, default=str).encode("utf-8"))
+	if isinstance(vector, dict):
+		for name in sorted(vector):
+			digest.update(name.encode("utf-8"))
+			digest.update(np.asarray(vector[name], dtype=np.float32).tobytes())
+	elif vector is not None:
+		digest.update(np.asarray(vector, dtype=np.float32).tobytes())
+	return digest.hexdigest()
+
+# Stored hashes of the objects with the given UUIDs that exist (None for objects imported without a hash)
+def fetch_existing_hashes(collection, uuids: List[str]) -> Dict[str, Any]:
+	response = collection.query.fetch_objects(
+		filters=Filter.by_id().contains_any(uuids),
+		limit=len(uuids),
+		return_properties=[UPSERT_HASH_PROPERTY]
+	)
+	return {str(obj.uuid): obj.properties.get(UPSERT_HASH_PROPERTY) for obj in response.objects}
+
+# Keep the new and changed items of a chunk (items are (properties, uuid, vector, row) tuples) and stamp their hash.
+# counts collects new/changed/unchanged. If the lookup fails every item is sent, which is safe because UUIDs are deterministic,
+# and counted as unverified (they may overwrite existing objects). Returns (items to send, lookup error message or None).
+def select_changed(collection, items: List[tuple], counts: Dict[str, int]) -> Tuple[List[tuple], Optional[str]]:
+	if not items:
+		return items, None
+	hashes = [content_hash(properties, vector) for properties, uuid, vector, row_index in items]
+	try:
+		existing = fetch_existing_hashes(collection, list({str(uuid) for _, uuid, _, _ in items}))
+	except Exception as e:
+		print(f"Error fetching existing objects, sending the whole chunk: {e}")
+		counts["unverified"] += len(items)
+		for (properties, uuid, vector, row_index), digest in zip(items, hashes):
+			properties[UPSERT_HASH_PROPERTY] = digest
+		return items, f"Could not compare {len(items):,} objects with the existing ones, sending them all: {e}"
+	changed = []
+	for (properties, uuid, vector, row_index), digest in zip(items, hashes):
+		if str(uuid) not in existing:
+			counts["new"] += 1
+		elif existing[str(uuid)] == digest:
+			counts["unchanged"] += 1
+			continue
+		else:
+			counts["changed"] += 1
+		properties[UPSERT_HASH_PROPERTY] = digest
+		changed.append((properties, uuid, vector, row_index))
+	return changed, None
+
+# Upsert state of one upload (see batch_upload), None when upserts are off. Adds the hash property first, which raises on failure.
+def upsert_state(client, collection_name, upsert: bool) -> Optional[Dict[str, Any]]:
+	if not upsert:
+		return None
+	ensure_hash_property(client, collection_name)
+	return {"collection": client.collections.get(collection_name), "counts": {"new": 0, "changed": 0, "unchanged": 0, "unverified": 0}}
+
+# Items to send: the new and changed ones with upserts, all of them otherwise. Returns (items, lookup error message or None).
+def changed_items(state: Optional[Dict[str, Any]], items: List[tuple], tenant: Optional[str] = None) -> Tuple[List[tuple], Optional[str]]:
+	if state is None:
+		return items, None
+	collection = state["collection"].with_tenant(tenant) if tenant else state["collection"]
+	return select_changed(collection, items, state["counts"])
@@ -0,0 +1,134 @@
+import os
+import warnings
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+# Side-car vector files accepted for BYOV imports: NumPy .npy (2-D array, one row per object) and .fvecs
+# (per vector: int32 dimension followed by that many float32 values, as used by ANN benchmark datasets)
+VECTOR_FILE_TYPES = ["npy", "fvecs"]
+
+# Name of the vector created by Configure.Vectors.self_provided() without a name
+DEFAULT_VECTOR_NAME = "default"
+
+# Parse a vector cell into a float32 array: "[0.1, 0.2]" / "0.1,0.2" strings from CSV, lists from JSON,
+# or arrays from columnar files. Strings are parsed by NumPy directly instead of through json.loads.
+def parse_vector_value(value: Any) -> np.ndarray:
+	if isinstance(value, np.ndarray):
+		vector = value.astype(np.float32, copy=False)
+	elif isinstance(value, (list, tuple)):
+		vector = np.asarray(value, dtype=np.float32)
+	elif isinstance(value, str):
+		text = value.strip()
+		if text.startswith("[") and text.endswith("]"):
+			text = text[1:-1]
+		# Older NumPy only warns (and truncates) on text it cannot read to the end
+		with warnings.catch_warnings():
+			warnings.simplefilter("error", DeprecationWarning)
+			vector = np.fromstring(text, dtype=np.float32, sep="," if "," in text else " ")
+	else:
+		raise ValueError(f"Unsupported vector value of type {type(value).__name__}")
+	if vector.ndim != 1 or vector.size == 0:
+		raise ValueError("Vector must be a non-empty list of numbers")
+	return vector
+
+# Read the .npy header of a file-like object. Returns (shape, fortran_order, dtype, data offset).
+def read_npy_header(file_obj):
+	file_obj.seek(0)
+	version = np.lib.format.read_magic(file_obj)
+	if version == (1, 0):
+		shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file_obj)
+	else:
+		shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file_obj)
+	return shape, fortran_order, dtype, file_obj.tell()
+
+# View the vectors of an .fvecs buffer (int32 array of the whole file) as a 2-D float32 array
+def fvecs_view(raw: np.ndarray) -> np.ndarray:
+	if raw.size == 0:
+		raise ValueError("Vector file is empty")
+	dimensions = int(raw[0])
+	if dimensions <= 0 or raw.size % (dimensions + 1):
+		raise ValueError("File is not a valid .fvecs file")
+	rows = raw.reshape(-1, dimensions + 1)
+	if not (rows[:, 0] == dimensions).all():
+		raise ValueError("All vectors in an .fvecs file must have the same dimensions")
+	return rows[:, 1:].view(np.float32)
+
+# Open a side-car vector file as a 2-D array without copying it: paths are memory-mapped, uploaded files
+# (in-memory buffers) are viewed in place with np.frombuffer. Rows are converted to float32 one at a time when sent.
+def load_vector_file(source, file_type: str) -> np.ndarray:
+	print(f"load_vector_file() called with file_type: {file_type}")
+	if file_type not in VECTOR_FILE_TYPES:
+		raise ValueError(f"Unsupported vector file type: {file_type}")
+	if isinstance(source, (str, os.PathLike)):
+		if file_type == "npy":
+			vectors = np.load(source, mmap_mode="r")
+		else:
+			vectors = fvecs_view(np.memmap(source, dtype=np.int32, mode="r"))
+	else:
+		buffer = source.getbuffer()
+		if file_type == "npy":
+			shape, fortran_order, dtype, offset = read_npy_header(source)
+			if dtype.hasobject:
+				raise ValueError(".npy files with Python objects are not supported")
+			count = int(np.prod(shape)) if shape else 1
+			vectors = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape, order="F" if fortran_order else "C")
+		else:
+			vectors = fvecs_view(np.frombuffer(buffer, dtype=np.int32))
+	if vectors.ndim != 2 or not np.issubdtype(vectors.dtype, np.number):
+		raise ValueError(f"Vector file must hold a 2-D numeric array, got shape {vectors.shape} ({vectors.dtype})")
+	return vectors
+
+# Missing vector cell: None or a blank string. Columnar files yield NumPy arrays, which must not be compared with ==.
+def is_empty_vector_value(value) -> bool:
+	return value is None or (isinstance(value, str) and not value.strip())
+
+# Check vector dimensions before anything is created: every sampled vector of a column must have the same size,
+# and the side-car file must have one row per object. Returns (ok, message, {vector name: dimensions}).
+def check_vector_dimensions(sample: List[Dict[str, Any]], vector_columns: Optional[Dict[str, str]] = None, vector_file: Optional[np.ndarray] = None, vector_file_name: str = DEFAULT_VECTOR_NAME, total_objects: Optional[int] = None) -> tuple[bool, str, Dict[str, int]]:
+	dimensions = {}
+	for vector_name, column in (vector_columns or {}).items():
+		sizes = set()
+		for row_number, row in enumerate(sample, 1):
+			if is_empty_vector_value(row.get(column)):
+				continue
+			try:
+				sizes.add(parse_vector_value(row[column]).size)
+			except ValueError as e:
+				return False, f"Row {row_number}: column '{column}' is not a vector ({e})", dimensions
+		if not sizes:
+			return False, f"Vector column '{column}' is empty in the first {len(sample)} rows", dimensions
+		if len(sizes) > 1:
+			return False, f"Vector column '{column}' has mixed dimensions: {sorted(sizes)}", dimensions
+		dimensions[vector_name] = sizes.pop()
+	if vector_file is not None:
+		if vector_file_name in dimensions:
+			return False, f"Vector '{vector_file_name}' is set both from a column and from the vector file", dimensions
+		if total_objects is not None and len(vector_file) != total_objects:
+			return False, f"Vector file has {len(vector_file):,} vectors but the data file has {total_objects:,} rows", dimensions
+		if len(vector_file) < len(sample):
+			return False, f"Vector file has only {len(vector_file):,} vectors", dimensions
+		dimensions[vector_file_name] = vector_file.shape[1]
+	return True, ", ".join(f"{name}: {size} dimensions" for name, size in dimensions.items()), dimensions
+
+# Vectors of one row for batch.add_object: a float32 array for a single default vector, otherwise {name: array}.
+# row_index is the position of the row in the file, used to pick its row of the side-car file.
+# dimensions holds the expected size per vector name and is filled from the first vector seen.
+def row_vectors(row: Dict[str, Any], row_index: int, vector_columns: Optional[Dict[str, str]], vector_file: Optional[np.ndarray], vector_file_name: str, dimensions: Dict[str, int]):
+	vectors = {}
+	for vector_name, column in (vector_columns or {}).items():
+		if is_empty_vector_value(row.get(column)):
+			continue
+		vectors[vector_name] = parse_vector_value(row[column])
+	if vector_file is not None:
+		if row_index >= len(vector_file):
+			raise ValueError(f"No vector for row {row_index + 1} in the vector file ({len(vector_file):,} vectors)")
+		vectors[vector_file_name] = np.asarray(vector_file[row_index], dtype=np.float32)
+	for vector_name, vector in vectors.items():
+		expected = dimensions.setdefault(vector_name, vector.size)
+		if vector.size != expected:
+			raise ValueError(f"Vector '{vector_name}' has {vector.size} dimensions, expected {expected}")
+	if not vectors:
+		return None
+	if list(vectors) == [DEFAULT_VECTOR_NAME]:
+		return vectors[DEFAULT_VECTOR_NAME]
+	return vectors
@@ -1,5 +1,6 @@
 import pandas as pd
 import requests
+from utils.cache.cluster_cache import invalidate
 
 # Get object in Non Multitenant collection
 def get_object_in_collection(client, collection_name, uuid):
@@ -120,6 +121,7 @@ def update_object_properties(client, collection_name, uuid, properties, tenant=N
 			uuid=uuid,
 			properties=properties
 		)
+		invalidate(collection_name, tenant)
 		return True
 	except Exception as e:
 		raise Exception(f"Failed to update object: {str(e)}")
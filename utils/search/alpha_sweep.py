@@ -0,0 +1,120 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from weaviate import Client
+from utils.search.benchmark import BENCHMARK_PERCENTILES
+from utils.search.compare import overlap_at_k, rank_correlation
+from utils.search.runner import run_search
+
+# Alpha sweep of hybrid search: each query's BM25 leg (alpha 0) and vector leg (alpha 1) are fetched once with relative
+# score fusion, which returns each leg's scores min-max normalized to [0, 1]. Every (fusion type, alpha) of the grid is
+# then fused locally from these two legs the way Weaviate does it, so the result report costs two searches per query:
+# RANKED: sum of weight / (ALPHA_SWEEP_RRF_K + rank), RELATIVE_SCORE: sum of weight * normalized score,
+# with weight alpha for the vector leg and 1 - alpha for the BM25 leg.
+# Latency can only be measured on the server, so it is optional and runs the real hybrid query at every grid point.
+ALPHA_SWEEP_FUSION_TYPES = ["RANKED", "RELATIVE_SCORE"]
+
+# Alpha grid used by default
+DEFAULT_ALPHA_GRID = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+# Rank offset of ranked fusion (the server's value, ranks start at 0)
+ALPHA_SWEEP_RRF_K = 60
+
+# Results fetched per leg, a few times the limit so lower-ranked leg results can still enter the fused top-k
+DEFAULT_LEG_LIMIT = 100
+
+# Fetch the BM25 and vector legs of one query as [(uuid, normalized score)] best first, with the latency of each leg
+def fetch_legs(client: Client, collection_name: str, query: str, target_vector: Optional[str], leg_limit: int, filter_conditions: Optional[tuple] = None) -> Dict[str, Any]:
+	legs = {}
+	for leg, alpha in (("bm25", 0.0), ("vector", 1.0)):
+		success, message, df, time_taken = run_search(client, "Hybrid", collection_name, query, target_vector, alpha, leg_limit, filter_conditions=filter_conditions, fusion_type="RELATIVE_SCORE")
+		if not success:
+			raise RuntimeError(f"{leg} leg: {message}")
+		legs[leg] = list(zip(df["UUID"], df["Score"].astype(float))) if not df.empty else []
+		legs[f"{leg}_ms"] = time_taken
+	return legs
+
+# UUIDs of the top-k of the legs fused at alpha; ties keep the order of first appearance (vector leg first)
+def fuse_legs(legs: Dict[str, Any], alpha: float, fusion_type: str, limit: int) -> List[str]:
+	scores = {}
+	for leg, weight in (("vector", alpha), ("bm25", 1.0 - alpha)):
+		if weight == 0:
+			continue
+		for rank, (uuid, score) in enumerate(legs[leg]):
+			contribution = weight / (ALPHA_SWEEP_RRF_K + rank) if fusion_type == "RANKED" else weight * score
+			scores[uuid] = scores.get(uuid, 0.0) + contribution
+	return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+# Parse the comma-separated alpha values typed on the page
+def parse_alphas(text: str) -> List[float]:
+	alphas = sorted({float(value) for value in str(text).replace(" ", "").split(",") if value})
+	if any(alpha < 0 or alpha > 1 for alpha in alphas):
+		raise ValueError("Alpha values must be between 0 and 1")
+	return alphas
+
+# Run the sweep over the queries. For every (fusion type, alpha) the fused top-k is compared with the BM25-only top-k,
+# the vector-only top-k and the previous alpha of the grid (how much the results move per step).
+# With latency_runs > 0 the hybrid query is also run latency_runs times per query and grid point.
+# decision_alpha is the alpha the app searches with: per query, the vector leg adds no value at it when the fused
+# top-k keeps at least min_overlap of the BM25-only top-k under every fusion type.
+# Returns (grid_df with one row per fusion type and alpha, queries_df with one row per query).
+def run_alpha_sweep(client: Client, collection_name: str, queries: Iterable[str], target_vector: Optional[str] = None, alphas: List[float] = DEFAULT_ALPHA_GRID, fusion_types: List[str] = ALPHA_SWEEP_FUSION_TYPES, limit: int = 10, leg_limit: int = DEFAULT_LEG_LIMIT, latency_runs: int = 0, decision_alpha: float = 0.5, min_overlap: float = 1.0, filter_conditions: Optional[tuple] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+	print(f"run_alpha_sweep() called for collection: {collection_name}, alphas: {alphas}, fusion_types: {fusion_types}")
+	grid = {(fusion_type, alpha): {"overlap_bm25": [], "overlap_vector": [], "overlap_previous": [], "correlation_bm25": [], "latencies": [], "errors": 0} for fusion_type in fusion_types for alpha in alphas}
+	query_rows = []
+	for index, query in enumerate(queries):
+		row = {"query": index, "text": query}
+		try:
+			legs = fetch_legs(client, collection_name, query, target_vector, max(leg_limit, limit), filter_conditions)
+		except Exception as e:
+			print(f"Error fetching the legs of query {index}: {e}")
+			query_rows.append(dict(row, error=str(e)))
+			continue
+		bm25_ids = [uuid for uuid, _ in legs["bm25"][:limit]]
+		vector_ids = [uuid for uuid, _ in legs["vector"][:limit]]
+		row.update({"bm25_leg_ms": legs["bm25_ms"], "vector_leg_ms": legs["vector_ms"], "bm25_hits": len(legs["bm25"]), "vector_hits": len(legs["vector"])})
+		for fusion_type in fusion_types:
+			previous = None
+			for alpha in alphas:
+				point = grid[(fusion_type, alpha)]
+				ids = fuse_legs(legs, alpha, fusion_type, limit)
+				point["overlap_bm25"].append(overlap_at_k(ids, bm25_ids, limit))
+				point["overlap_vector"].append(overlap_at_k(ids, vector_ids, limit))
+				point["correlation_bm25"].append(rank_correlation(ids, bm25_ids, limit))
+				if previous is not None:
+					point["overlap_previous"].append(overlap_at_k(ids, previous, limit))
+				previous = ids
+				for _ in range(latency_runs):
+					success, message, df, time_taken = run_search(client, "Hybrid", collection_name, query, target_vector, alpha, limit, filter_conditions=filter_conditions, fusion_type=fusion_type)
+					if success:
+						point["latencies"].append(time_taken)
+					else:
+						point["errors"] += 1
+			row[f"{fusion_type} overlap_bm25@{limit}"] = overlap_at_k(fuse_legs(legs, decision_alpha, fusion_type, limit), bm25_ids, limit)
+		row["vector_leg_adds_value"] = any(row[f"{fusion_type} overlap_bm25@{limit}"] < min_overlap for fusion_type in fusion_types)
+		row["error"] = ""
+		query_rows.append(row)
+	return alpha_sweep_frame(grid, limit), pd.DataFrame(query_rows)
+
+# Mean overlaps, rank correlation and latency percentiles per grid point
+def alpha_sweep_frame(grid: Dict[Tuple[str, float], Dict[str, Any]], limit: int) -> pd.DataFrame:
+	rows = []
+	for (fusion_type, alpha), point in grid.items():
+		correlations = [value for value in point["correlation_bm25"] if value is not None]
+		row = {
+			"fusion_type": fusion_type,
+			"alpha": alpha,
+			"queries": len(point["overlap_bm25"]),
+			f"overlap_bm25@{limit}": float(np.mean(point["overlap_bm25"])) if point["overlap_bm25"] else None,
+			f"overlap_vector@{limit}": float(np.mean(point["overlap_vector"])) if point["overlap_vector"] else None,
+			f"overlap_previous@{limit}": float(np.mean(point["overlap_previous"])) if point["overlap_previous"] else None,
+			"rank_correlation_bm25": float(np.mean(correlations)) if correlations else None,
+		}
+		if point["latencies"]:
+			latencies = np.array(point["latencies"], dtype=np.float64)
+			for percentile, value in zip(BENCHMARK_PERCENTILES, np.percentile(latencies, BENCHMARK_PERCENTILES)):
+				row[f"p{percentile}_ms"] = float(value)
+			row["mean_ms"] = float(latencies.mean())
+		row["errors"] = point["errors"]
+		rows.append(row)
+	return pd.DataFrame(rows)
@@ -0,0 +1,67 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Percentiles reported by the benchmark
+BENCHMARK_PERCENTILES = [50, 90, 99]
+
+# Run a search function repeatedly and measure it.
+# search_fn takes no arguments and returns (success, message, df, time_taken in ms) like the utils/search functions.
+# warmup calls run first, one after the other, and are not counted (connection setup, caches).
+# iterations calls then run on concurrency threads. Returns (summary, samples) - see summarize_latencies.
+def benchmark_search(search_fn: Callable[[], Tuple[bool, str, pd.DataFrame, float]], iterations: int = 100, warmup: int = 10, concurrency: int = 1) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+	print(f"benchmark_search() called with iterations: {iterations}, warmup: {warmup}, concurrency: {concurrency}")
+	for _ in range(warmup):
+		search_fn()
+
+	def timed_run(run):
+		started = time.perf_counter()
+		try:
+			success, message, df, time_taken = search_fn()
+		except Exception as e:
+			success, message, df, time_taken = False, str(e), pd.DataFrame(), 0.0
+		round_trip = (time.perf_counter() - started) * 1000
+		return {
+			"run": run,
+			"success": success,
+			"latency_ms": time_taken if success else round_trip,
+			"round_trip_ms": round_trip,
+			"results": len(df) if success else 0,
+			"error": "" if success else message,
+		}
+
+	wall_started = time.perf_counter()
+	with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+		samples = list(executor.map(timed_run, range(1, iterations + 1)))
+	wall_seconds = time.perf_counter() - wall_started
+	return summarize_latencies(samples, wall_seconds, concurrency), samples
+
+# Latency percentiles (of successful runs), QPS over the wall time and error rate
+def summarize_latencies(samples: List[Dict[str, Any]], wall_seconds: float, concurrency: int = 1) -> Dict[str, Any]:
+	latencies = np.array([sample["latency_ms"] for sample in samples if sample["success"]], dtype=np.float64)
+	errors = sum(1 for sample in samples if not sample["success"])
+	summary = {
+		"runs": len(samples),
+		"errors": errors,
+		"error_rate": errors / len(samples) if samples else 0.0,
+		"concurrency": concurrency,
+		"wall_seconds": wall_seconds,
+		"qps": len(samples) / wall_seconds if wall_seconds > 0 else 0.0,
+	}
+	if latencies.size:
+		for percentile, value in zip(BENCHMARK_PERCENTILES, np.percentile(latencies, BENCHMARK_PERCENTILES)):
+			summary[f"p{percentile}_ms"] = float(value)
+		summary["mean_ms"] = float(latencies.mean())
+		summary["min_ms"] = float(latencies.min())
+		summary["max_ms"] = float(latencies.max())
+	return summary
+
+# Samples as CSV and summary plus samples as JSON, for the download buttons
+def benchmark_to_csv(samples: List[Dict[str, Any]]) -> str:
+	return pd.DataFrame(samples).to_csv(index=False)
+
+def benchmark_to_json(summary: Dict[str, Any], samples: List[Dict[str, Any]], parameters: Dict[str, Any]) -> str:
+	return json.dumps({"parameters": parameters, "summary": summary, "samples": samples}, indent=2, default=str)
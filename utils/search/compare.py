@@ -0,0 +1,120 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from weaviate import Client
+from utils.search.benchmark import BENCHMARK_PERCENTILES
+from utils.search.recall import get_vector_index_config
+from utils.search.runner import run_search
+from utils.search.vector import get_vector_dimensions
+
+# A/B comparison: the same queries run against two sides, each a (collection, named vector) pair, e.g. a copy of a
+# collection with RQ/PQ/BQ or other HNSW settings. Searches go through run_search, so a named vector uses
+# vector_search_with_multiple_vectors / hybrid_search_with_multiple_vectors. Results are matched by UUID.
+
+# Bytes per in-memory vector of each quantizer for d dimensions (PQ: one byte per segment, RQ: bits per dimension)
+QUANTIZER_BYTES = {
+	"none": lambda config, dims: 4 * dims,
+	"pq": lambda config, dims: getattr(config, "segments", None) or dims,
+	"bq": lambda config, dims: math.ceil(dims / 8),
+	"sq": lambda config, dims: dims,
+	"rq": lambda config, dims: math.ceil(dims * (getattr(config, "bits", None) or 8) / 8),
+}
+
+# Name of a quantizer config (_PQConfig -> "pq"), "none" without compression
+def quantizer_name(quantizer) -> str:
+	if quantizer is None:
+		return "none"
+	return type(quantizer).__name__.strip("_").replace("Config", "").lower()
+
+# Memory-relevant configuration of one side: index type and parameters, compression, dimensions, object count and an
+# estimate of the memory held by the in-memory vectors (the HNSW graph and rescoring data come on top)
+def memory_config(client: Client, collection_name: str, target_vector: Optional[str] = None) -> Dict[str, Any]:
+	print(f"memory_config() called for collection: {collection_name}, vector: {target_vector or 'default'}")
+	collection = client.collections.get(collection_name)
+	index_config = get_vector_index_config(collection.config.get(), target_vector)
+	quantizer = getattr(index_config, "quantizer", None)
+	dimensions = get_vector_dimensions(client, collection_name, target_vector)
+	objects = collection.aggregate.over_all(total_count=True).total_count or 0
+	name = quantizer_name(quantizer)
+	bytes_per_vector = QUANTIZER_BYTES[name](quantizer, dimensions) if dimensions and name in QUANTIZER_BYTES else None
+	config = {
+		"Index": type(index_config).__name__.replace("_VectorIndexConfig", "").lower() if index_config is not None else "",
+		"Distance": str(getattr(getattr(index_config, "distance_metric", None), "value", "")),
+		"Compression": name,
+		"Dimensions": dimensions,
+		"Objects": objects,
+		"Max Connections": getattr(index_config, "max_connections", None),
+		"ef": getattr(index_config, "ef", None),
+		"ef Construction": getattr(index_config, "ef_construction", None),
+		"Vector Cache Max Objects": getattr(index_config, "vector_cache_max_objects", None),
+		"Bytes per Vector": bytes_per_vector,
+		"Vector Memory Estimate (MB)": round(objects * bytes_per_vector / 1024 ** 2, 1) if bytes_per_vector else None,
+	}
+	for field in ("segments", "centroids", "bits", "rescore_limit", "cache"):
+		if hasattr(quantizer, field):
+			config[f"Compression {field}"] = getattr(quantizer, field)
+	return config
+
+# Overlap@k: share of the top-k of side A also in the top-k of side B
+def overlap_at_k(ids_a: List[str], ids_b: List[str], k: int) -> float:
+	top_a, top_b = ids_a[:k], ids_b[:k]
+	if not top_a and not top_b:
+		return 1.0
+	return len(set(top_a) & set(top_b)) / max(len(top_a), len(top_b))
+
+# Spearman rank correlation of two top-k lists over the union of their results; an object missing from one list gets
+# rank k + 1 there. 1.0 for identical rankings, None when there are fewer than two distinct objects.
+def rank_correlation(ids_a: List[str], ids_b: List[str], k: int) -> Optional[float]:
+	top_a, top_b = ids_a[:k], ids_b[:k]
+	union = list(dict.fromkeys(top_a + top_b))
+	if len(union) < 2:
+		return None
+	ranks_a = {uuid: rank for rank, uuid in enumerate(top_a, 1)}
+	ranks_b = {uuid: rank for rank, uuid in enumerate(top_b, 1)}
+	a = np.array([ranks_a.get(uuid, k + 1) for uuid in union], dtype=np.float64)
+	b = np.array([ranks_b.get(uuid, k + 1) for uuid in union], dtype=np.float64)
+	if a.std() == 0 or b.std() == 0:
+		return 1.0 if np.array_equal(a, b) else 0.0
+	return float(np.corrcoef(a, b)[0, 1])
+
+# Run each query on both sides (alternating which side goes first so neither always benefits from warm caches)
+# and compare the results. sides are two (collection, target_vector) pairs.
+# Returns (summary with one row per side plus overlap and correlation, samples with one row per query).
+def run_ab_comparison(client: Client, sides: List[Tuple[str, Optional[str]]], search_type: str, queries: Iterable[Any], alpha: float = 0.5, limit: int = 10) -> Tuple[Dict[str, Any], pd.DataFrame]:
+	print(f"run_ab_comparison() called for sides: {sides}, search_type: {search_type}")
+	samples = []
+	for index, query in enumerate(queries):
+		sample = {"query": index}
+		results = {}
+		order = ["A", "B"] if index % 2 == 0 else ["B", "A"]
+		for side in order:
+			collection_name, target_vector = sides[0] if side == "A" else sides[1]
+			success, message, df, time_taken = run_search(client, search_type, collection_name, query, target_vector, alpha, limit)
+			results[side] = list(df["UUID"]) if success and "UUID" in df else []
+			sample[f"{side} latency_ms"] = time_taken if success else None
+			sample[f"{side} hits"] = len(results[side])
+			sample[f"{side} error"] = "" if success else message
+		sample[f"overlap@{limit}"] = overlap_at_k(results["A"], results["B"], limit)
+		sample["rank_correlation"] = rank_correlation(results["A"], results["B"], limit)
+		samples.append(sample)
+	samples_df = pd.DataFrame(samples)
+	return summarize_comparison(samples_df, sides, limit), samples_df
+
+# Latency percentiles per side and mean overlap / rank correlation over the queries
+def summarize_comparison(samples_df: pd.DataFrame, sides: List[Tuple[str, Optional[str]]], limit: int) -> Dict[str, Any]:
+	summary = {"queries": len(samples_df), "sides": []}
+	if samples_df.empty:
+		return summary
+	for side, (collection_name, target_vector) in zip(["A", "B"], sides):
+		latencies = samples_df[f"{side} latency_ms"].dropna().to_numpy(dtype=np.float64)
+		row = {"Side": side, "Collection": collection_name, "Vector": target_vector or "default", "Errors": int((samples_df[f"{side} error"] != "").sum())}
+		if latencies.size:
+			for percentile, value in zip(BENCHMARK_PERCENTILES, np.percentile(latencies, BENCHMARK_PERCENTILES)):
+				row[f"p{percentile} (ms)"] = float(value)
+			row["Mean (ms)"] = float(latencies.mean())
+		summary["sides"].append(row)
+	summary[f"overlap@{limit}"] = float(samples_df[f"overlap@{limit}"].mean())
+	correlations = samples_df["rank_correlation"].dropna()
+	summary["rank_correlation"] = float(correlations.mean()) if not correlations.empty else None
+	return summary
@@ -0,0 +1,86 @@
+import math
+from typing import Any, Dict, Iterator, List, Optional
+import pandas as pd
+from weaviate import Client
+from utils.collections.update_collection_config import update_hnsw_vector_index
+from utils.search.recall import get_vector_index_config, measure_recall
+
+# ef sweep: apply a list of HNSW search settings one after the other, re-measure the same recall ground truth
+# (a fixed set of sampled queries) at each, then restore the original settings.
+# ef = -1 means dynamic ef: ef = min(max(dynamic_ef_factor * limit, dynamic_ef_min), dynamic_ef_max).
+EF_SWEEP_FIELDS = ["ef", "dynamic_ef_min", "dynamic_ef_max", "dynamic_ef_factor"]
+
+# Settings offered when the sweep starts
+DEFAULT_EF_SWEEP = [{"ef": ef} for ef in [16, 32, 64, 128, 256, 512]]
+
+# Queries run after each change and not measured (caches, settings propagation)
+EF_SWEEP_WARMUP = 5
+
+# Current values of the swept fields, to restore them at the end
+def get_ef_settings(collection_config, target_vector: Optional[str] = None) -> Dict[str, int]:
+	index_config = get_vector_index_config(collection_config, target_vector)
+	return {field: getattr(index_config, field) for field in EF_SWEEP_FIELDS if getattr(index_config, field, None) is not None}
+
+# One sweep setting from a row of the settings table: empty cells leave the field unchanged
+def setting_from_row(row: Dict[str, Any]) -> Dict[str, int]:
+	setting = {}
+	for field in EF_SWEEP_FIELDS:
+		value = row.get(field)
+		if value is None or (isinstance(value, float) and math.isnan(value)):
+			continue
+		setting[field] = int(value)
+	return setting
+
+def apply_ef_setting(client: Client, collection_name: str, target_vector: Optional[str], setting: Dict[str, int]):
+	update_hnsw_vector_index(
+		client,
+		collection_name,
+		setting.get("dynamic_ef_factor"),
+		setting.get("dynamic_ef_min"),
+		setting.get("dynamic_ef_max"),
+		None,
+		None,
+		None,
+		ef=setting.get("ef"),
+		target_vector=target_vector
+	)
+
+# Apply each setting, warm up and measure recall@k and latency of the ground truth queries (see utils/search/recall.build_ground_truth).
+# Yields {"completed", "total", "results", "done"} after each setting; the original settings are restored when the sweep
+# ends, fails or is interrupted (the generator is closed), and the last progress holds them under "original".
+def run_ef_sweep(client: Client, collection_name: str, target_vector: Optional[str], settings: List[Dict[str, int]], ground_truth: Dict[str, Any], warmup: int = EF_SWEEP_WARMUP) -> Iterator[Dict[str, Any]]:
+	print(f"run_ef_sweep() called for collection: {collection_name}, vector: {target_vector or 'default'}, settings: {len(settings)}")
+	collection = client.collections.get(collection_name)
+	original = get_ef_settings(collection.config.get(), target_vector)
+	results = []
+	try:
+		for setting in settings:
+			# Fields left empty take their original value, not the one of the previous setting
+			applied = dict(original, **setting)
+			result = {field: applied.get(field) for field in EF_SWEEP_FIELDS}
+			try:
+				apply_ef_setting(client, collection_name, target_vector, applied)
+				for query in ground_truth["queries"][:warmup]:
+					collection.query.near_vector(near_vector=query.tolist(), target_vector=target_vector, limit=ground_truth["k"], return_properties=[])
+				summary, _ = measure_recall(collection, ground_truth)
+				result.update(summary)
+				result["error"] = ""
+			except Exception as e:
+				print(f"Error measuring ef setting {setting}: {e}")
+				result["error"] = str(e)
+			results.append(result)
+			yield {"completed": len(results), "total": len(settings), "results": results, "done": False}
+	finally:
+		apply_ef_setting(client, collection_name, target_vector, original)
+	yield {"completed": len(results), "total": len(settings), "results": results, "done": True, "original": original}
+
+# The setting with the lowest p95 latency among those meeting the recall target and the p95 SLO (None if none does)
+def cheapest_setting(results: pd.DataFrame, recall_column: str, min_recall: float, max_p95_ms: Optional[float] = None) -> Optional[Dict[str, Any]]:
+	if results.empty or recall_column not in results or "p95_ms" not in results:
+		return None
+	meeting = results[results[recall_column] >= min_recall]
+	if max_p95_ms:
+		meeting = meeting[meeting["p95_ms"] <= max_p95_ms]
+	if meeting.empty:
+		return None
+	return meeting.sort_values("p95_ms").iloc[0].to_dict()
@@ -0,0 +1,103 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from weaviate import Client
+from weaviate.classes.query import MetadataQuery
+from utils.search.vector import parse_vector_input
+
+# Federated search: the same query runs concurrently against several (collection, tenant) targets with the same schema,
+# each target's scores are normalized and the results are merged into one global top-k.
+# min-max: scores scaled to [0, 1] per target, z-score: standardized per target,
+# rank: reciprocal rank fusion 1 / (FEDERATED_RRF_K + rank), none: raw scores (only comparable for identical corpora statistics)
+FEDERATED_NORMALIZATIONS = ["min-max", "z-score", "rank", "none"]
+
+# Rank offset of reciprocal rank fusion
+FEDERATED_RRF_K = 60
+
+# Targets queried at the same time
+FEDERATED_MAX_WORKERS = 16
+
+# Search one target (query is a vector for Vector search) and return its rows with a raw score where higher is better (score for hybrid/BM25, -distance for vector search)
+def search_target(client: Client, search_type: str, collection_name: str, tenant_name: Optional[str], query, target_vector: Optional[str], alpha: float, limit: int) -> Tuple[List[Dict[str, Any]], float]:
+	collection = client.collections.get(collection_name)
+	if tenant_name:
+		collection = collection.with_tenant(tenant_name)
+	start_time = time.perf_counter()
+	if search_type == "Hybrid":
+		response = collection.query.hybrid(query=query, alpha=alpha, target_vector=target_vector, limit=limit, return_metadata=MetadataQuery(score=True))
+	elif search_type == "Keyword":
+		response = collection.query.bm25(query=query, limit=limit, return_metadata=MetadataQuery(score=True))
+	elif search_type == "Vector":
+		response = collection.query.near_vector(near_vector=query, target_vector=target_vector, limit=limit, return_metadata=MetadataQuery(distance=True))
+	else:
+		raise ValueError(f"Unsupported search type: {search_type}")
+	time_taken = (time.perf_counter() - start_time) * 1000
+
+	rows = []
+	for rank, obj in enumerate(response.objects, 1):
+		raw_score = -obj.metadata.distance if search_type == "Vector" else obj.metadata.score
+		row = {"Collection": collection_name, "Tenant": tenant_name or "", "Rank": rank, "Raw Score": raw_score, "uuid": str(obj.uuid)}
+		for key, value in obj.properties.items():
+			row[key] = json.dumps(value, indent=2) if isinstance(value, (dict, list)) else value
+		rows.append(row)
+	return rows, time_taken
+
+# Normalized scores of one target's results (ordered best first)
+def normalize_scores(raw_scores: np.ndarray, ranks: np.ndarray, normalization: str) -> np.ndarray:
+	if normalization == "min-max":
+		spread = raw_scores.max() - raw_scores.min()
+		return (raw_scores - raw_scores.min()) / spread if spread > 0 else np.ones_like(raw_scores)
+	if normalization == "z-score":
+		std = raw_scores.std()
+		return (raw_scores - raw_scores.mean()) / std if std > 0 else np.zeros_like(raw_scores)
+	if normalization == "rank":
+		return 1.0 / (FEDERATED_RRF_K + ranks)
+	if normalization == "none":
+		return raw_scores
+	raise ValueError(f"Unsupported normalization: {normalization}")
+
+# Run the query against every (collection, tenant) target concurrently, normalize each target's scores and keep the global top-k.
+# Returns (success, message, df of the merged top-k, targets_df with hits, latency and error per target, wall time in ms).
+def federated_search(client: Client, search_type: str, targets: List[Tuple[str, Optional[str]]], query, target_vector: Optional[str] = None, alpha: float = 0.5, limit: int = 3, normalization: str = "min-max") -> Tuple[bool, str, pd.DataFrame, pd.DataFrame, float]:
+	print(f"federated_search() called for {len(targets)} targets, normalization: {normalization}")
+	if not targets:
+		return False, "Select at least one collection", pd.DataFrame(), pd.DataFrame(), 0.0
+	if search_type == "Vector" and isinstance(query, str):
+		try:
+			query = parse_vector_input(query)
+		except ValueError as e:
+			return False, str(e), pd.DataFrame(), pd.DataFrame(), 0.0
+	frames = []
+	target_summary = []
+	start_time = time.perf_counter()
+	with ThreadPoolExecutor(max_workers=max(1, min(len(targets), FEDERATED_MAX_WORKERS))) as executor:
+		futures = {
+			executor.submit(search_target, client, search_type, collection_name, tenant_name, query, target_vector, alpha, limit): (collection_name, tenant_name)
+			for collection_name, tenant_name in targets
+		}
+		for future in as_completed(futures):
+			collection_name, tenant_name = futures[future]
+			try:
+				rows, time_taken = future.result()
+				if rows:
+					frame = pd.DataFrame(rows)
+					frame.insert(0, "Score", normalize_scores(frame["Raw Score"].to_numpy(dtype=np.float64), frame["Rank"].to_numpy(dtype=np.float64), normalization))
+					frames.append(frame)
+				target_summary.append({"Collection": collection_name, "Tenant": tenant_name or "", "Hits": len(rows), "Latency (ms)": round(time_taken, 2), "Error": ""})
+			except Exception as e:
+				print(f"Error searching collection '{collection_name}' tenant '{tenant_name}': {e}")
+				target_summary.append({"Collection": collection_name, "Tenant": tenant_name or "", "Hits": 0, "Latency (ms)": None, "Error": str(e)})
+	wall_time = (time.perf_counter() - start_time) * 1000
+
+	targets_df = pd.DataFrame(target_summary).sort_values("Latency (ms)", ascending=False, na_position="last").reset_index(drop=True)
+	failed = int((targets_df["Error"] != "").sum())
+	if failed == len(targets):
+		return False, f"All {len(targets)} targets failed: {targets_df['Error'].iloc[0]}", pd.DataFrame(), targets_df, wall_time
+	df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+	if not df.empty:
+		df = df.sort_values("Score", ascending=False, kind="stable").head(limit).reset_index(drop=True)
+	message = f"Found {len(df)} results across {len(targets) - failed} of {len(targets)} targets"
+	return True, message, df, targets_df, wall_time
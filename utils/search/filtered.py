@@ -0,0 +1,101 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from weaviate import Client
+from utils.collections.filters import build_filters
+from utils.collections.update_collection_config import update_hnsw_vector_index
+from utils.search.benchmark import benchmark_search
+from utils.search.recall import get_vector_index_config
+from utils.search.runner import run_search
+from utils.search.vector import parse_vector_input
+
+# Filtered search lab: the same filtered vector/hybrid query is benchmarked under each HNSW filter strategy and
+# flat_search_cutoff, then the original settings are restored. With fewer matching objects than flat_search_cutoff
+# Weaviate skips the HNSW graph and brute-forces the matches, so the selectivity decides which path a query takes.
+FILTER_STRATEGIES = ["SWEEPING", "ACORN"]
+
+# Search types that go through the vector index
+FILTERED_SEARCH_TYPES = ["Vector", "Hybrid"]
+
+# Matching objects, total objects and selectivity (matching / total) of a filter, from aggregate counts
+def estimate_selectivity(client: Client, collection_name: str, filter_conditions: Optional[tuple]) -> Dict[str, Any]:
+	print(f"estimate_selectivity() called for collection: {collection_name}")
+	collection = client.collections.get(collection_name)
+	total = collection.aggregate.over_all(total_count=True).total_count or 0
+	matching = total
+	if filter_conditions:
+		matching = collection.aggregate.over_all(total_count=True, filters=build_filters(filter_conditions)).total_count or 0
+	return {"matching": matching, "total": total, "selectivity": matching / total if total else 0.0}
+
+# Current filter settings of the (named) vector index, to restore them at the end
+def get_filter_settings(collection_config, target_vector: Optional[str] = None) -> Dict[str, Any]:
+	index_config = get_vector_index_config(collection_config, target_vector)
+	filter_strategy = getattr(index_config, "filter_strategy", None)
+	return {
+		"filter_strategy": getattr(filter_strategy, "name", filter_strategy),
+		"flat_search_cutoff": getattr(index_config, "flat_search_cutoff", None),
+	}
+
+def apply_filter_setting(client: Client, collection_name: str, target_vector: Optional[str], filter_strategy: Optional[str], flat_search_cutoff: Optional[int]):
+	update_hnsw_vector_index(client, collection_name, None, None, None, filter_strategy, flat_search_cutoff, None, target_vector=target_vector)
+
+# UUIDs returned by the filtered query, to compare result sets between settings
+def filtered_result_ids(client: Client, search_type: str, collection_name: str, query, target_vector: Optional[str], alpha: float, limit: int, filter_conditions: Optional[tuple]) -> List[str]:
+	collection = client.collections.get(collection_name)
+	filters = build_filters(filter_conditions)
+	if search_type == "Vector":
+		vector = parse_vector_input(query) if isinstance(query, str) else query
+		response = collection.query.near_vector(near_vector=vector, target_vector=target_vector, limit=limit, filters=filters, return_properties=[])
+	else:
+		response = collection.query.hybrid(query=query, alpha=alpha, target_vector=target_vector, limit=limit, filters=filters, return_properties=[])
+	return [str(obj.uuid) for obj in response.objects]
+
+# Benchmark the filtered query under every (filter strategy, flat_search_cutoff) combination.
+# Result sets are compared with the first combination (overlap = shared results / results of the first).
+# Yields {"completed", "total", "results", "done"} after each combination; the original settings are restored when the
+# lab ends, fails or is interrupted, and the last progress holds them under "original".
+def run_filter_lab(client: Client, collection_name: str, search_type: str, query, target_vector: Optional[str], alpha: float, limit: int, filter_conditions: Optional[tuple], strategies: List[str], cutoffs: List[int], iterations: int = 50, warmup: int = 5, concurrency: int = 1) -> Iterator[Dict[str, Any]]:
+	print(f"run_filter_lab() called for collection: {collection_name}, strategies: {strategies}, cutoffs: {cutoffs}")
+	collection = client.collections.get(collection_name)
+	original = get_filter_settings(collection.config.get(), target_vector)
+	selectivity = estimate_selectivity(client, collection_name, filter_conditions)
+	combinations = [(strategy, cutoff) for strategy in strategies for cutoff in cutoffs]
+	results = []
+	baseline_ids = None
+	try:
+		for strategy, cutoff in combinations:
+			result = {"filter_strategy": strategy, "flat_search_cutoff": cutoff, "flat_search": selectivity["matching"] < cutoff}
+			try:
+				apply_filter_setting(client, collection_name, target_vector, strategy, cutoff)
+				summary, _ = benchmark_search(
+					lambda: run_search(client, search_type, collection_name, query, target_vector, alpha, limit, filter_conditions=filter_conditions),
+					iterations=iterations,
+					warmup=warmup,
+					concurrency=concurrency
+				)
+				result.update({key: value for key, value in summary.items() if key.endswith("_ms") or key in ("qps", "error_rate")})
+				ids = filtered_result_ids(client, search_type, collection_name, query, target_vector, alpha, limit, filter_conditions)
+				if baseline_ids is None:
+					baseline_ids = ids
+				result["hits"] = len(ids)
+				result["overlap_with_first"] = len(set(ids) & set(baseline_ids)) / len(baseline_ids) if baseline_ids else 1.0
+				result["error"] = ""
+			except Exception as e:
+				print(f"Error benchmarking {strategy} / {cutoff}: {e}")
+				result["error"] = str(e)
+			results.append(result)
+			yield {"completed": len(results), "total": len(combinations), "results": results, "selectivity": selectivity, "done": False}
+	finally:
+		apply_filter_setting(client, collection_name, target_vector, original["filter_strategy"], original["flat_search_cutoff"])
+	yield {"completed": len(results), "total": len(combinations), "results": results, "selectivity": selectivity, "done": True, "original": original}
+
+# Parse the comma-separated flat_search_cutoff values typed on the page
+def parse_cutoffs(text: str) -> List[int]:
+	return [int(value) for value in str(text).replace(" ", "").split(",") if value]
+
+# Results of the lab as a DataFrame, plus the combination with the lowest p50 (None when nothing was measured)
+def filter_lab_frame(results: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+	df = pd.DataFrame(results)
+	if df.empty or "p50_ms" not in df:
+		return df, None
+	measured = df[df["error"] == ""].sort_values("p50_ms")
+	return df, measured.iloc[0].to_dict() if not measured.empty else None
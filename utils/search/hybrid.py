@@ -2,26 +2,33 @@ import time
 import re
 import json
 import pandas as pd
-from typing import Tuple
+from typing import Optional, Tuple
 from weaviate import Client
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.query import MetadataQuery, HybridFusion
+from utils.search.spans import search_spans
+from utils.collections.filters import build_filters
+
+# Original (pre-fusion) score in explain_score, compiled once instead of per result
+ORIGINAL_SCORE_PATTERN = re.compile(r'original score ([\d.]+)')
 
 # Hybrid search function
 # This function performs a hybrid search on a specified collection in Weaviate.
-def hybrid_search(client: Client, collection: str, query: str, alpha: float = 0.5, limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
+def hybrid_search(client: Client, collection: str, query: str, alpha: float = 0.5, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None, fusion_type: Optional[str] = None) -> Tuple[bool, str, pd.DataFrame, float]:
 	print("hybrid_search() called")
 	try:
 		# Get collection
 		coll = client.collections.get(collection)
 
-		# Measure performance
-		start_time = time.time() * 1000 # Convert to milliseconds
+		# Measure performance (monotonic, high-resolution clock)
+		start_time = time.perf_counter()
 
 		# Perform search
 		response = coll.query.hybrid(
 			query=query,
 			alpha=alpha,
+			fusion_type=getattr(HybridFusion, fusion_type) if fusion_type else None,
 			limit=limit,
+			filters=build_filters(filter_conditions),
 			return_metadata=MetadataQuery(
 				creation_time=True,
 				last_update_time=True,
@@ -29,20 +36,22 @@ def hybrid_search(client: Client, collection: str, query: str, alpha: float = 0.
 				certainty=True,
 				score=True,
 				explain_score=True,
-				is_consistent=True
+				is_consistent=True,
+				query_profile=query_profile
 			)
 		)
 
-		# Calculate time taken
-		end_time = time.time() * 1000
-		time_taken = end_time - start_time
+		# Calculate time taken in milliseconds
+		time_taken = (time.perf_counter() - start_time) * 1000
+		build_start = time.perf_counter()
 
 		# Process results into a list of dictionaries
 		results = []
 		for obj in response.objects:
 			result_dict = {
+				"UUID": str(obj.uuid),
 				"Score": f"{obj.metadata.score:.6f}",
-				"Original Score": f"{float(re.search(r'original score ([\d.]+)', obj.metadata.explain_score).group(1)):.6f}",
+				"Original Score": f"{float(ORIGINAL_SCORE_PATTERN.search(obj.metadata.explain_score).group(1)):.6f}",
 				"Explain Score": obj.metadata.explain_score,
 				"Distance": obj.metadata.distance if hasattr(obj.metadata, 'distance') else 'N/A',
 				"Certainty": obj.metadata.certainty if hasattr(obj.metadata, 'certainty') else 'N/A',
@@ -62,26 +71,30 @@ def hybrid_search(client: Client, collection: str, query: str, alpha: float = 0.
 
 		# Convert to DataFrame
 		df = pd.DataFrame(results)
+		# Latency breakdown: the query call, server time (when profiled) and building the DataFrame
+		df.attrs["spans"] = search_spans(time_taken, (time.perf_counter() - build_start) * 1000, response.query_profile)
 		return True, f"Found {len(results)} results", df, time_taken
 
 	except Exception as e:
 		return False, f"Error performing hybrid search: {str(e)}", pd.DataFrame(), 0.0
 
-def hybrid_search_with_multiple_vectors(client: Client, collection: str, targetvector: str, query: str, alpha: float = 0.5, limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
+def hybrid_search_with_multiple_vectors(client: Client, collection: str, targetvector: str, query: str, alpha: float = 0.5, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None, fusion_type: Optional[str] = None) -> Tuple[bool, str, pd.DataFrame, float]:
 	print("hybrid_search_with_multiple_vectors() called")
 	try:
 		# Get collection
 		coll = client.collections.get(collection)
 
-		# Measure performance
-		start_time = time.time() * 1000 # Convert to milliseconds
+		# Measure performance (monotonic, high-resolution clock)
+		start_time = time.perf_counter()
 
 		# Perform search
 		response = coll.query.hybrid(
 			query=query,
 			target_vector=targetvector,
 			alpha=alpha,
+			fusion_type=getattr(HybridFusion, fusion_type) if fusion_type else None,
 			limit=limit,
+			filters=build_filters(filter_conditions),
 			return_metadata=MetadataQuery(
 				creation_time=True,
 				last_update_time=True,
@@ -89,20 +102,22 @@ def hybrid_search_with_multiple_vectors(client: Client, collection: str, targetv
 				certainty=True,
 				score=True,
 				explain_score=True,
-				is_consistent=True
+				is_consistent=True,
+				query_profile=query_profile
 			)
 		)
 
-		# Calculate time taken
-		end_time = time.time() * 1000
-		time_taken = end_time - start_time
+		# Calculate time taken in milliseconds
+		time_taken = (time.perf_counter() - start_time) * 1000
+		build_start = time.perf_counter()
 
 		# Process results into a list of dictionaries
 		results = []
 		for obj in response.objects:
 			result_dict = {
+				"UUID": str(obj.uuid),
 				"Score": f"{obj.metadata.score:.6f}",
-				"Original Score": f"{float(re.search(r'original score ([\d.]+)', obj.metadata.explain_score).group(1)):.6f}",
+				"Original Score": f"{float(ORIGINAL_SCORE_PATTERN.search(obj.metadata.explain_score).group(1)):.6f}",
 				"Explain Score": obj.metadata.explain_score,
 				"Distance": obj.metadata.distance if hasattr(obj.metadata, 'distance') else 'N/A',
 				"Certainty": obj.metadata.certainty if hasattr(obj.metadata, 'certainty') else 'N/A',
@@ -122,6 +137,8 @@ def hybrid_search_with_multiple_vectors(client: Client, collection: str, targetv
 
 		# Convert to DataFrame
 		df = pd.DataFrame(results)
+		# Latency breakdown: the query call, server time (when profiled) and building the DataFrame
+		df.attrs["spans"] = search_spans(time_taken, (time.perf_counter() - build_start) * 1000, response.query_profile)
 		return True, f"Found {len(results)} results", df, time_taken
 
 	except Exception as e:
@@ -1,41 +1,46 @@
 import time
 import json
 import pandas as pd
-from typing import Tuple
+from typing import Optional, Tuple
 from weaviate import Client
 from weaviate.classes.query import MetadataQuery
+from utils.search.spans import search_spans
+from utils.collections.filters import build_filters
 
 # Keyword search function
 # This function performs a keyword search on a specified collection in Weaviate.
-def keyword_search(client: Client, collection: str, query: str, limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
+def keyword_search(client: Client, collection: str, query: str, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None) -> Tuple[bool, str, pd.DataFrame, float]:
 	try:
 		# Get collection
 		coll = client.collections.get(collection)
 
-		# Measure performance
-		start_time = time.time() * 1000 # Convert to milliseconds
+		# Measure performance (monotonic, high-resolution clock)
+		start_time = time.perf_counter()
 
 		# Perform search
 		response = coll.query.bm25(
 			query=query,
 			limit=limit,
+			filters=build_filters(filter_conditions),
 			return_metadata=MetadataQuery(
 				creation_time=True,
 				last_update_time=True,
 				score=True,
 				explain_score=True,
-				is_consistent=True
+				is_consistent=True,
+				query_profile=query_profile
 			)
 		)
 
-		# Calculate time taken
-		end_time = time.time() * 1000
-		time_taken = end_time - start_time
+		# Calculate time taken in milliseconds
+		time_taken = (time.perf_counter() - start_time) * 1000
+		build_start = time.perf_counter()
 
 		# Process results into a list of dictionaries
 		results = []
 		for obj in response.objects:
 			result_dict = {
+				"UUID": str(obj.uuid),
 				"Score": f"{obj.metadata.score:.6f}",
 				"Explain Score": obj.metadata.explain_score,
 				"Is Consistent": obj.metadata.is_consistent if hasattr(obj.metadata, 'is_consistent') else 'N/A',
@@ -54,6 +59,8 @@ def keyword_search(client: Client, collection: str, query: str, limit: int = 3)
 
 		# Convert to DataFrame
 		df = pd.DataFrame(results)
+		# Latency breakdown: the query call, server time (when profiled) and building the DataFrame
+		df.attrs["spans"] = search_spans(time_taken, (time.perf_counter() - build_start) * 1000, response.query_profile)
 		return True, f"Found {len(results)} results", df, time_taken
 
 	except Exception as e:
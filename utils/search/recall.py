@@ -0,0 +1,194 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from weaviate import Client
+from weaviate.classes.query import MetadataQuery
+
+# Recall evaluation: sample objects with vectors, compute their exact top-k neighbours locally over every object with that
+# vector and compare them with what near_vector returns. Each sampled object is used as a query and excluded from its own results.
+# near_vector searches the whole collection, so the ground truth must cover all of it: exact neighbours of a subset would
+# count correct results outside the subset as misses. An ID filter cannot restrict the search instead, because a filtered
+# query takes the filtered (or flat) search path and would not measure the unfiltered index.
+
+# Distance metrics that can be computed exactly (same definitions as Weaviate)
+RECALL_DISTANCE_METRICS = ["cosine", "dot", "l2-squared"]
+
+# Percentiles of the near_vector latency in the report
+RECALL_LATENCY_PERCENTILES = [50, 95]
+
+# Default number of objects fetched as ground truth candidates
+DEFAULT_CANDIDATE_LIMIT = 10000
+
+# Upper bound of the (queries x candidates) distance block computed at once
+DISTANCE_BLOCK_ELEMENTS = 1 << 24
+
+# Vector index config of a collection (or of one of its named vectors)
+def get_vector_index_config(collection_config, target_vector: Optional[str] = None):
+	if target_vector and collection_config.vector_config:
+		return collection_config.vector_config[target_vector].vector_index_config
+	return collection_config.vector_index_config
+
+# Distance metric of the vector index of a collection (or of one of its named vectors)
+def get_distance_metric(collection_config, target_vector: Optional[str] = None) -> str:
+	metric = getattr(get_vector_index_config(collection_config, target_vector), "distance_metric", None)
+	return str(getattr(metric, "value", metric) or "cosine")
+
+# Fetch up to candidate_limit objects with their vector for target_vector (None for the default vector).
+# Returns (uuids, float32 matrix with one row per object, complete: every object with that vector was fetched).
+# Objects without that vector are skipped.
+def fetch_candidates(collection, target_vector: Optional[str], candidate_limit: int) -> Tuple[List[str], np.ndarray, bool]:
+	print(f"fetch_candidates() called for vector: {target_vector or 'default'}, limit: {candidate_limit}")
+	uuids, vectors = [], []
+	complete = True
+	for obj in collection.iterator(include_vector=[target_vector] if target_vector else True):
+		vector = (obj.vector or {}).get(target_vector or "default")
+		if vector is None:
+			continue
+		if len(uuids) >= candidate_limit:
+			complete = False
+			break
+		uuids.append(str(obj.uuid))
+		vectors.append(vector)
+	if not vectors:
+		return uuids, np.empty((0, 0), dtype=np.float32), complete
+	return uuids, np.asarray(vectors, dtype=np.float32), complete
+
+# Distances between every query and every candidate as a (queries x candidates) matrix, from one matrix product.
+# candidate_norms are the squared norms (l2-squared) of the candidates; for cosine the candidates must already be normalized.
+def pairwise_distances(queries: np.ndarray, candidates: np.ndarray, metric: str, candidate_norms: np.ndarray = None) -> np.ndarray:
+	if metric == "cosine":
+		norms = np.linalg.norm(queries, axis=1, keepdims=True)
+		return 1.0 - (queries / np.where(norms == 0, 1.0, norms)) @ candidates.T
+	if metric == "dot":
+		return -(queries @ candidates.T)
+	if metric == "l2-squared":
+		distances = (queries * queries).sum(axis=1)[:, None] - 2.0 * (queries @ candidates.T) + candidate_norms[None, :]
+		return np.maximum(distances, 0.0)
+	raise ValueError(f"Distance metric '{metric}' is not supported, use one of: {', '.join(RECALL_DISTANCE_METRICS)}")
+
+# Exact top-k candidates of every query: (indices, distances), both (queries x k) and sorted by distance.
+# Queries are processed in blocks so the distance matrix stays bounded. exclude holds, per query, a candidate index to leave out (the query itself).
+def exact_neighbors(queries: np.ndarray, candidates: np.ndarray, k: int, metric: str, exclude: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+	candidate_norms = None
+	if metric == "cosine":
+		norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+		candidates = candidates / np.where(norms == 0, 1.0, norms)
+	elif metric == "l2-squared":
+		candidate_norms = (candidates * candidates).sum(axis=1)
+	k = min(k, len(candidates) - (1 if exclude is not None else 0))
+	block_size = max(1, DISTANCE_BLOCK_ELEMENTS // max(len(candidates), 1))
+	indices = np.empty((len(queries), k), dtype=np.int64)
+	distances = np.empty((len(queries), k), dtype=np.float32)
+	for start in range(0, len(queries), block_size):
+		block = pairwise_distances(queries[start:start + block_size], candidates, metric, candidate_norms)
+		rows = np.arange(len(block))
+		if exclude is not None:
+			block[rows, exclude[start:start + block_size]] = np.inf
+		top = np.argpartition(block, k - 1, axis=1)[:, :k]
+		order = np.argsort(block[rows[:, None], top], axis=1)
+		indices[start:start + len(block)] = top[rows[:, None], order]
+		distances[start:start + len(block)] = block[rows[:, None], indices[start:start + len(block)]]
+	return indices, distances
+
+# Sample num_queries candidates as queries and compute their exact neighbours: everything measure_recall needs,
+# computed once so the same ground truth can be re-measured after the index configuration changes.
+# Raises ValueError when candidate_limit does not cover every object with the vector (recall would be biased low).
+def build_ground_truth(collection, target_vector: Optional[str], metric: str, k: int, num_queries: int, candidate_limit: int = DEFAULT_CANDIDATE_LIMIT, seed: int = 42) -> Dict[str, Any]:
+	print(f"build_ground_truth() called for vector: {target_vector or 'default'}, k: {k}, queries: {num_queries}")
+	uuids, candidates, complete = fetch_candidates(collection, target_vector, candidate_limit)
+	if not complete:
+		total_objects = collection.aggregate.over_all(total_count=True).total_count
+		raise ValueError(f"More than {candidate_limit:,} objects have a '{target_vector or 'default'}' vector ({total_objects:,} objects in the collection): exact neighbours of a subset would make recall look lower than it is. Raise the ground truth objects to cover the whole collection.")
+	if len(uuids) < 2:
+		raise ValueError(f"Need at least 2 objects with a '{target_vector or 'default'}' vector, found {len(uuids)}")
+	rng = np.random.default_rng(seed)
+	sample = rng.choice(len(uuids), size=min(num_queries, len(uuids)), replace=False)
+	indices, distances = exact_neighbors(candidates[sample], candidates, k, metric, exclude=sample)
+	total_objects = collection.aggregate.over_all(total_count=True).total_count
+	return {
+		"vector": target_vector or "default",
+		"target_vector": target_vector,
+		"metric": metric,
+		"k": indices.shape[1],
+		"candidates": len(uuids),
+		"total_objects": total_objects,
+		"query_uuids": [uuids[i] for i in sample],
+		"queries": candidates[sample],
+		"neighbors": [[uuids[i] for i in row] for row in indices],
+		"distances": distances,
+	}
+
+# Run near_vector for every ground truth query and compare with the exact neighbours.
+# Returns (summary, samples): recall@k, latency percentiles and the error between the distances returned by the server
+# and the exact distances at the same rank (non-zero when the index or compression returns approximate distances).
+def measure_recall(collection, ground_truth: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+	print(f"measure_recall() called for vector: {ground_truth['vector']}")
+	k = ground_truth["k"]
+	samples = []
+	for query_uuid, query, neighbors, exact_distances in zip(ground_truth["query_uuids"], ground_truth["queries"], ground_truth["neighbors"], ground_truth["distances"]):
+		sample = {"vector": ground_truth["vector"], "query_uuid": query_uuid}
+		try:
+			started = time.perf_counter()
+			response = collection.query.near_vector(
+				near_vector=query.tolist(),
+				target_vector=ground_truth["target_vector"],
+				limit=k + 1,
+				return_metadata=MetadataQuery(distance=True),
+				return_properties=[]
+			)
+			sample["latency_ms"] = (time.perf_counter() - started) * 1000
+			results = [obj for obj in response.objects if str(obj.uuid) != query_uuid][:k]
+			found = {str(obj.uuid) for obj in results}
+			server_distances = np.array([obj.metadata.distance for obj in results], dtype=np.float32)
+			sample["recall"] = len(found.intersection(neighbors)) / k
+			sample["distance_error"] = float(np.abs(server_distances - exact_distances[:len(results)]).mean()) if len(results) else None
+			sample["error"] = ""
+		except Exception as e:
+			sample.update({"latency_ms": None, "recall": None, "distance_error": None, "error": str(e)})
+		samples.append(sample)
+	return summarize_recall(ground_truth, samples), samples
+
+# Aggregate the per-query samples of one vector
+def summarize_recall(ground_truth: Dict[str, Any], samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+	measured = [sample for sample in samples if not sample["error"]]
+	summary = {
+		"vector": ground_truth["vector"],
+		"metric": ground_truth["metric"],
+		"k": ground_truth["k"],
+		"queries": len(samples),
+		"errors": len(samples) - len(measured),
+		"candidates": ground_truth["candidates"],
+		"total_objects": ground_truth["total_objects"],
+	}
+	if measured:
+		recalls = np.array([sample["recall"] for sample in measured])
+		latencies = np.array([sample["latency_ms"] for sample in measured])
+		distance_errors = np.array([sample["distance_error"] for sample in measured if sample["distance_error"] is not None])
+		summary[f"recall@{ground_truth['k']}"] = float(recalls.mean())
+		summary["min_recall"] = float(recalls.min())
+		for percentile, value in zip(RECALL_LATENCY_PERCENTILES, np.percentile(latencies, RECALL_LATENCY_PERCENTILES)):
+			summary[f"p{percentile}_ms"] = float(value)
+		summary["mean_distance_error"] = float(distance_errors.mean()) if distance_errors.size else None
+		summary["max_distance_error"] = float(distance_errors.max()) if distance_errors.size else None
+	return summary
+
+# Evaluate recall@k of each of target_vectors ([None] for a collection without named vectors).
+# Returns (success, message, summary_df with one row per vector, samples_df with one row per query).
+def evaluate_recall(client: Client, collection_name: str, target_vectors: List[Optional[str]], k: int = 10, num_queries: int = 100, candidate_limit: int = DEFAULT_CANDIDATE_LIMIT, seed: int = 42) -> Tuple[bool, str, pd.DataFrame, pd.DataFrame]:
+	print(f"evaluate_recall() called for collection: {collection_name}, vectors: {target_vectors}")
+	try:
+		collection = client.collections.get(collection_name)
+		collection_config = collection.config.get()
+		summaries, all_samples = [], []
+		for target_vector in target_vectors:
+			metric = get_distance_metric(collection_config, target_vector)
+			ground_truth = build_ground_truth(collection, target_vector, metric, k, num_queries, candidate_limit, seed)
+			summary, samples = measure_recall(collection, ground_truth)
+			summaries.append(summary)
+			all_samples.extend(samples)
+		message = f"Evaluated recall@{k} of {len(summaries)} vector(s) in '{collection_name}'"
+		return True, message, pd.DataFrame(summaries), pd.DataFrame(all_samples)
+	except Exception as e:
+		print(f"Error in evaluate_recall: {e}")
+		return False, f"Error evaluating recall: {e}", pd.DataFrame(), pd.DataFrame()
@@ -0,0 +1,44 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from weaviate import Client
+from utils.cache.cluster_cache import cluster_cache
+from utils.search.runner import run_search
+
+# Search results are cached per (cluster, collection, search type, target vector, query, alpha, limit, filters) in the process-wide
+# cluster cache, so rerunning the same query while only the display changes does not go back to the cluster.
+# Entries are dropped by invalidate() when the collection is written through the app, and after SEARCH_CACHE_TTL seconds.
+SEARCH_CACHE_TTL = 600
+
+# Search results kept at most, least recently used go first
+SEARCH_CACHE_MAX_ENTRIES = 128
+
+# Only successful searches are cached (results with an "error" key are not)
+@cluster_cache("search_results", ttl=SEARCH_CACHE_TTL, collection_arg="collection", max_entries=SEARCH_CACHE_MAX_ENTRIES)
+def cached_search(client: Client, search_type: str, collection: str, query, target_vector: Optional[str] = None, alpha: float = 0.5, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None) -> Dict[str, Any]:
+	print(f"cached_search() called for collection: {collection}, search_type: {search_type}")
+	success, message, df, time_taken = run_search(client, search_type, collection, query, target_vector, alpha, limit, query_profile, filter_conditions)
+	result = {"message": message, "df": df, "time_taken": time_taken, "searched_at": time.time()}
+	if not success:
+		result["error"] = message
+	return result
+
+# Vector queries are cached as float32 arrays, so the same vector given as a list or an array shares one entry
+def normalize_query(query):
+	if isinstance(query, (np.ndarray, list, tuple)):
+		return np.asarray(query, dtype=np.float32)
+	return query
+
+# Run a search through the cache. Returns (success, message, df, time_taken in ms, cache_info) where cache_info holds
+# "cached" (served from the cache), "searched_at" (wall-clock time of the original search) and "age" in seconds.
+# time_taken is the latency of the original search.
+def run_cached_search(client: Client, search_type: str, collection: str, query, target_vector: Optional[str] = None, alpha: float = 0.5, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None) -> Tuple[bool, str, pd.DataFrame, float, Dict[str, Any]]:
+	started = time.time()
+	result = cached_search(client, search_type, collection, normalize_query(query), target_vector, alpha if search_type == "Hybrid" else 0.5, limit, query_profile, filter_conditions)
+	cache_info = {
+		"cached": result["searched_at"] < started,
+		"searched_at": result["searched_at"],
+		"age": max(time.time() - result["searched_at"], 0.0),
+	}
+	return "error" not in result, result["message"], result["df"], result["time_taken"], cache_info
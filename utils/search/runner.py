@@ -0,0 +1,32 @@
+from typing import Optional, Tuple
+import pandas as pd
+from weaviate import Client
+from utils.search.hybrid import hybrid_search, hybrid_search_with_multiple_vectors
+from utils.search.vector import vector_search, vector_search_with_multiple_vectors, parse_vector_input
+from utils.search.keyword import keyword_search
+
+# Search types offered on the Search page
+SEARCH_TYPES = ["Hybrid", "Keyword", "Vector"]
+
+# Run one search of the given type through the utils/search functions, picking the named-vector variant when a target vector is set.
+# query is the text for Hybrid/Keyword and a vector (list or comma-separated string) for Vector.
+# query_profile asks the server for its execution profile, which gives the server span of df.attrs["spans"] (see utils/search/spans).
+# filter_conditions are (property, operator, value) tuples, see utils/collections/filters.build_filters.
+# fusion_type (RANKED or RELATIVE_SCORE) applies to Hybrid, None uses the server default.
+# Returns (success, message, df, time_taken in ms) like the search functions themselves.
+def run_search(client: Client, search_type: str, collection: str, query, target_vector: Optional[str] = None, alpha: float = 0.5, limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None, fusion_type: Optional[str] = None) -> Tuple[bool, str, pd.DataFrame, float]:
+	if search_type == "Hybrid":
+		if target_vector:
+			return hybrid_search_with_multiple_vectors(client, collection, target_vector, query, alpha, limit, query_profile, filter_conditions, fusion_type)
+		return hybrid_search(client, collection, query, alpha, limit, query_profile, filter_conditions, fusion_type)
+	if search_type == "Vector":
+		try:
+			vector_list = parse_vector_input(query) if isinstance(query, str) else query
+		except ValueError as e:
+			return False, str(e), pd.DataFrame(), 0.0
+		if target_vector:
+			return vector_search_with_multiple_vectors(client, collection, target_vector, vector_list, limit, query_profile, filter_conditions)
+		return vector_search(client, collection, vector_list, limit, query_profile, filter_conditions)
+	if search_type == "Keyword":
+		return keyword_search(client, collection, query, limit, query_profile, filter_conditions)
+	return False, f"Unsupported search type: {search_type}", pd.DataFrame(), 0.0
@@ -0,0 +1,77 @@
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Latency breakdown of one search, in ms:
+# request: the query call (wire round trip, server execution and gRPC decoding by the client),
+# server: execution time reported by the server's query profile (slowest shard, None when not profiled),
+# network: request minus server, build: client-side DataFrame construction, total: request plus build
+SPAN_NAMES = ["request_ms", "server_ms", "network_ms", "build_ms", "total_ms"]
+
+# Spans kept in the session histogram
+SPAN_HISTORY_LIMIT = 1000
+
+# Go duration strings of the query profile, e.g. "850µs", "1.5ms" or "1m2.5s"
+GO_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ns|µs|us|ms|s|m|h)")
+GO_DURATION_UNITS_MS = {"ns": 1e-6, "µs": 1e-3, "us": 1e-3, "ms": 1.0, "s": 1e3, "m": 6e4, "h": 3.6e6}
+
+def parse_go_duration(text: str) -> Optional[float]:
+	parts = GO_DURATION_PATTERN.findall(str(text))
+	if not parts or "".join(value + unit for value, unit in parts) != str(text).strip():
+		return None
+	return sum(float(value) * GO_DURATION_UNITS_MS[unit] for value, unit in parts)
+
+# Server execution time from a query profile (QueryProfileReturn): shards run in parallel, so the slowest shard counts,
+# and within a shard the largest "...took" detail (the total, or the longest search of a hybrid query)
+def server_time_ms(query_profile) -> Optional[float]:
+	if query_profile is None:
+		return None
+	shard_times = []
+	for shard in query_profile.shards:
+		took = [parse_go_duration(value) for search in shard.searches.values() for key, value in search.details.items() if key.endswith("took")]
+		took = [value for value in took if value is not None]
+		if took:
+			shard_times.append(max(took))
+	return max(shard_times) if shard_times else None
+
+# Spans of one search, stored by the search functions in df.attrs["spans"]
+def search_spans(request_ms: float, build_ms: float, query_profile=None) -> Dict[str, Optional[float]]:
+	server_ms = server_time_ms(query_profile)
+	return {
+		"request_ms": request_ms,
+		"server_ms": server_ms,
+		"network_ms": max(request_ms - server_ms, 0.0) if server_ms is not None else None,
+		"build_ms": build_ms,
+		"total_ms": request_ms + build_ms,
+	}
+
+# Spans attached to a search result DataFrame (None for results without them)
+def get_spans(df: pd.DataFrame) -> Optional[Dict[str, Optional[float]]]:
+	return df.attrs.get("spans") if df is not None else None
+
+# Append the spans of a search to a history list, dropping the oldest beyond SPAN_HISTORY_LIMIT
+def record_spans(history: List[Dict[str, Any]], spans: Dict[str, Optional[float]], **labels):
+	history.append(dict(spans, **labels))
+	del history[:max(len(history) - SPAN_HISTORY_LIMIT, 0)]
+
+# Percentiles of each span over a history
+def spans_summary(history: List[Dict[str, Any]]) -> pd.DataFrame:
+	rows = []
+	for name in SPAN_NAMES:
+		values = np.array([entry[name] for entry in history if entry.get(name) is not None], dtype=np.float64)
+		if values.size:
+			p50, p95, p99 = np.percentile(values, [50, 95, 99])
+			rows.append({"Span": name, "Searches": int(values.size), "Mean (ms)": values.mean(), "p50 (ms)": p50, "p95 (ms)": p95, "p99 (ms)": p99, "Max (ms)": values.max()})
+	return pd.DataFrame(rows)
+
+# Histogram of each span over a history: one column per span, rows are bins (lower edge in ms)
+def spans_histogram(history: List[Dict[str, Any]], bins: int = 20) -> pd.DataFrame:
+	values = {name: np.array([entry[name] for entry in history if entry.get(name) is not None], dtype=np.float64) for name in SPAN_NAMES}
+	values = {name: span_values for name, span_values in values.items() if span_values.size and name != "total_ms"}
+	if not values:
+		return pd.DataFrame()
+	edges = np.histogram_bin_edges(np.concatenate(list(values.values())), bins=bins)
+	histogram = pd.DataFrame({name: np.histogram(span_values, bins=edges)[0] for name, span_values in values.items()})
+	histogram.index = np.round(edges[:-1], 2)
+	return histogram
@@ -1,27 +1,40 @@
 import time
 import re
 import json
+import base64
+import binascii
+import numpy as np
 import pandas as pd
-from typing import Tuple
+from typing import Optional, Tuple
 from weaviate import Client
 from weaviate.classes.query import MetadataQuery
+from utils.search.spans import search_spans
+from utils.collections.filters import build_filters
+from utils.collections.vectors import DEFAULT_VECTOR_NAME, load_vector_file, parse_vector_value
+
+# Characters of a base64 encoded vector
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+
+# Query vectors of an uploaded file shown on the Search page, larger sets go through the query workload
+MAX_DISPLAYED_QUERY_VECTORS = 20
 
 # Vector search function
 # This function performs a vector search on a specified collection in Weaviate.
 
-def vector_search(client: Client, collection: str, vectors: list[float], limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
+def vector_search(client: Client, collection: str, vectors: list[float], limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None) -> Tuple[bool, str, pd.DataFrame, float]:
 	print("vector_search() called")
 	try:
 		# Get collection
 		coll = client.collections.get(collection)
 
-		# Measure performance
-		start_time = time.time() * 1000 # Convert to milliseconds
+		# Measure performance (monotonic, high-resolution clock)
+		start_time = time.perf_counter()
 
 		# Perform search
 		response = coll.query.near_vector(
 			near_vector=vectors,
 			limit=limit,
+			filters=build_filters(filter_conditions),
 			return_metadata=MetadataQuery(
 				creation_time=True,
 				last_update_time=True,
@@ -29,18 +42,20 @@ def vector_search(client: Client, collection: str, vectors: list[float], limit:
 				certainty=True,
 				score=True,
 				explain_score=True,
-				is_consistent=True
+				is_consistent=True,
+				query_profile=query_profile
 			)
 		)
 
-		# Calculate time taken
-		end_time = time.time() * 1000
-		time_taken = end_time - start_time
+		# Calculate time taken in milliseconds
+		time_taken = (time.perf_counter() - start_time) * 1000
+		build_start = time.perf_counter()
 
 		# Process results into a list of dictionaries
 		results = []
 		for obj in response.objects:
 			result_dict = {
+				"UUID": str(obj.uuid),
 				"Distance": obj.metadata.distance if hasattr(obj.metadata, 'distance') else 'N/A',
 				"Certainty": obj.metadata.certainty if hasattr(obj.metadata, 'certainty') else 'N/A',
 				"Creation Time": obj.metadata.creation_time if hasattr(obj.metadata, 'creation_time') else 'N/A',
@@ -58,26 +73,29 @@ def vector_search(client: Client, collection: str, vectors: list[float], limit:
 
 		# Convert to DataFrame
 		df = pd.DataFrame(results)
+		# Latency breakdown: the query call, server time (when profiled) and building the DataFrame
+		df.attrs["spans"] = search_spans(time_taken, (time.perf_counter() - build_start) * 1000, response.query_profile)
 		return True, f"Found {len(results)} results", df, time_taken
 
 	except Exception as e:
 		return False, f"Error performing Vector search: {str(e)}", pd.DataFrame(), 0.0
 
 
-def vector_search_with_multiple_vectors(client: Client, collection: str, targetvector: str, vectors: list[float], limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
+def vector_search_with_multiple_vectors(client: Client, collection: str, targetvector: str, vectors: list[float], limit: int = 3, query_profile: bool = False, filter_conditions: Optional[tuple] = None) -> Tuple[bool, str, pd.DataFrame, float]:
 	print("vector_search_with_multiple_vectors() called")
 	try:
 		# Get collection
 		coll = client.collections.get(collection)
 
-		# Measure performance
-		start_time = time.time() * 1000 # Convert to milliseconds
+		# Measure performance (monotonic, high-resolution clock)
+		start_time = time.perf_counter()
 
 		# Perform search
 		response = coll.query.near_vector(
 			near_vector=vectors,
 			target_vector=targetvector,
 			limit=limit,
+			filters=build_filters(filter_conditions),
 			return_metadata=MetadataQuery(
 				creation_time=True,
 				last_update_time=True,
@@ -85,18 +103,20 @@ def vector_search_with_multiple_vectors(client: Client, collection: str, targetv
 				certainty=True,
 				score=True,
 				explain_score=True,
-				is_consistent=True
+				is_consistent=True,
+				query_profile=query_profile
 			)
 		)
 
-		# Calculate time taken
-		end_time = time.time() * 1000
-		time_taken = end_time - start_time
+		# Calculate time taken in milliseconds
+		time_taken = (time.perf_counter() - start_time) * 1000
+		build_start = time.perf_counter()
 
 		# Process results into a list of dictionaries
 		results = []
 		for obj in response.objects:
 			result_dict = {
+				"UUID": str(obj.uuid),
 				"Distance": obj.metadata.distance if hasattr(obj.metadata, 'distance') else 'N/A',
 				"Certainty": obj.metadata.certainty if hasattr(obj.metadata, 'certainty') else 'N/A',
 				"Creation Time": obj.metadata.creation_time if hasattr(obj.metadata, 'creation_time') else 'N/A',
@@ -114,23 +134,74 @@ def vector_search_with_multiple_vectors(client: Client, collection: str, targetv
 
 		# Convert to DataFrame
 		df = pd.DataFrame(results)
+		# Latency breakdown: the query call, server time (when profiled) and building the DataFrame
+		df.attrs["spans"] = search_spans(time_taken, (time.perf_counter() - build_start) * 1000, response.query_profile)
 		return True, f"Found {len(results)} results", df, time_taken
 
 	except Exception as e:
 		return False, f"Error performing Vector search: {str(e)}", pd.DataFrame(), 0.0
 	
-def parse_vector_input(vector_string: str) -> list[float]:
-    print("parse_vector_input() called")
-    try:
-        # Remove all whitespace and newlines first
-        cleaned = vector_string.replace('\n', '').replace('\r', '').replace(' ', '')
-        
-        # Remove outer brackets if present
-        cleaned = cleaned.strip('[]')
-        
-        # Split by comma and convert to float
-        vector_list = [float(x.strip()) for x in cleaned.split(',') if x.strip()]
-        
-        return vector_list
-    except ValueError as e:
-        raise ValueError(f"Invalid vector format: {e}")
+# Parse a pasted query vector into a float32 array with NumPy: comma or whitespace separated numbers (with or without
+# brackets), or the base64 encoding of little-endian float32 bytes. Text that reads as numbers (such as "12e5") is
+# always numbers; prefix base64 with "base64:" to force it.
+def parse_vector_input(vector_string: str) -> np.ndarray:
+	print("parse_vector_input() called")
+	text = vector_string.strip()
+	try:
+		if text.startswith("base64:"):
+			return decode_base64_vector(text[len("base64:"):])
+		try:
+			return parse_vector_value(text)
+		except ValueError:
+			if not is_base64_vector(text):
+				raise
+		return decode_base64_vector(text)
+	except (ValueError, binascii.Error) as e:
+		raise ValueError(f"Invalid vector format: {e}")
+
+# base64 float32 input: only base64 characters, padded to a multiple of 4
+def is_base64_vector(text: str) -> bool:
+	return len(text) % 4 == 0 and BASE64_PATTERN.fullmatch(text) is not None
+
+# Decode base64 little-endian float32 bytes into a vector
+def decode_base64_vector(text: str) -> np.ndarray:
+	raw = base64.b64decode(text, validate=True)
+	if len(raw) % 4:
+		raise ValueError(f"base64 input decodes to {len(raw)} bytes, not a whole number of float32 values")
+	vector = np.frombuffer(raw, dtype="<f4").astype(np.float32)
+	if vector.size == 0:
+		raise ValueError("Vector must be a non-empty list of numbers")
+	return vector
+
+# Query vectors from an uploaded .npy or .fvecs file: a 1-D array is one query, a 2-D array holds one query per row
+def load_query_vectors(file_obj, file_type: str) -> np.ndarray:
+	print(f"load_query_vectors() called with file_type: {file_type}")
+	if file_type == "npy":
+		file_obj.seek(0)
+		vectors = np.load(file_obj, allow_pickle=False)
+	else:
+		vectors = load_vector_file(file_obj, file_type)
+	vectors = np.atleast_2d(vectors)
+	if vectors.ndim != 2 or vectors.size == 0 or not np.issubdtype(vectors.dtype, np.number):
+		raise ValueError(f"Query vector file must hold a 1-D or 2-D numeric array, got shape {vectors.shape} ({vectors.dtype})")
+	return vectors.astype(np.float32, copy=False)
+
+# Dimensions of the stored vectors of a collection (or of one of its named vectors), read from one object.
+# None when the collection is empty or the vector is a multi-vector.
+def get_vector_dimensions(client: Client, collection: str, target_vector: Optional[str] = None) -> Optional[int]:
+	print(f"get_vector_dimensions() called for collection: {collection}, vector: {target_vector or 'default'}")
+	coll = client.collections.get(collection)
+	response = coll.query.fetch_objects(limit=1, include_vector=[target_vector] if target_vector else True, return_properties=[])
+	for obj in response.objects:
+		vector = (obj.vector or {}).get(target_vector or DEFAULT_VECTOR_NAME)
+		if vector is not None and len(vector) and not isinstance(vector[0], list):
+			return len(vector)
+	return None
+
+# Check query vectors (one per row) against the dimensions of the target vector before sending them
+def check_query_dimensions(vectors: np.ndarray, expected: Optional[int], target_vector: Optional[str] = None) -> Tuple[bool, str]:
+	if expected is None:
+		return True, "Vector dimensions of the collection are unknown, not checked"
+	if vectors.shape[1] != expected:
+		return False, f"Query vectors have {vectors.shape[1]} dimensions but '{target_vector or DEFAULT_VECTOR_NAME}' vectors have {expected}"
+	return True, f"{len(vectors)} query vector(s) of {expected} dimensions"
@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, BinaryIO, Callable, Dict, Iterator
+import numpy as np
+from utils.collections.vectors import VECTOR_FILE_TYPES, load_vector_file
+from utils.search.benchmark import BENCHMARK_PERCENTILES
+
+# Query set files: text queries one per line (.txt), a "query" column (.csv), JSON Lines with a "query" or
+# "vector" field (or a bare string / array per line), or vectors as .npy/.fvecs
+QUERY_FILE_TYPES = ["txt", "csv", "jsonl"] + VECTOR_FILE_TYPES
+
+# Columns of the per-query result file
+RESULT_COLUMNS = ["index", "success", "latency_ms", "round_trip_ms", "hits", "error"]
+
+# Per-query result files live in a directory owned by the app. The page deletes a file once it is downloaded or replaced
+# by a new run, and files left behind by abandoned sessions are removed after WORKLOAD_RESULT_TTL seconds.
+WORKLOAD_RESULT_DIR = os.path.join(tempfile.gettempdir(), "weaviate_app_workloads")
+WORKLOAD_RESULT_TTL = 24 * 3600
+
+# Remove result files older than max_age seconds
+def cleanup_workload_results(max_age: float = WORKLOAD_RESULT_TTL):
+	if not os.path.isdir(WORKLOAD_RESULT_DIR):
+		return
+	cutoff = time.time() - max_age
+	for name in os.listdir(WORKLOAD_RESULT_DIR):
+		path = os.path.join(WORKLOAD_RESULT_DIR, name)
+		try:
+			if os.path.getmtime(path) < cutoff:
+				os.remove(path)
+		except OSError as e:
+			print(f"Error removing workload result '{path}': {e}")
+
+def delete_workload_result(path: str):
+	if not path:
+		return
+	try:
+		os.remove(path)
+	except FileNotFoundError:
+		pass
+	except OSError as e:
+		print(f"Error removing workload result '{path}': {e}")
+
+# Stream the queries of a query set file: strings for text queries, float32 arrays (or strings to parse) for vectors
+def iter_query_file(file_obj: BinaryIO, file_type: str) -> Iterator[Any]:
+	if file_type in VECTOR_FILE_TYPES:
+		yield from load_vector_file(file_obj, file_type)
+		return
+	file_obj.seek(0)
+	text_stream = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+	try:
+		if file_type == "txt":
+			for line in text_stream:
+				if line.strip():
+					yield line.strip()
+		elif file_type == "csv":
+			reader = csv.DictReader(text_stream)
+			column = "query" if "query" in (reader.fieldnames or []) else (reader.fieldnames or [None])[0]
+			for row in reader:
+				if row.get(column):
+					yield row[column]
+		elif file_type == "jsonl":
+			for line_number, line in enumerate(text_stream, 1):
+				if not line.strip():
+					continue
+				item = json.loads(line)
+				if isinstance(item, dict):
+					item = item.get("vector", item.get("query"))
+				if item is None:
+					raise ValueError(f"Line {line_number} has no 'query' or 'vector' field")
+				yield np.asarray(item, dtype=np.float32) if isinstance(item, list) else item
+		else:
+			raise ValueError(f"Unsupported query file type: {file_type}")
+	finally:
+		text_stream.detach()
+
+# Number of queries when known up front (vector files), None for text files which are only counted while running
+def count_queries(file_obj: BinaryIO, file_type: str):
+	if file_type in VECTOR_FILE_TYPES:
+		return len(load_vector_file(file_obj, file_type))
+	return None
+
+# Run every query of a query set through search_fn(query) (returning (success, message, df, time_taken in ms) like the
+# utils/search functions) on concurrency threads. At most 2 x concurrency queries are in flight and each result is written
+# to a CSV file as soon as it completes, so memory stays flat whatever the size of the query set; only the latencies are kept for percentiles.
+# Yields a progress dict (see workload_progress) at most every progress_interval seconds and once at the end (done=True, with result_path).
+def run_query_workload(search_fn: Callable[[Any], tuple], queries: Iterator[Any], concurrency: int = 4, total_queries: int = None, progress_interval: float = 0.5):
+	print(f"run_query_workload() called with concurrency: {concurrency}")
+	cleanup_workload_results()
+	os.makedirs(WORKLOAD_RESULT_DIR, exist_ok=True)
+	result_file = tempfile.NamedTemporaryFile("w", newline="", encoding="utf-8", prefix="query_workload_", suffix=".csv", dir=WORKLOAD_RESULT_DIR, delete=False)
+	writer = csv.DictWriter(result_file, fieldnames=RESULT_COLUMNS)
+	writer.writeheader()
+	latencies = []
+	stats = {"completed": 0, "errors": 0, "hits": 0}
+	started = time.perf_counter()
+	last_report = started
+
+	def timed_search(index, query):
+		query_started = time.perf_counter()
+		try:
+			success, message, df, time_taken = search_fn(query)
+		except Exception as e:
+			success, message, df, time_taken = False, str(e), None, 0.0
+		round_trip = (time.perf_counter() - query_started) * 1000
+		hits = len(df) if success and df is not None else 0
+		return {"index": index, "success": success, "latency_ms": round(time_taken if success else round_trip, 3), "round_trip_ms": round(round_trip, 3), "hits": hits, "error": "" if success else message}
+
+	def record(futures):
+		for future in futures:
+			result = future.result()
+			writer.writerow(result)
+			stats["completed"] += 1
+			stats["hits"] += result["hits"]
+			if result["success"]:
+				latencies.append(result["latency_ms"])
+			else:
+				stats["errors"] += 1
+
+	try:
+		with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+			pending = set()
+			for index, query in enumerate(queries):
+				pending.add(executor.submit(timed_search, index, query))
+				if len(pending) >= 2 * concurrency:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					record(done)
+				now = time.perf_counter()
+				if now - last_report >= progress_interval:
+					last_report = now
+					yield workload_progress(stats, latencies, started, total_queries, result_file.name)
+			record(pending)
+	finally:
+		result_file.close()
+	yield workload_progress(stats, latencies, started, total_queries, result_file.name, done=True)
+
+# Aggregate throughput, hit counts, error rate and latency percentiles of a workload run
+def workload_progress(stats: Dict[str, int], latencies, started: float, total_queries: int, result_path: str, done: bool = False) -> Dict[str, Any]:
+	elapsed = max(time.perf_counter() - started, 1e-9)
+	completed = stats["completed"]
+	progress = {
+		"completed": completed,
+		"total_queries": total_queries,
+		"errors": stats["errors"],
+		"error_rate": stats["errors"] / completed if completed else 0.0,
+		"hits": stats["hits"],
+		"avg_hits": stats["hits"] / completed if completed else 0.0,
+		"elapsed": elapsed,
+		"qps": completed / elapsed,
+		"fraction": 1.0 if done else (min(completed / total_queries, 1.0) if total_queries else None),
+		"result_path": result_path,
+		"done": done,
+	}
+	if latencies:
+		for percentile, value in zip(BENCHMARK_PERCENTILES, np.percentile(latencies, BENCHMARK_PERCENTILES)):
+			progress[f"p{percentile}_ms"] = float(value)
+		progress["max_ms"] = float(max(latencies))
+	return progress
@@ -1,4 +1,6 @@
 import streamlit as st
+from utils.cache.cluster_cache import get_cache_stats, clear_cluster_cache
+from utils.cache.disk_cache import get_cache_dir
 
 # Update the side bar labels on the fly
 def update_side_bar_labels():
@@ -10,11 +12,28 @@ def update_side_bar_labels():
         st.sidebar.info(f"Current Connected Endpoint: {st.session_state.get('active_endpoint', 'N/A')}")
         st.sidebar.info(f"Client Version: {st.session_state.get('client_version', 'N/A')}")
         st.sidebar.info(f"Server Version: {st.session_state.get('server_version', 'N/A')}")
+        display_cache_stats()
+
+# Show the cluster cache hit/miss/eviction counters in the side bar
+def display_cache_stats():
+    stats, entries_df = get_cache_stats()
+    with st.sidebar.expander(f"Cache: {len(entries_df)} entries, {stats['hit_ratio']:.0%} hit ratio"):
+        st.markdown(
+            f"Hits: **{stats['hits']}** | Misses: **{stats['misses']}**  \n"
+            f"Evictions: **{stats['evictions']}** | Invalidations: **{stats['invalidations']}**  \n"
+            f"Disk snapshots: **{get_cache_dir() or 'disabled'}** | Loaded from disk: **{stats['disk_loads']}**"
+        )
+        if not entries_df.empty:
+            st.dataframe(entries_df, width="stretch", hide_index=True)
+        if st.button("Clear Cluster Cache", key="clear_cluster_cache", width="stretch"):
+            clear_cluster_cache()
+            st.rerun()
 
 # Clear the session state
 def clear_session_state():
     print("clear_session_state called")
+    # Drop this cluster's cached entries only - entries of other connected clusters are kept
+    clear_cluster_cache()
     for key in list(st.session_state.keys()):
         del st.session_state[key]
-    st.cache_data.clear()
     st.rerun()